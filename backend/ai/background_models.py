@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+from config import Config
+
+# Pluggable background models for the motion gate. Each takes a blurred
+# grayscale frame and returns a binary foreground mask (0/255), or None
+# while it is still building its first baseline.
+
+
+class FrameDifference:
+    # Original two-frame absdiff: cheapest, but flickers with lighting
+    def __init__(self):
+        self.prev_frame = None
+
+    def reset(self):
+        self.prev_frame = None
+
+    def apply(self, gray):
+        if self.prev_frame is None:
+            self.prev_frame = gray
+            return None
+
+        frame_delta = cv2.absdiff(self.prev_frame, gray)
+        self.prev_frame = gray
+        return cv2.threshold(frame_delta, Config.MOTION_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY)[1]
+
+
+class RunningAverage:
+    # Exponential moving average background via accumulateWeighted;
+    # slow lighting drift is absorbed instead of triggering motion
+    def __init__(self, alpha=None):
+        self.alpha = Config.RUNNING_AVG_ALPHA if alpha is None else alpha
+        self.background = None
+
+    def reset(self):
+        self.background = None
+
+    def apply(self, gray):
+        if self.background is None:
+            self.background = gray.astype(np.float32)
+            return None
+
+        frame_delta = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        cv2.accumulateWeighted(gray, self.background, self.alpha)
+        return cv2.threshold(frame_delta, Config.MOTION_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY)[1]
+
+
+class _OpenCVSubtractor(ABC):
+    # Shared wrapper for OpenCV's BackgroundSubtractor implementations
+    def __init__(self):
+        self.reset()
+
+    @abstractmethod
+    def _create(self):
+        # Returns a new cv2 BackgroundSubtractor configured from Config
+        ...
+
+    def reset(self):
+        self.subtractor = self._create()
+        self.frames_seen = 0
+
+    def apply(self, gray):
+        mask = self.subtractor.apply(gray)
+
+        # Early masks flag the whole scene as foreground while the model learns
+        self.frames_seen += 1
+        if self.frames_seen <= Config.BG_WARMUP_FRAMES:
+            return None
+
+        # Shadows are marked 127; only confident foreground (255) counts
+        return cv2.threshold(mask, 200, 255, cv2.THRESH_BINARY)[1]
+
+
+class MOG2(_OpenCVSubtractor):
+    def _create(self):
+        return cv2.createBackgroundSubtractorMOG2(
+            history=Config.BG_HISTORY,
+            varThreshold=Config.MOG2_VAR_THRESHOLD,
+            detectShadows=True,
+        )
+
+
+class KNN(_OpenCVSubtractor):
+    def _create(self):
+        return cv2.createBackgroundSubtractorKNN(
+            history=Config.BG_HISTORY,
+            dist2Threshold=Config.KNN_DIST2_THRESHOLD,
+            detectShadows=True,
+        )
+
+
+BACKENDS = {
+    "frame_diff": FrameDifference,
+    "running_avg": RunningAverage,
+    "mog2": MOG2,
+    "knn": KNN,
+}
+
+
+def create_background_model(name=None):
+    name = Config.MOTION_BACKEND if name is None else name
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown motion backend '{name}', expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections import Counter, deque
+
+
+class StageTimer:
+    # Rolling window of durations (seconds) for one pipeline stage
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def snapshot(self):
+        if not self.samples:
+            return {"count": self.count, "meanMs": 0.0, "p50Ms": 0.0, "p99Ms": 0.0}
+
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {
+            "count": self.count,
+            "meanMs": 1000.0 * sum(ordered) / len(ordered),
+            "p50Ms": 1000.0 * ordered[int(last * 0.50)],
+            "p99Ms": 1000.0 * ordered[int(last * 0.99)],
+        }
+
+
+class MicroBatcher:
+    # Collects concurrent single-frame requests and sends them to the
+    # detector as one batch. A batch is dispatched when it reaches
+    # max_batch_size frames or when the oldest request has waited
+    # max_wait_ms, whichever comes first. run_batch is a coroutine function
+    # taking a list of frames and returning one result per frame.
+
+    def __init__(self, run_batch, max_batch_size, max_wait_ms):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.queue = None
+        self._task = None
+        self._batch = []  # requests taken off the queue and not yet answered
+
+        # Tuning metrics
+        self.batch_sizes = Counter()
+        self.max_queue_depth = 0
+        self.queue_wait = StageTimer()
+        self.inference = StageTimer()
+        self.total = StageTimer()
+
+    def start(self):
+        # Must be called from the running event loop (app startup)
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Fail anything still waiting, including a batch that was being
+        # collected or run when the worker was cancelled, so callers don't hang
+        pending = self._batch
+        self._batch = []
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, frame):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((frame, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = self._batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch)
+            self._batch = []
+
+    async def _dispatch(self, batch):
+        dispatched_at = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.queue_wait.record(dispatched_at - enqueued_at)
+        self.batch_sizes[len(batch)] += 1
+
+        frames = [frame for frame, _, _ in batch]
+        try:
+            results = await self.run_batch(frames)
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        finished_at = time.perf_counter()
+        self.inference.record(finished_at - dispatched_at)
+
+        for (_, future, enqueued_at), result in zip(batch, results):
+            self.total.record(finished_at - enqueued_at)
+            if not future.done():
+                future.set_result(result)
+
+    def metrics(self):
+        return {
+            "queueDepth": self.queue.qsize() if self.queue is not None else 0,
+            "maxQueueDepth": self.max_queue_depth,
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait * 1000.0,
+            "batchSizeHistogram": {str(size): n for size, n in sorted(self.batch_sizes.items())},
+            "stages": {
+                "queueWait": self.queue_wait.snapshot(),
+                "inference": self.inference.snapshot(),
+                "total": self.total.snapshot(),
+            },
+        }
@@ -0,0 +1,118 @@
+"""
+VirtualEye AI — Inference backend comparison (CPU)
+Loads each backend from inference_backends.py in a fresh subprocess and
+reports model load time, ms/frame, peak resident memory and agreement of
+detected/confidence results with the ultralytics (PyTorch) backend.
+
+Export the models first with export_model.py.
+
+Usage (from backend/ai):
+    python benchmarks/backend_compare.py --images path/to/jpegs
+    python benchmarks/backend_compare.py --backends ultralytics,onnxruntime,onnxruntime-int8,openvino
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+
+
+def load_frames(images_dir, count):
+    frames = []
+    if images_dir:
+        for path in sorted(glob.glob(os.path.join(images_dir, "*.jpg")))[:count]:
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(frame)
+    if not frames:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(count)]
+    return frames
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def worker(variant, images_dir, count):
+    # Runs inside its own process so load time and memory are not shared
+    from config import Config
+    from human_detector import HumanDetector
+
+    backend = variant
+    if variant == "onnxruntime-int8":
+        backend, Config.USE_INT8 = "onnxruntime", True
+
+    frames = load_frames(images_dir, count)
+    baseline_mb = peak_rss_mb()
+
+    start = time.perf_counter()
+    detector = HumanDetector(backend=backend)
+    load_s = time.perf_counter() - start
+
+    detector.detect(frames[0])  # warm-up
+    results = []
+    start = time.perf_counter()
+    for frame in frames:
+        results.append(detector.detect(frame))
+    ms_per_frame = 1000.0 * (time.perf_counter() - start) / len(frames)
+
+    print(json.dumps({
+        "loadSeconds": load_s,
+        "msPerFrame": ms_per_frame,
+        "peakRssMb": peak_rss_mb(),
+        "modelRssMb": peak_rss_mb() - baseline_mb,
+        "detected": [r["detected"] for r in results],
+        "confidence": [r["confidence"] for r in results],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Directory of .jpg frames (defaults to synthetic frames)")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--backends", default="ultralytics,onnxruntime,onnxruntime-int8,openvino")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.images, args.frames)
+        return
+
+    reports = {}
+    for variant in args.backends.split(","):
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", variant, "--frames", str(args.frames)]
+        if args.images:
+            cmd += ["--images", args.images]
+        proc = subprocess.run(cmd, cwd=AI_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{variant}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            continue
+        reports[variant] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    reference = reports.get("ultralytics")
+    print(f"\n{'backend':<18} {'load s':>7} {'ms/frame':>9} {'peak MB':>8} {'model MB':>9} {'agree':>7} {'|dconf|':>8}")
+    for variant, r in reports.items():
+        agree = dconf = "-"
+        if reference:
+            pairs = list(zip(r["detected"], reference["detected"]))
+            agree = f"{sum(a == b for a, b in pairs) / len(pairs):.1%}"
+            diffs = [abs(a - b) for a, b in zip(r["confidence"], reference["confidence"])]
+            dconf = f"{sum(diffs) / len(diffs):.3f}"
+        print(f"{variant:<18} {r['loadSeconds']:>7.2f} {r['msPerFrame']:>9.2f} {r['peakRssMb']:>8.0f} "
+              f"{r['modelRssMb']:>9.0f} {agree:>7} {dconf:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+VirtualEye AI — Batched inference throughput benchmark
+Compares CPU frames/sec of HumanDetector.detect_batch across batch sizes.
+
+Usage (from backend/ai):
+    python benchmarks/batch_throughput.py
+    python benchmarks/batch_throughput.py --images path/to/jpegs --frames 64
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from human_detector import HumanDetector
+
+
+def load_frames(images_dir, count, width, height):
+    frames = []
+    if images_dir:
+        for path in sorted(glob.glob(os.path.join(images_dir, "*.jpg"))):
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(frame)
+    if not frames:
+        # Synthetic noise frames still exercise the full forward pass
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    return [frames[i % len(frames)] for i in range(count)]
+
+
+def run(detector, frames, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        detector.detect_batch(frames[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    return len(frames) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Directory of .jpg frames (defaults to synthetic frames)")
+    parser.add_argument("--frames", type=int, default=64, help="Frames processed per batch size")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    args = parser.parse_args()
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    frames = load_frames(args.images, args.frames, args.width, args.height)
+
+    detector = HumanDetector()
+    detector.detect_batch(frames[:1])  # warm-up
+
+    print(f"{'batch':>6} {'frames/sec':>12} {'speedup':>9}")
+    baseline = None
+    for batch_size in batch_sizes:
+        fps = run(detector, frames, batch_size)
+        baseline = baseline or fps
+        print(f"{batch_size:>6} {fps:>12.2f} {fps / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+VirtualEye AI — Model cascade evaluation
+Runs a recorded test set through:
+
+  small     CASCADE_ESCALATE_VARIANT on every frame (the reference)
+  nano      MODEL_VARIANT on every frame
+  cascade   nano gate, ambiguous frames re-run by the small model
+  crop      the same, but only padded crops around the uncertain boxes
+
+and reports the escalation rate, mean and p95 ms/frame, and accuracy
+against the small model: agreement of the per-frame "detected" flag,
+precision/recall of it, and exact person-count agreement.
+
+Frames are .jpg files from --images and/or frames read from video clips.
+
+Usage (from backend/ai):
+    python benchmarks/cascade_eval.py --images recordings/frames
+    python benchmarks/cascade_eval.py clips/lobby.mp4 --low 0.3 --high 0.9
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from human_detector import HumanDetector
+
+
+def load_frames(images_dir, clips, max_frames):
+    frames = []
+    if images_dir:
+        for path in sorted(glob.glob(os.path.join(images_dir, "*.jpg"))):
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(frame)
+    for path in clips:
+        cap = cv2.VideoCapture(path)
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+    return frames[:max_frames]
+
+
+def run(detector, frames):
+    results, ms = [], []
+    for frame in frames:
+        started = time.perf_counter()
+        results.append(detector.detect(frame))
+        ms.append(1000.0 * (time.perf_counter() - started))
+    return results, np.array(ms)
+
+
+def accuracy(results, reference):
+    pred = np.array([r["detected"] for r in results])
+    ref = np.array([r["detected"] for r in reference])
+    tp = int(np.sum(pred & ref))
+    precision = tp / pred.sum() if pred.sum() else 1.0
+    recall = tp / ref.sum() if ref.sum() else 1.0
+    counts = np.mean([r["count"] == q["count"] for r, q in zip(results, reference)])
+    return float(np.mean(pred == ref)), precision, recall, float(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="*", help="Recorded clips")
+    parser.add_argument("--images", help="Directory of recorded .jpg frames")
+    parser.add_argument("--max-frames", type=int, default=1000)
+    parser.add_argument("--low", type=float, default=Config.CASCADE_LOW_CONFIDENCE)
+    parser.add_argument("--high", type=float, default=Config.CASCADE_HIGH_CONFIDENCE)
+    args = parser.parse_args()
+
+    frames = load_frames(args.images, args.clips, args.max_frames)
+    if not frames:
+        parser.error("no frames read; pass --images and/or clips")
+
+    Config.CASCADE_LOW_CONFIDENCE, Config.CASCADE_HIGH_CONFIDENCE = args.low, args.high
+    pipelines = [
+        ("small", HumanDetector(variant=Config.CASCADE_ESCALATE_VARIANT, cascade=False), False),
+        ("nano", HumanDetector(cascade=False), False),
+        ("cascade", HumanDetector(cascade=True), False),
+        ("crop", HumanDetector(cascade=True), True),
+    ]
+    for _, detector, _ in pipelines:
+        detector.warmup()
+
+    print(f"{len(frames)} frames  band=[{args.low}, {args.high})  threshold={Config.CONFIDENCE_THRESHOLD}")
+    print(f"  {'pipeline':<8} {'escalated':>9} {'mean ms':>8} {'p95 ms':>8} "
+          f"{'agree':>6} {'prec':>6} {'recall':>6} {'count=':>6}")
+    reference = None
+    for name, detector, on_crop in pipelines:
+        Config.CASCADE_ON_CROP = on_crop
+        results, ms = run(detector, frames)
+        if reference is None:
+            reference = results
+
+        escalated = f"{np.mean([r.get('escalated', False) for r in results]):.3f}" if detector.cascade else "-"
+        agree, precision, recall, counts = accuracy(results, reference)
+        print(f"  {name:<8} {escalated:>9} {ms.mean():8.2f} {np.percentile(ms, 95):8.2f} "
+              f"{agree:6.3f} {precision:6.3f} {recall:6.3f} {counts:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
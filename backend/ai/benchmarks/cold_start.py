@@ -0,0 +1,110 @@
+"""
+VirtualEye AI — Model cold-start benchmark
+Measures what the first detection of a fresh process costs, each mode in
+its own subprocess:
+
+  cold      load the model, detect straight away (no warm-up, as before
+            the model registry)
+  warm      load through the registry and run the startup warm-up first
+  copies    what two independent loads cost (the backend's own YOLO plus
+            the AI module's, before the registry) against two detectors
+            sharing one registry entry
+
+Reports import, load and warm-up time, the first and second detection
+latency, and resident memory.
+
+Usage (from backend/ai):
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --image frame.jpg --variant yolov8s
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+
+
+def load_frame(image):
+    import cv2
+    import numpy as np
+
+    frame = cv2.imread(image, cv2.IMREAD_COLOR) if image else None
+    if frame is None:
+        frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    return frame
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, 1000.0 * (time.perf_counter() - started)
+
+
+def worker(mode, image, variant):
+    # Runs inside its own process so nothing is cached from another mode
+    _, import_ms = timed(lambda: __import__("human_detector"))
+    from human_detector import HumanDetector
+    from inference_backends import create_backend
+    from model_registry import registry, resident_mb, resolve_model_path
+
+    frame = load_frame(image)
+    baseline_mb = resident_mb()
+    report = {"importMs": import_ms}
+
+    if mode == "copies":
+        # Two separate loads of the same weights, then two registry detectors
+        path = resolve_model_path("ultralytics", variant)
+        _, report["twoCopiesLoadMs"] = timed(lambda: [create_backend(None, path) for _ in range(2)])
+        report["twoCopiesMb"] = resident_mb() - baseline_mb
+        shared_baseline = resident_mb()
+        _, report["sharedLoadMs"] = timed(lambda: [HumanDetector(variant=variant) for _ in range(2)])
+        report["sharedMb"] = resident_mb() - shared_baseline
+        report["registryEntries"] = len(registry.metrics()["models"])
+    else:
+        detector, report["loadMs"] = timed(lambda: HumanDetector(variant=variant))
+        if mode == "warm":
+            _, report["warmupMs"] = timed(detector.warmup)
+        _, report["firstDetectMs"] = timed(lambda: detector.detect(frame))
+        _, report["secondDetectMs"] = timed(lambda: detector.detect(frame))
+        report["modelMb"] = resident_mb() - baseline_mb
+
+    print(json.dumps(report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", help="Frame to detect on (defaults to a synthetic frame)")
+    parser.add_argument("--variant", default=None, help="Config.MODEL_VARIANTS key (default: MODEL_VARIANT)")
+    parser.add_argument("--modes", default="cold,warm,copies")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.image, args.variant)
+        return
+
+    for mode in args.modes.split(","):
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", mode]
+        if args.image:
+            cmd += ["--image", args.image]
+        if args.variant:
+            cmd += ["--variant", args.variant]
+        proc = subprocess.run(cmd, cwd=AI_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{mode}: failed\n{proc.stderr.strip()}")
+            continue
+
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{mode:<7} " + "  ".join(
+            f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in report.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
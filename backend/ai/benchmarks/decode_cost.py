@@ -0,0 +1,90 @@
+"""
+VirtualEye AI — Reduced JPEG decode benchmark
+Measures decode + motion cost per frame for typical ESP32-CAM frame sizes,
+comparing a full IMREAD_COLOR decode against IMREAD_REDUCED_GRAYSCALE_2/4
+(Config.MOTION_DECODE_REDUCTION) for frames rejected by the motion gate.
+
+Usage (from backend/ai):
+    python benchmarks/decode_cost.py
+    python benchmarks/decode_cost.py --images captures/ --iterations 300
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ingest import decode_jpeg, decode_jpeg_reduced
+from motion_detector import IntelligentMotionDetector
+
+# ESP32-CAM (OV2640) frame sizes
+ESP32_SIZES = {
+    "QVGA": (240, 320),
+    "VGA": (480, 640),
+    "SVGA": (600, 800),
+    "XGA": (768, 1024),
+    "UXGA": (1200, 1600),
+}
+
+
+def synthetic_jpegs(height, width, quality):
+    # Two nearly identical scenes, like a static camera between motion events
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (15, 15), 0)
+    jpegs = []
+    for i in range(2):
+        frame = np.clip(base.astype(np.int16) + i, 0, 255).astype(np.uint8)
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        jpegs.append(buffer.tobytes())
+    return jpegs
+
+
+def ms_per_frame(jpegs, reduction, iterations):
+    motion = IntelligentMotionDetector()
+    start = time.perf_counter()
+    for i in range(iterations):
+        contents = jpegs[i % len(jpegs)]
+        if reduction == 1:
+            motion.detect(decode_jpeg(contents))
+        else:
+            motion.detect(decode_jpeg_reduced(contents, reduction), 1.0 / reduction)
+    return 1000.0 * (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Directory of captured ESP32 .jpg frames (replaces synthetic sizes)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+
+    if args.images:
+        jpegs = [open(p, "rb").read() for p in sorted(glob.glob(os.path.join(args.images, "*.jpg")))]
+        if not jpegs:
+            print(f"No .jpg files in {args.images}")
+            return
+        height, width = decode_jpeg(jpegs[0]).shape[:2]
+        cases = {f"{width}x{height}": jpegs}
+    else:
+        cases = {
+            f"{name} {w}x{h}": synthetic_jpegs(h, w, args.quality)
+            for name, (h, w) in ESP32_SIZES.items()
+        }
+
+    print(f"{'frame':<16} {'kB':>6} {'full ms':>9} {'1/2 ms':>8} {'1/4 ms':>8} {'1/4 saves':>10}")
+    for label, jpegs in cases.items():
+        full = ms_per_frame(jpegs, 1, args.iterations)
+        half = ms_per_frame(jpegs, 2, args.iterations)
+        quarter = ms_per_frame(jpegs, 4, args.iterations)
+        size_kb = sum(len(j) for j in jpegs) / len(jpegs) / 1024
+        print(f"{label:<16} {size_kb:>6.1f} {full:>9.2f} {half:>8.2f} {quarter:>8.2f} {1 - quarter / full:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
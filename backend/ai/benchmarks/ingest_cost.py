@@ -0,0 +1,93 @@
+"""
+VirtualEye AI — Frame ingestion CPU cost
+Measures CPU time per frame to get a frame from a co-located producer to
+the detectors via each /detect ingestion mode:
+
+  jpeg : producer cv2.imencode + server np.frombuffer/cv2.imdecode
+  raw  : producer tobytes (request body) + server frame_from_raw view
+  shm  : producer copies into a shared memory segment + server copies it out
+
+Usage (from backend/ai):
+    python benchmarks/ingest_cost.py
+    python benchmarks/ingest_cost.py --iterations 500 --quality 90
+"""
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ingest import decode_jpeg, frame_from_raw, read_shared_frame
+
+RESOLUTIONS = [(480, 640), (720, 1280), (1080, 1920)]
+
+
+def cpu_us_per_frame(fn, iterations):
+    fn()  # warm-up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return 1e6 * (time.process_time() - start) / iterations
+
+
+def shared_memory_path(shm, frame, shape):
+    producer_view = np.ndarray(frame.shape, np.uint8, buffer=shm.buf)
+
+    def shm_path():
+        producer_view[:] = frame
+        read_shared_frame(shm.name, shape)
+
+    return shm_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality used by the producer")
+    args = parser.parse_args()
+
+    print(f"{'resolution':>11} {'jpeg us':>10} {'raw us':>10} {'shm us':>10} {'raw saves':>10} {'shm saves':>10}")
+
+    for height, width in RESOLUTIONS:
+        # Smooth gradient + noise compresses roughly like a camera frame
+        rng = np.random.default_rng(0)
+        gradient = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+        frame = np.clip(gradient + rng.integers(0, 20, (height, width, 3)), 0, 255).astype(np.uint8)
+        shape = f"{height}x{width}x3"
+
+        def jpeg_path():
+            ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, args.quality])
+            decode_jpeg(buffer.tobytes())
+
+        def raw_path():
+            frame_from_raw(frame.tobytes(), shape)
+
+        shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+        shm_path = shared_memory_path(shm, frame, shape)
+
+        try:
+            jpeg_us = cpu_us_per_frame(jpeg_path, args.iterations)
+            raw_us = cpu_us_per_frame(raw_path, args.iterations)
+            shm_us = cpu_us_per_frame(shm_path, args.iterations)
+        finally:
+            # Drops the producer's view of the segment so it can be closed
+            del shm_path
+            shm.close()
+            # Before 3.13 read_shared_frame untracks the segment; producer and
+            # server share this process here, so restore tracking before unlinking
+            if os.name == "posix" and sys.version_info < (3, 13):
+                resource_tracker.register("/" + shm.name, "shared_memory")
+            shm.unlink()
+
+        print(f"{width}x{height:<6} {jpeg_us:>10.0f} {raw_us:>10.0f} {shm_us:>10.0f} "
+              f"{1 - raw_us / jpeg_us:>10.0%} {1 - shm_us / jpeg_us:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+VirtualEye AI — /detect load test
+Fires concurrent clients at a running AI module and reports latency percentiles.
+
+Run it once against a server started with Config.EXECUTOR_OFFLOAD_ENABLED = False
+(blocking work on the event loop) and once with it enabled, then compare.
+
+Usage (from backend/ai, with the AI module running on port 8000):
+    python benchmarks/latency_load.py --label inline
+    python benchmarks/latency_load.py --label offloaded --clients 50 --requests 20
+"""
+
+import argparse
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+
+def make_payloads(width, height):
+    # Two alternating frames so the motion gate passes and YOLO runs
+    rng = np.random.default_rng(0)
+    payloads = []
+    for _ in range(2):
+        frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        ok, buffer = cv2.imencode(".jpg", frame)
+        payloads.append(buffer.tobytes())
+    return payloads
+
+
+def build_multipart(jpeg_bytes):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="image"; filename="frame.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + jpeg_bytes + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def client(url, payloads, count):
+    latencies = []
+    errors = 0
+    for i in range(count):
+        body, content_type = build_multipart(payloads[i % len(payloads)])
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors += 1
+    return latencies, errors
+
+
+def percentile(ordered, pct):
+    return ordered[int((len(ordered) - 1) * pct)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/detect")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--label", default="run")
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.width, args.height)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.clients) as pool:
+        outcomes = list(pool.map(lambda _: client(args.url, payloads, args.requests), range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(l for lats, _ in outcomes for l in lats)
+    errors = sum(e for _, e in outcomes)
+    if not latencies:
+        print(f"[{args.label}] all {errors} requests failed")
+        return
+
+    print(f"[{args.label}] clients={args.clients} ok={len(latencies)} errors={errors}")
+    print(f"[{args.label}] throughput={len(latencies) / elapsed:.1f} req/s")
+    print(f"[{args.label}] p50={1000 * percentile(latencies, 0.50):.1f} ms "
+          f"p99={1000 * percentile(latencies, 0.99):.1f} ms "
+          f"max={1000 * latencies[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
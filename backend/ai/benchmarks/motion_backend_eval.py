@@ -0,0 +1,87 @@
+"""
+VirtualEye AI — Motion background model evaluation
+Replays recorded clips through every motion backend in background_models.py
+and reports how often the motion gate passes, i.e. how many YOLO invocations
+each backend would cause, and how many person frames it would miss.
+
+Person frames are taken from full-frame YOLO on every frame of the clip
+(skip with --no-reference to only compare gate pass rates).
+
+Usage (from backend/ai):
+    python benchmarks/motion_backend_eval.py clips/*.mp4
+    python benchmarks/motion_backend_eval.py clip.mp4 --backends frame_diff,mog2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from background_models import BACKENDS
+from motion_detector import IntelligentMotionDetector
+
+
+def read_frames(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--max-frames", type=int, default=2000)
+    parser.add_argument("--no-reference", action="store_true", help="Skip YOLO person labelling")
+    args = parser.parse_args()
+
+    backends = args.backends.split(",")
+    clips = [(path, read_frames(path, args.max_frames)) for path in args.clips]
+
+    # Which frames actually contain a person, across all clips
+    reference = None
+    if not args.no_reference:
+        from human_detector import HumanDetector
+        detector = HumanDetector()
+        reference = {path: [detector.detect(f)["detected"] for f in frames] for path, frames in clips}
+
+    total_frames = sum(len(frames) for _, frames in clips)
+    person_frames = sum(sum(labels) for labels in reference.values()) if reference else 0
+    print(f"{len(clips)} clips, {total_frames} frames"
+          + (f", {person_frames} with people" if reference else ""))
+    print(f"{'backend':<12} {'pass rate':>10} {'YOLO calls':>11} {'missed':>8} {'ms/frame':>9}")
+
+    for name in backends:
+        passes = 0
+        missed = 0
+        elapsed = 0.0
+
+        for path, frames in clips:
+            # Fresh state per clip, as a new camera stream would get
+            motion = IntelligentMotionDetector(backend=name)
+            for i, frame in enumerate(frames):
+                start = time.perf_counter()
+                passed = motion.detect(frame)["motionDetected"]
+                elapsed += time.perf_counter() - start
+
+                passes += passed
+                if reference and reference[path][i] and not passed:
+                    missed += 1
+
+        rate = passes / max(total_frames, 1)
+        missed_col = f"{missed:>8}" if reference else f"{'-':>8}"
+        print(f"{name:<12} {rate:>10.1%} {passes:>11} {missed_col} {1000 * elapsed / max(total_frames, 1):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+VirtualEye AI — Detection postprocessing microbenchmark
+Times turning one frame's YOLO output into a person summary for frames with
+0, 5 and 50 detections:
+
+  per-box loop   the old code: iterate result.boxes and read
+                 float(box.conf[0]) / int(box.cls[0]) one box at a time,
+                 keeping only the max confidence
+  vectorized     boxes.xyxy/conf/cls pulled as NumPy arrays in one transfer
+                 each, then postprocess.summarize_people (threshold, area,
+                 count, boxes and max confidence on whole arrays)
+  + NMS          the same with cross-crop NMS, as detect_regions runs it
+
+Boxes are real ultralytics Boxes objects over torch tensors, so the per-box
+indexing and tensor->Python conversions cost what they cost in production.
+No model is loaded.
+
+Usage (from backend/ai):
+    python benchmarks/postprocess_cost.py
+    python benchmarks/postprocess_cost.py --counts 0,5,50,200 --repeats 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Boxes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from postprocess import summarize_people
+
+
+def make_boxes(count, rng, shape=(720, 1280)):
+    height, width = shape
+    xy = rng.uniform(0, [width - 200, height - 300], (count, 2))
+    wh = rng.uniform([40, 80], [200, 300], (count, 2))
+    conf = rng.uniform(0.25, 0.95, (count, 1))
+    cls = rng.choice([0, 0, 0, 2, 56], (count, 1))  # mostly people
+    data = np.hstack([xy, xy + wh, conf, cls]).astype(np.float32)
+    return Boxes(torch.from_numpy(data), shape)
+
+
+def per_box_loop(boxes):
+    max_conf = 0.0
+    for box in boxes:
+        if int(box.cls[0]) == Config.HUMAN_CLASS_ID:
+            max_conf = max(max_conf, float(box.conf[0]))
+    return {"detected": max_conf >= Config.CONFIDENCE_THRESHOLD, "confidence": max_conf}
+
+
+def vectorized(boxes, iou_threshold=None):
+    detections = [(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy())]
+    return summarize_people(detections, iou_threshold=iou_threshold)
+
+
+def time_call(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(1e6 * (time.perf_counter() - start))
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="0,5,50")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+
+    print(f"{'detections':>10} {'per-box loop':>20} {'vectorized':>20} {'vectorized + NMS':>20}   (p50/p99 us)")
+    for count in (int(c) for c in args.counts.split(",")):
+        boxes = make_boxes(count, rng)
+
+        # Both paths must agree on what they both report
+        old, new = per_box_loop(boxes), vectorized(boxes)
+        assert old["detected"] == new["detected"] and abs(old["confidence"] - new["confidence"]) < 1e-6
+
+        columns = [
+            time_call(lambda: per_box_loop(boxes), args.repeats),
+            time_call(lambda: vectorized(boxes), args.repeats),
+            time_call(lambda: vectorized(boxes, Config.NMS_IOU_THRESHOLD), args.repeats),
+        ]
+        print(f"{count:>10} " + " ".join(f"{p50:>11.1f}/{p99:<8.1f}" for p50, p99 in columns)
+              + f"   count={new['count']}")
+
+
+if __name__ == "__main__":
+    main()
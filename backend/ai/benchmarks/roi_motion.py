@@ -0,0 +1,103 @@
+"""
+VirtualEye AI — Downscaled motion + ROI inference benchmark
+Compares the original pipeline (full-resolution motion, full-frame YOLO)
+against downscaled motion analysis with YOLO run only on motion crops.
+
+Reports ms/frame for each pipeline and recall against full-frame YOLO run
+on every frame of the clip (a frame counts as positive when a person is
+detected above Config.CONFIDENCE_THRESHOLD).
+
+Usage (from backend/ai):
+    python benchmarks/roi_motion.py clips/lobby_720p.mp4 clips/yard_1080p.mp4
+    python benchmarks/roi_motion.py clip.mp4 --downscale 0.25 --max-frames 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from human_detector import HumanDetector
+from motion_detector import IntelligentMotionDetector
+
+
+def read_frames(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_pipeline(frames, detector, downscale, use_roi):
+    motion = IntelligentMotionDetector(downscale=downscale)
+    detections = []
+    motion_time = 0.0
+
+    start = time.perf_counter()
+    for frame in frames:
+        t0 = time.perf_counter()
+        motion_res = motion.detect(frame)
+        motion_time += time.perf_counter() - t0
+
+        if not motion_res["motionDetected"]:
+            detections.append(False)
+        elif use_roi:
+            detections.append(detector.detect_regions(frame, motion_res["motionBoxes"])["detected"])
+        else:
+            detections.append(detector.detect(frame)["detected"])
+    total = time.perf_counter() - start
+
+    n = max(len(frames), 1)
+    return detections, 1000.0 * total / n, 1000.0 * motion_time / n
+
+
+def recall(detections, reference):
+    positives = sum(reference)
+    if positives == 0:
+        return None
+    return sum(1 for d, r in zip(detections, reference) if d and r) / positives
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+", help="Recorded clips (e.g. 720p and 1080p)")
+    parser.add_argument("--downscale", type=float, default=0.5)
+    parser.add_argument("--max-frames", type=int, default=500)
+    args = parser.parse_args()
+
+    detector = HumanDetector()
+
+    for path in args.clips:
+        frames = read_frames(path, args.max_frames)
+        if not frames:
+            print(f"{path}: no frames read")
+            continue
+
+        height, width = frames[0].shape[:2]
+        detector.detect(frames[0])  # warm-up
+
+        reference = [detector.detect(frame)["detected"] for frame in frames]
+        base, base_ms, base_motion_ms = run_pipeline(frames, detector, 1.0, use_roi=False)
+        roi, roi_ms, roi_motion_ms = run_pipeline(frames, detector, args.downscale, use_roi=True)
+
+        def fmt(value):
+            return "n/a (no people in clip)" if value is None else f"{value:.3f}"
+
+        print(f"\n{os.path.basename(path)}  {width}x{height}  {len(frames)} frames")
+        print(f"  full-res motion + full frame : {base_ms:7.2f} ms/frame "
+              f"(motion {base_motion_ms:.2f} ms)  recall {fmt(recall(base, reference))}")
+        print(f"  x{args.downscale} motion + ROI crops   : {roi_ms:7.2f} ms/frame "
+              f"(motion {roi_motion_ms:.2f} ms)  recall {fmt(recall(roi, reference))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+VirtualEye AI — Tamper detector evaluation
+Runs TamperDetector over labeled clips and reports per-frame cost and how
+well each tamper type is caught:
+
+  recall    share of tampered frames flagged (the first TAMPER_HOLD_FRAMES
+            of each event are excluded, since flagging waits for them)
+  latency   frames from the start of an event to the first flag
+  false +   flagged frames that are labeled clean
+
+Clips are synthesized by default: a textured scene with people walking
+through, lighting drift and sensor noise, with one event per clip
+(blackout, occlusion, defocus, sceneChange) or a hard negative (sudden
+lighting change, a person walking right past the lens). --write saves them
+as .avi files with a labels.json next to them; --clips replays a directory
+in that format, so hand-labeled recordings can be evaluated the same way.
+
+labels.json maps each clip file to {"kind": ..., "labels": [...]}, with one
+entry per frame: a reason from tamper_detector.REASONS, or null.
+
+Usage (from backend/ai):
+    python benchmarks/tamper_eval.py
+    python benchmarks/tamper_eval.py --clips-per-kind 10 --write /tmp/tamper_clips
+    python benchmarks/tamper_eval.py --clips /tmp/tamper_clips
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from tamper_detector import TamperDetector
+
+KINDS = ("clean", "lighting", "closePass", "blackout", "occlusion", "defocus", "sceneChange")
+FRAME_SIZE = (640, 480)
+EVENT_START, EVENT_END = 60, 120
+
+
+def make_panorama(rng, width=1800, height=480):
+    # Gradient sky/floor with random boxes, discs and lines for texture
+    pano = np.zeros((height, width, 3), np.uint8)
+    pano[:] = rng.integers(60, 160, 3)
+    pano = (pano * np.linspace(0.7, 1.2, height)[:, None, None]).clip(0, 255).astype(np.uint8)
+    for _ in range(int(width * 0.12)):
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        shape = rng.integers(0, 3)
+        if shape == 0:
+            cv2.rectangle(pano, (x, y), (x + int(rng.integers(10, 120)), y + int(rng.integers(10, 120))), color, -1)
+        elif shape == 1:
+            cv2.circle(pano, (x, y), int(rng.integers(5, 50)), color, -1)
+        else:
+            cv2.line(pano, (x, y), (x + int(rng.integers(-200, 200)), y + int(rng.integers(-200, 200))), color, 2)
+    noise = rng.normal(0, 8, pano.shape)
+    return cv2.GaussianBlur((pano + noise).clip(0, 255).astype(np.uint8), (3, 3), 0)
+
+
+def render_clip(kind, rng, frames=180):
+    w, h = FRAME_SIZE
+    pano = make_panorama(rng)
+    offset = int(rng.integers(0, 200))
+    walkers = [(int(rng.integers(0, w)), int(rng.integers(150, 350)), int(rng.choice([-6, -4, 4, 6])))
+               for _ in range(2)]
+    skin = tuple(int(c) for c in rng.integers(90, 200, 3))
+
+    clip, labels = [], []
+    for t in range(frames):
+        in_event = EVENT_START <= t < EVENT_END
+        view_x = offset + (700 if kind == "sceneChange" and t >= EVENT_START else 0)
+        frame = pano[:, view_x:view_x + w].copy()
+
+        for x0, y, dx in walkers:
+            x = (x0 + dx * t) % (w + 100) - 50
+            cv2.ellipse(frame, (x, y), (22, 70), 0, 0, 360, (40, 40, 60), -1)
+            cv2.circle(frame, (x, y - 85), 16, (70, 90, 140), -1)
+
+        gain = 1.0 + 0.08 * np.sin(t / 40.0)
+        if kind == "lighting" and t >= EVENT_START:
+            gain *= 0.6  # lights switched off in part of the room
+        if kind == "closePass" and EVENT_START <= t < EVENT_START + 12:
+            # Someone walks right past the lens, covering a third of the view
+            x = int(w * (t - EVENT_START) / 12.0)
+            cv2.ellipse(frame, (x, h // 2), (w // 5, h), 0, 0, 360, (50, 45, 55), -1)
+
+        frame = frame.astype(np.float32) * gain
+        if in_event and kind == "blackout":
+            frame = np.full_like(frame, 8.0)
+        elif in_event and kind == "occlusion":
+            # Hand or cloth over most of the lens: smooth, out-of-focus, one tone
+            cover = np.zeros((h, w), np.float32)
+            cv2.ellipse(cover, (w // 2, h // 2), (int(w * 0.6), int(h * 0.6)), 0, 0, 360, 1.0, -1)
+            cover = cv2.GaussianBlur(cover, (0, 0), 25)[..., None]
+            frame = frame * (1 - cover) + np.array(skin, np.float32) * cover
+        elif in_event and kind == "defocus":
+            frame = cv2.GaussianBlur(frame, (0, 0), 5)
+
+        frame += rng.normal(0, 3, frame.shape).astype(np.float32)
+        clip.append(frame.clip(0, 255).astype(np.uint8))
+
+        if kind in ("blackout", "occlusion", "defocus") and in_event:
+            labels.append(kind)
+        elif kind == "sceneChange" and EVENT_START <= t < EVENT_START + Config.TAMPER_REBASE_FRAMES:
+            # After that the new view is the reference and frames are clean again
+            labels.append(kind)
+        else:
+            labels.append(None)
+    return clip, labels
+
+
+def synthesize(clips_per_kind, seed):
+    rng = np.random.default_rng(seed)
+    return [(f"{kind}_{i:02d}.avi", kind, *render_clip(kind, rng))
+            for kind in KINDS for i in range(clips_per_kind)]
+
+
+def write_clips(clips, directory):
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    for name, kind, frames, labels in clips:
+        writer = cv2.VideoWriter(os.path.join(directory, name), cv2.VideoWriter_fourcc(*"MJPG"), 10, FRAME_SIZE)
+        for frame in frames:
+            writer.write(frame)
+        writer.release()
+        index[name] = {"kind": kind, "labels": labels}
+    with open(os.path.join(directory, "labels.json"), "w") as f:
+        json.dump(index, f, indent=1)
+
+
+def load_clips(directory):
+    with open(os.path.join(directory, "labels.json")) as f:
+        index = json.load(f)
+    clips = []
+    for name, entry in sorted(index.items()):
+        cap = cv2.VideoCapture(os.path.join(directory, name))
+        frames = []
+        while len(frames) < len(entry["labels"]):
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+        clips.append((name, entry["kind"], frames, entry["labels"][:len(frames)]))
+    return clips
+
+
+def evaluate(clips):
+    hold = Config.TAMPER_HOLD_FRAMES
+    per_kind = {}
+    timings = []
+    for _, kind, frames, labels in clips:
+        detector = TamperDetector()
+        stats = per_kind.setdefault(kind, {"clips": 0, "tampered": 0, "caught": 0, "clean": 0,
+                                           "false": 0, "wrong_reason": 0, "latency": []})
+        stats["clips"] += 1
+        onset, first_flag = None, None
+        for t, (frame, label) in enumerate(zip(frames, labels)):
+            started = time.perf_counter()
+            res = detector.detect(frame)
+            timings.append(1000.0 * (time.perf_counter() - started))
+
+            if label is None:
+                stats["clean"] += 1
+                stats["false"] += res["tampered"]
+                onset = None
+                continue
+            if onset is None:
+                onset = t
+            if res["tampered"] and first_flag is None:
+                first_flag = t
+                stats["latency"].append(t - onset)
+            if t - onset >= hold:
+                stats["tampered"] += 1
+                stats["caught"] += res["tampered"]
+                stats["wrong_reason"] += res["tampered"] and res["reason"] != label
+    return per_kind, np.array(timings)
+
+
+def time_sizes(repeats):
+    rng = np.random.default_rng(0)
+    frame = render_clip("clean", rng, frames=1)[0][0]
+    inputs = [
+        ("640x480 bgr", frame),
+        ("1280x720 bgr", cv2.resize(frame, (1280, 720))),
+        ("1920x1080 bgr", cv2.resize(frame, (1920, 1080))),
+        ("160x120 gray (1/4 decode)", cv2.cvtColor(cv2.resize(frame, (160, 120)), cv2.COLOR_BGR2GRAY)),
+    ]
+    for label, image in inputs:
+        detector = TamperDetector()
+        ms = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            detector.detect(image)
+            ms.append(1000.0 * (time.perf_counter() - started))
+        print(f"  {label:<26} p50={np.percentile(ms, 50):.3f}ms  p99={np.percentile(ms, 99):.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", help="Directory with labels.json (default: synthesize)")
+    parser.add_argument("--clips-per-kind", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--write", help="Save the synthesized clips and labels to this directory")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    clips = load_clips(args.clips) if args.clips else synthesize(args.clips_per_kind, args.seed)
+    if args.write and not args.clips:
+        write_clips(clips, args.write)
+
+    per_kind, timings = evaluate(clips)
+    total = sum(len(frames) for _, _, frames, _ in clips)
+    print(f"{len(clips)} clips, {total} frames, hold={Config.TAMPER_HOLD_FRAMES} frames")
+    print(f"  {'kind':<12} {'clips':>5} {'recall':>7} {'latency':>8} {'false+':>8} {'wrong reason':>13}")
+    tp = fp = fn = 0
+    for kind, s in per_kind.items():
+        recall = f"{s['caught'] / s['tampered']:.3f}" if s["tampered"] else "-"
+        latency = f"{np.mean(s['latency']):.1f}" if s["latency"] else "-"
+        print(f"  {kind:<12} {s['clips']:>5} {recall:>7} {latency:>8} {s['false']:>4}/{s['clean']:<4} "
+              f"{s['wrong_reason']:>8}")
+        tp += s["caught"]
+        fn += s["tampered"] - s["caught"]
+        fp += s["false"]
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    print(f"  overall: precision={precision:.3f} recall={recall:.3f}")
+    print(f"  per frame (640x480 clips): p50={np.percentile(timings, 50):.3f}ms "
+          f"p99={np.percentile(timings, 99):.3f}ms")
+
+    print("per-frame cost by input:")
+    time_sizes(args.repeats)
+
+
+if __name__ == "__main__":
+    main()
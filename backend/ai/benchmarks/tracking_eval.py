@@ -0,0 +1,132 @@
+"""
+VirtualEye AI — Person tracking benchmark
+Compares running YOLO on every motion-positive frame against the tracker
+layer, which runs YOLO only every TRACK_REDETECT_INTERVAL frames (or when
+a track decays) and propagates the boxes in between.
+
+Reports, per clip and per propagation mode: YOLO calls, ms/frame, agreement
+of the per-frame "detected" flag with YOLO-on-every-frame, the mean IoU of
+tracked boxes against that frame's YOLO boxes, and how many track ids were
+opened (fewer is better for a clip with a fixed number of people).
+
+Usage (from backend/ai):
+    python benchmarks/tracking_eval.py clips/lobby_720p.mp4
+    python benchmarks/tracking_eval.py clip.mp4 --interval 10 --modes flow,hold
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from human_detector import HumanDetector
+from motion_detector import IntelligentMotionDetector
+from person_tracker import PersonTracker, iou_matrix
+
+
+def read_frames(path, max_frames):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def reference_run(frames, detector):
+    # YOLO on every motion-positive frame, as /detect does without tracking
+    motion = IntelligentMotionDetector()
+    results = []
+    calls = 0
+    start = time.perf_counter()
+    for frame in frames:
+        if not motion.detect(frame)["motionDetected"]:
+            results.append(None)
+            continue
+        calls += 1
+        results.append(np.array(detector.detect(frame)["boxes"], np.float32).reshape(-1, 4))
+    ms = 1000.0 * (time.perf_counter() - start) / max(len(frames), 1)
+    return results, calls, ms
+
+
+def tracked_run(frames, detector, mode):
+    motion = IntelligentMotionDetector()
+    tracker = PersonTracker(propagation=mode)
+    results = []
+    calls = 0
+    start = time.perf_counter()
+    for frame in frames:
+        if not motion.detect(frame)["motionDetected"]:
+            tracker.skip()
+            results.append(None)
+            continue
+        # Same order as main.propagate_tracks / detect_tracked
+        res = None if tracker.needs_inference() else tracker.propagate(frame)
+        if res is None:
+            detected = detector.detect(frame)
+            res = tracker.update(frame, detected["boxes"], detected["confidences"])
+            calls += 1
+        results.append(res)
+    ms = 1000.0 * (time.perf_counter() - start) / max(len(frames), 1)
+    return results, calls, ms, tracker.next_id - 1
+
+
+def compare(reference, tracked):
+    agree = frames = 0
+    ious = []
+    for ref_boxes, res in zip(reference, tracked):
+        if ref_boxes is None:
+            continue
+        frames += 1
+        agree += bool(len(ref_boxes)) == res["detected"]
+        if len(ref_boxes) and res["tracks"]:
+            boxes = np.array([t["box"] for t in res["tracks"]], np.float32)
+            ious.extend(iou_matrix(ref_boxes, boxes).max(axis=1).tolist())
+    return (agree / frames if frames else None), (float(np.mean(ious)) if ious else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+", help="Recorded clips with people in view")
+    parser.add_argument("--modes", default="flow,hold", help="Comma-separated TRACK_PROPAGATION modes")
+    parser.add_argument("--interval", type=int, default=Config.TRACK_REDETECT_INTERVAL)
+    parser.add_argument("--max-frames", type=int, default=500)
+    args = parser.parse_args()
+
+    Config.TRACK_REDETECT_INTERVAL = args.interval
+    detector = HumanDetector()
+
+    def fmt(value):
+        return "n/a" if value is None else f"{value:.3f}"
+
+    for path in args.clips:
+        frames = read_frames(path, args.max_frames)
+        if not frames:
+            print(f"{path}: no frames read")
+            continue
+
+        height, width = frames[0].shape[:2]
+        detector.detect(frames[0])  # warm-up
+
+        reference, ref_calls, ref_ms = reference_run(frames, detector)
+        print(f"\n{os.path.basename(path)}  {width}x{height}  {len(frames)} frames  interval={args.interval}")
+        print(f"  {'yolo every frame':<18} {ref_calls:5d} calls  {ref_ms:7.2f} ms/frame")
+
+        for mode in args.modes.split(","):
+            tracked, calls, ms, opened = tracked_run(frames, detector, mode)
+            agreement, mean_iou = compare(reference, tracked)
+            print(f"  {'tracker ' + mode:<18} {calls:5d} calls  {ms:7.2f} ms/frame  "
+                  f"agreement {fmt(agreement)}  box IoU {fmt(mean_iou)}  track ids {opened}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,124 @@
 class Config:
-    MODEL_PATH = "models/yolov8n.pt"
+    # Named weights the model registry can load; MODEL_VARIANT is the one
+    # every detector uses unless told otherwise
+    MODEL_VARIANT = "yolov8n"
+    MODEL_VARIANTS = {
+        "yolov8n": "models/yolov8n.pt",
+        "yolov8s": "models/yolov8s.pt",
+    }
+    # Explicit override of MODEL_VARIANT's weights file (None = from MODEL_VARIANTS)
+    MODEL_PATH = None
+    # One dummy inference per model at startup (frame size w, h)
+    MODEL_WARMUP = True
+    MODEL_WARMUP_SIZE = (640, 480)
     HUMAN_CLASS_ID = 0
     CONFIDENCE_THRESHOLD = 0.70
     MOTION_CONTOUR_THRESHOLD = 1500
+
+    # Upper bound on frames accepted by /detect/batch in a single request
+    MAX_BATCH_SIZE = 16
+
+    # Micro-batching of concurrent /detect requests
+    MICRO_BATCHING_ENABLED = True
+    BATCH_MAX_FRAMES = 8
+    BATCH_MAX_WAIT_MS = 10
+
+    # Executor layer for blocking work (see executors.py)
+    EXECUTOR_OFFLOAD_ENABLED = True
+    CV_THREAD_WORKERS = 4
+    # 0 = run YOLO on one dedicated thread in this process;
+    # N > 0 = N worker processes, each with its own model copy
+    MODEL_PROCESS_WORKERS = 0
+
+    # Per-camera stream state (motion baselines etc.)
+    DEFAULT_STREAM_ID = "default"
+    MAX_STREAMS = 64
+    STREAM_IDLE_SECONDS = 300
+
+    # Downscaled motion analysis (1.0 = full resolution)
+    MOTION_DOWNSCALE = 1.0
+
+    # Run YOLO only on padded crops around motion boxes instead of the whole frame
+    ROI_INFERENCE_ENABLED = False
+    ROI_PADDING = 0.25        # fraction of the box size added on each side
+    ROI_MIN_PADDING = 32      # pixels
+    ROI_MAX_COVERAGE = 0.6    # fall back to full frame above this fraction of the frame
+    ROI_MAX_IMGSZ = 640
+
+    # Motion background model: "frame_diff", "running_avg", "mog2" or "knn"
+    MOTION_BACKEND = "frame_diff"
+    MOTION_DIFF_THRESHOLD = 25
+    RUNNING_AVG_ALPHA = 0.05
+    BG_HISTORY = 500
+    BG_WARMUP_FRAMES = 5
+    MOG2_VAR_THRESHOLD = 16
+    KNN_DIST2_THRESHOLD = 400.0
+
+    # Decode JPEG uploads at 1/N size in grayscale for the motion gate
+    # (1 = off, or 2/4/8); full color decode happens only when motion passes
+    MOTION_DECODE_REDUCTION = 1
+
+    # Inference backend: "ultralytics" (PyTorch), "onnxruntime" or "openvino".
+    # Export ONNX/OpenVINO models with export_model.py.
+    INFERENCE_BACKEND = "ultralytics"
+    # Exports of MODEL_VARIANT, as written by export_model.py
+    ONNX_MODEL_PATH = f"models/{MODEL_VARIANT}.onnx"
+    ONNX_INT8_MODEL_PATH = f"models/{MODEL_VARIANT}.int8.onnx"
+    OPENVINO_MODEL_PATH = f"models/{MODEL_VARIANT}_openvino_model/{MODEL_VARIANT}.xml"
+    USE_INT8 = False
+    INFERENCE_THREADS = 0           # 0 = runtime default
+    BACKEND_MIN_CONFIDENCE = 0.25   # pre-NMS floor for exported models (ultralytics default)
+    NMS_IOU_THRESHOLD = 0.7
+
+    # Camera tamper detection on a tiny gray copy of every frame, ahead of motion.
+    # Off by default: a dark, flat night scene reads as "blackout".
+    TAMPER_ENABLED = False
+    # Tamper reasons that also skip YOLO; "sceneChange" is only reported,
+    # since a person close to the lens can cause it
+    TAMPER_GATE_REASONS = ("blackout", "occlusion", "defocus")
+    TAMPER_FRAME_SIZE = (128, 96)        # analysis size (w, h); aspect is not preserved
+    TAMPER_BLOCK_SIZE = 16               # grid cell size for the covered-area estimate
+    TAMPER_WARMUP_FRAMES = 5             # frames averaged into the first reference
+    TAMPER_REFERENCE_ALPHA = 0.05        # reference drift per clean frame
+    TAMPER_HOLD_FRAMES = 3               # consecutive suspect frames before flagging
+    TAMPER_BLACKOUT_MEAN = 30            # mean gray level below which a flat frame is "blackout"
+    TAMPER_FLAT_STD = 6.0                # block std below which a grid cell counts as featureless
+    TAMPER_COVERED_FRACTION = 0.6        # newly featureless share of the frame that means "occlusion"
+    TAMPER_DEFOCUS_RATIO = 0.35          # sharpness below this share of the reference means "defocus"
+    TAMPER_HIST_BINS = 32
+    TAMPER_SCENE_DISTANCE = 0.45         # Bhattacharyya distance to the reference histogram
+    TAMPER_SCENE_CORRELATION = 0.5       # layout correlation with the reference below which the view moved
+    TAMPER_REBASE_FRAMES = 30            # a changed scene held this long becomes the new reference
+
+    # Person tracking between YOLO runs (see person_tracker.py)
+    TRACKING_ENABLED = False
+    TRACK_PROPAGATION = "flow"           # "flow" (Lucas-Kanade) or "hold"
+    TRACK_REDETECT_INTERVAL = 5          # full YOLO at least every N motion frames
+    TRACK_MIN_CONFIDENCE = 0.5           # re-run YOLO once a missed track decays below this
+                                         # (visible tracks: below CONFIDENCE_THRESHOLD)
+    TRACK_CONFIDENCE_DECAY = 0.95        # per propagated frame
+    TRACK_IOU_THRESHOLD = 0.3
+    TRACK_MAX_CENTROID_SHIFT = 0.5       # centroid match radius, in box diagonals
+    TRACK_MAX_MISSES = 2                 # YOLO runs a track may go unseen before it is dropped
+    TRACK_FLOW_SCALE = 0.5               # optical flow runs on a reduced gray frame
+    TRACK_FLOW_POINTS = 4                # flow points per box side
+
+    # Person boxes smaller than this many pixels are dropped (0 = keep all)
+    MIN_PERSON_AREA = 0
+
+    # Model cascade: MODEL_VARIANT gates every frame, frames whose best
+    # person score falls in [LOW, HIGH) are re-checked by the larger model
+    CASCADE_ENABLED = False
+    CASCADE_ESCALATE_VARIANT = "yolov8s"
+    CASCADE_LOW_CONFIDENCE = 0.35
+    CASCADE_HIGH_CONFIDENCE = 0.85
+    CASCADE_ON_CROP = False          # re-check only padded crops around the uncertain boxes
+    CASCADE_CROP_PADDING = 0.5
+
+    @classmethod
+    def variant_weights(cls, variant=None):
+        # .pt file of a variant; MODEL_PATH, when set, replaces MODEL_VARIANT's
+        variant = cls.MODEL_VARIANT if variant is None else variant
+        if variant == cls.MODEL_VARIANT and cls.MODEL_PATH:
+            return cls.MODEL_PATH
+        return cls.MODEL_VARIANTS[variant]
@@ -0,0 +1,82 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Per-process detector used by model worker processes
+_worker_detector = None
+
+
+def _init_model_worker():
+    global _worker_detector
+    from config import Config
+    from human_detector import HumanDetector
+    _worker_detector = HumanDetector()
+    if Config.MODEL_WARMUP:
+        _worker_detector.warmup()
+
+
+def _call_model_worker(method, *args):
+    return getattr(_worker_detector, method)(*args)
+
+
+class ExecutorLayer:
+    # Keeps blocking OpenCV and YOLO work off the FastAPI event loop.
+    #
+    # - cv stages (decode, motion) run on a thread pool; OpenCV releases
+    #   the GIL so these threads genuinely run in parallel.
+    # - model calls run either on a single dedicated thread that owns the
+    #   in-process detector (serialising access to it), or on a pool of
+    #   worker processes that each load their own copy of the model.
+    # - with offloading disabled everything runs inline on the loop, which
+    #   is the original behaviour and is kept for load-test comparisons.
+
+    def __init__(self, detector, enabled, cv_threads, model_processes):
+        if detector is None and not (enabled and model_processes > 0):
+            # Without worker processes every model call goes to this detector
+            raise ValueError("ExecutorLayer needs an in-process detector unless "
+                             "offloading to model worker processes is enabled")
+        self.detector = detector
+        self.enabled = enabled
+        self.cv_threads = cv_threads
+        self.model_processes = model_processes
+
+        self.cv_pool = None
+        self.model_pool = None
+
+    def start(self):
+        if not self.enabled:
+            return
+
+        self.cv_pool = ThreadPoolExecutor(self.cv_threads, thread_name_prefix="cv")
+
+        if self.model_processes > 0:
+            # "spawn" avoids forking a process that already holds torch threads
+            self.model_pool = ProcessPoolExecutor(
+                self.model_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_model_worker,
+            )
+        else:
+            self.model_pool = ThreadPoolExecutor(1, thread_name_prefix="yolo")
+
+    def shutdown(self):
+        for pool in (self.cv_pool, self.model_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.cv_pool = None
+        self.model_pool = None
+
+    async def run_cv(self, fn, *args):
+        if self.cv_pool is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.cv_pool, fn, *args)
+
+    async def run_model(self, method, *args):
+        # method is a HumanDetector method name so it can cross process boundaries
+        if self.model_pool is None:
+            return getattr(self.detector, method)(*args)
+
+        loop = asyncio.get_running_loop()
+        if self.model_processes > 0:
+            return await loop.run_in_executor(self.model_pool, _call_model_worker, method, *args)
+        return await loop.run_in_executor(self.model_pool, getattr(self.detector, method), *args)
@@ -0,0 +1,70 @@
+"""
+VirtualEye AI — Model export for CPU inference backends
+Exports Config.MODEL_VARIANT's weights to the formats used by inference_backends.py.
+
+Usage (from backend/ai):
+    python export_model.py --onnx            # models/yolov8n.onnx (dynamic batch)
+    python export_model.py --onnx --int8     # + models/yolov8n.int8.onnx
+    python export_model.py --openvino        # models/yolov8n_openvino_model/
+"""
+
+import argparse
+import os
+import shutil
+
+from config import Config
+
+
+def export_onnx(imgsz):
+    from ultralytics import YOLO
+
+    # dynamic=True keeps the batch dimension symbolic so detect_batch works
+    exported = YOLO(Config.variant_weights()).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(Config.ONNX_MODEL_PATH):
+        shutil.move(exported, Config.ONNX_MODEL_PATH)
+    print(f"ONNX model written to {Config.ONNX_MODEL_PATH}")
+
+
+def quantize_int8():
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    # Dynamic quantization: INT8 weights, activations quantized at run time.
+    # Needs no calibration set; check agreement with benchmarks/backend_compare.py.
+    quantize_dynamic(Config.ONNX_MODEL_PATH, Config.ONNX_INT8_MODEL_PATH, weight_type=QuantType.QUInt8)
+    print(f"INT8 model written to {Config.ONNX_INT8_MODEL_PATH}")
+
+
+def export_openvino(imgsz):
+    from ultralytics import YOLO
+
+    exported = YOLO(Config.variant_weights()).export(format="openvino", imgsz=imgsz, dynamic=True)
+    target = os.path.dirname(Config.OPENVINO_MODEL_PATH)
+    if os.path.abspath(exported) != os.path.abspath(target):
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.move(exported, target)
+    print(f"OpenVINO model written to {target}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--onnx", action="store_true")
+    parser.add_argument("--int8", action="store_true", help="Also write an INT8-quantized ONNX model")
+    parser.add_argument("--openvino", action="store_true")
+    parser.add_argument("--imgsz", type=int, default=640)
+    args = parser.parse_args()
+
+    if not (args.onnx or args.int8 or args.openvino):
+        parser.error("choose at least one of --onnx, --int8, --openvino")
+
+    if args.onnx:
+        export_onnx(args.imgsz)
+    if args.int8:
+        if not os.path.exists(Config.ONNX_MODEL_PATH):
+            export_onnx(args.imgsz)
+        quantize_int8()
+    if args.openvino:
+        export_openvino(args.imgsz)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+# Frame ingestion helpers for /detect variants. JPEG uploads are decoded;
+# raw frames are wrapped as NumPy views over the request body and
+# shared-memory frames are copied out of the segment (one memcpy, no decode).
+
+
+def decode_jpeg(contents, flags=cv2.IMREAD_COLOR):
+    npimg = np.frombuffer(contents, np.uint8)
+    return cv2.imdecode(npimg, flags)
+
+
+# cv2 can decode JPEGs straight to 1/2, 1/4 or 1/8 size by skipping DCT work
+REDUCED_GRAYSCALE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+
+def decode_jpeg_reduced(contents, reduction):
+    if reduction not in REDUCED_GRAYSCALE_FLAGS:
+        raise ValueError(f"Reduction must be one of {sorted(REDUCED_GRAYSCALE_FLAGS)}, got {reduction}")
+    return decode_jpeg(contents, REDUCED_GRAYSCALE_FLAGS[reduction])
+
+
+def parse_shape(value):
+    # Accepts "HxWxC" / "HxW" strings or sequences of ints
+    if isinstance(value, str):
+        value = value.lower().split("x")
+    try:
+        shape = tuple(int(v) for v in value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid frame shape: {value!r}")
+
+    if len(shape) not in (2, 3) or any(v <= 0 for v in shape) or (len(shape) == 3 and shape[2] not in (1, 3)):
+        raise ValueError(f"Frame shape must be HxW (gray) or HxWx3 (BGR), got {shape}")
+    return shape
+
+
+def frame_from_raw(buffer, shape):
+    # View a raw uint8 BGR/gray buffer as a frame; no copy is made
+    shape = parse_shape(shape)
+    expected = int(np.prod(shape))
+    if len(buffer) != expected:
+        raise ValueError(f"Expected {expected} bytes for shape {shape}, got {len(buffer)}")
+    return np.frombuffer(buffer, np.uint8).reshape(shape)
+
+
+def _open_segment(name):
+    # Attach to a producer-owned segment without taking ownership of it
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        # Attaching registered the segment with our resource tracker, which
+        # would unlink it when this process exits; the producer owns it.
+        resource_tracker.unregister("/" + shm.name, "shared_memory")
+    return shm
+
+
+def read_shared_frame(name, shape):
+    # Copy a frame out of a producer-owned shared memory segment. The
+    # producer creates and unlinks the segment; we only attach, copy and
+    # close, so no view outlives the mapping (the batcher may hold frames
+    # after the request returns).
+    shape = parse_shape(shape)
+    try:
+        shm = _open_segment(name)
+    except FileNotFoundError:
+        raise ValueError(f"Shared memory segment '{name}' does not exist")
+
+    try:
+        expected = int(np.prod(shape))
+        if shm.size < expected:
+            raise ValueError(f"Segment '{name}' holds {shm.size} bytes, shape {shape} needs {expected}")
+        view = np.ndarray(shape, np.uint8, buffer=shm.buf)
+        frame = view.copy()
+        del view
+    finally:
+        shm.close()
+    return frame
+
+
+def ensure_bgr(frame):
+    # YOLO expects 3-channel input; gray frames are expanded only when needed
+    if frame.ndim == 2:
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    if frame.shape[2] == 1:
+        return cv2.cvtColor(frame[:, :, 0], cv2.COLOR_GRAY2BGR)
+    return frame
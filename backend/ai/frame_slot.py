@@ -0,0 +1,39 @@
+import asyncio
+
+
+class LatestFrameSlot:
+    # Single-slot mailbox between a streaming connection's receiver and its
+    # detection loop. A new frame overwrites one that has not been picked up
+    # yet, so a slow detector always works on the freshest frame and stale
+    # frames are dropped instead of queueing up behind it.
+
+    def __init__(self):
+        self.payload = None
+        self.seq = 0
+        self.received = 0
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def put(self, payload):
+        if self.payload is not None:
+            self.dropped += 1
+        self.payload = payload
+        self.seq += 1
+        self.received += 1
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def take(self):
+        # Returns (seq, payload), or None once closed and drained
+        while self.payload is None:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+        payload, self.payload = self.payload, None
+        return self.seq, payload
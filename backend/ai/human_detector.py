@@ -1,33 +1,214 @@
-import cv2
-import time
-from ultralytics import YOLO
 from config import Config
+from model_registry import registry, resolve_model_path
+from postprocess import merge_detections, summarize_people
 
 class HumanDetector:
-    def __init__(self):
-        # Load the model strictly once
-        self.model = YOLO(Config.MODEL_PATH)
+    def __init__(self, backend=None, model_path=None, variant=None, cascade=None):
+        # Models come from the process-wide registry, so every detector
+        # (and the cascade's second model) shares one loaded copy per
+        # backend/weights pair (ultralytics/PyTorch, onnxruntime or OpenVINO)
+        if model_path is None:
+            self.backend = registry.get_variant(variant, backend)
+        else:
+            self.backend = registry.get(backend, model_path)
+
+        # Cascade: this model is the gate, the escalation model is fetched
+        # from the registry on the first ambiguous frame
+        self.cascade = Config.CASCADE_ENABLED if cascade is None else cascade
+        if self.cascade and model_path is None and (variant or Config.MODEL_VARIANT) == Config.CASCADE_ESCALATE_VARIANT:
+            raise ValueError(f"Cascade would escalate '{Config.CASCADE_ESCALATE_VARIANT}' to itself; "
+                             f"set CASCADE_ESCALATE_VARIANT to a different variant")
+        self.cascade_backend = Config.INFERENCE_BACKEND if backend is None else backend
+        self.escalation_path = None
+        if self.cascade:
+            # Resolved here, not on the first ambiguous frame, so a backend
+            # that cannot load the variant fails at startup
+            try:
+                self.escalation_path = resolve_model_path(self.cascade_backend, Config.CASCADE_ESCALATE_VARIANT)
+            except ValueError as e:
+                raise ValueError(f"Cascade cannot escalate with INFERENCE_BACKEND="
+                                 f"'{self.cascade_backend}': {e}") from e
+        self.cascade_stats = {"frames": 0, "escalated": 0}
+
+    def warmup(self):
+        self.backend.warmup()
+        if self.cascade:
+            self._escalation_model().warmup()
 
     def detect(self, frame):
         # Infer using YOLOv8n. Restrict inference to "person" only.
-        results = self.model(frame, classes=[Config.HUMAN_CLASS_ID], verbose=False)
-        
-        max_conf = 0.0
-        detected = False
-        
-        # Determine highest confidence for the person class
-        for result in results:
-            for box in result.boxes:
-                conf = float(box.conf[0])
-                if conf > max_conf:
-                    max_conf = conf
-
-        # Validate against our configured threshold
-        if max_conf >= Config.CONFIDENCE_THRESHOLD:
-            detected = True
+        detections = self.backend.predict([frame])
+        if self.cascade:
+            return self._cascade([frame], detections)[0]
+        return self._summarize(detections)
+
+    def detect_batch(self, frames):
+        # Run every frame through the model in a single forward pass.
+        # Frames may come from different cameras; results keep input order.
+        if not frames:
+            return []
+
+        detections = self.backend.predict(list(frames))
+        if self.cascade:
+            return self._cascade(frames, detections)
+        return [self._summarize([frame_detections]) for frame_detections in detections]
+
+    def detect_regions(self, frame, boxes, padding=None):
+        # Infer only on padded crops around moving regions. Falls back to the
+        # full frame when there are no boxes or the crops would cover most of it.
+        regions = self.select_regions(frame, boxes, padding)
+        if not regions:
+            return self.detect(frame)
+
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in regions]
+        detections = self.backend.predict(crops, imgsz=self._crop_imgsz(crops))
+
+        # Boxes come back in crop pixels; shift them into the frame and
+        # suppress duplicates of a person cut by two crop borders
+        offsets = [(x1, y1) for x1, y1, _, _ in regions]
+        if self.cascade:
+            # The crops together are the gate's view of the frame
+            merged = merge_detections(detections, offsets)
+            return self._cascade([frame], [merged], iou_threshold=Config.NMS_IOU_THRESHOLD)[0]
+        return summarize_people(detections, offsets, iou_threshold=Config.NMS_IOU_THRESHOLD)
+
+    @staticmethod
+    def _crop_imgsz(crops):
+        # Size the network input to the largest crop instead of upscaling
+        # every crop to the default 640px (multiple of the 32px model stride)
+        longest = max(max(crop.shape[:2]) for crop in crops)
+        return min(Config.ROI_MAX_IMGSZ, -(-longest // 32) * 32)
+
+    def _escalation_model(self):
+        return registry.get(self.cascade_backend, self.escalation_path)
+
+    @staticmethod
+    def cascade_decision(conf, cls):
+        # Decided on the frame's best person score: "positive" (>= HIGH) and
+        # "negative" (< LOW) are accepted from the gate, anything between
+        # is "escalate". A confident person settles the frame even if other
+        # boxes in it are uncertain.
+        person = conf[cls == Config.HUMAN_CLASS_ID]
+        best = float(person.max()) if person.size else 0.0
+        if best >= Config.CASCADE_HIGH_CONFIDENCE:
+            return "positive"
+        if best < Config.CASCADE_LOW_CONFIDENCE:
+            return "negative"
+        return "escalate"
+
+    def _cascade(self, frames, detections, iou_threshold=None):
+        # Frames the gate model is unsure about go to the larger model, all
+        # escalated frames (or crops) in one forward pass. iou_threshold
+        # dedupes gate results merged from ROI crops.
+        results = [None] * len(frames)
+        ambiguous = []
+
+        for i, (boxes, conf, cls) in enumerate(detections):
+            if self.cascade_decision(conf, cls) == "escalate":
+                # No person is confident here, so every band box is uncertain
+                band = (cls == Config.HUMAN_CLASS_ID) & (conf >= Config.CASCADE_LOW_CONFIDENCE)
+                ambiguous.append((i, boxes[band]))
+            else:
+                results[i] = self._summarize([detections[i]], iou_threshold)
 
+        self.cascade_stats["frames"] += len(frames)
+        self.cascade_stats["escalated"] += len(ambiguous)
+        if ambiguous:
+            model = self._escalation_model()
+            if Config.CASCADE_ON_CROP:
+                self._escalate_crops(model, frames, ambiguous, results)
+            else:
+                rerun = model.predict([frames[i] for i, _ in ambiguous])
+                for (i, _), frame_detections in zip(ambiguous, rerun):
+                    results[i] = self._summarize([frame_detections])
+
+        escalated = {i for i, _ in ambiguous}
+        for i, result in enumerate(results):
+            result["escalated"] = i in escalated
+        return results
+
+    def _escalate_crops(self, model, frames, ambiguous, results):
+        # Only the padded crops around the uncertain boxes are re-checked,
+        # falling back to the full frame when the crops would cover most of it
+        jobs = []  # (frame index, regions; empty for the full frame)
+        crops = []
+        full = []
+        for i, band_boxes in ambiguous:
+            regions = self.select_regions(frames[i], band_boxes.astype(int).tolist(), Config.CASCADE_CROP_PADDING)
+            if regions:
+                crops.extend(frames[i][y1:y2, x1:x2] for x1, y1, x2, y2 in regions)
+            else:
+                full.append(i)
+            jobs.append((i, regions))
+
+        crop_detections = iter(model.predict(crops, imgsz=self._crop_imgsz(crops)) if crops else [])
+        full_detections = dict(zip(full, model.predict([frames[i] for i in full]) if full else []))
+
+        for i, regions in jobs:
+            if not regions:
+                results[i] = self._summarize([full_detections[i]])
+                continue
+            parts = [next(crop_detections) for _ in regions]
+            offsets = [(x1, y1) for x1, y1, _, _ in regions]
+            results[i] = summarize_people(parts, offsets, iou_threshold=Config.NMS_IOU_THRESHOLD)
+
+    def cascade_metrics(self):
+        frames = self.cascade_stats["frames"]
         return {
-            "detected": detected,
-            "confidence": float(max_conf),
-            "timestamp": time.time(),
+            "enabled": self.cascade,
+            "escalateVariant": Config.CASCADE_ESCALATE_VARIANT,
+            "band": [Config.CASCADE_LOW_CONFIDENCE, Config.CASCADE_HIGH_CONFIDENCE],
+            **self.cascade_stats,
+            "escalationRate": self.cascade_stats["escalated"] / frames if frames else 0.0,
         }
+
+    @staticmethod
+    def select_regions(frame, boxes, padding=None):
+        padding = Config.ROI_PADDING if padding is None else padding
+        height, width = frame.shape[:2]
+
+        padded = []
+        for x1, y1, x2, y2 in boxes:
+            pad_x = max(int((x2 - x1) * padding), Config.ROI_MIN_PADDING)
+            pad_y = max(int((y2 - y1) * padding), Config.ROI_MIN_PADDING)
+            padded.append([
+                max(0, x1 - pad_x),
+                max(0, y1 - pad_y),
+                min(width, x2 + pad_x),
+                min(height, y2 + pad_y),
+            ])
+
+        regions = HumanDetector._merge_overlapping(padded)
+
+        covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        if not regions or covered > Config.ROI_MAX_COVERAGE * width * height:
+            return []
+        return regions
+
+    @staticmethod
+    def _merge_overlapping(boxes):
+        # Union overlapping boxes until none intersect, so a person split
+        # across several motion contours is inferred in one crop
+        merged = [list(b) for b in boxes]
+        changed = True
+        while changed:
+            changed = False
+            result = []
+            for box in merged:
+                for other in result:
+                    if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                        other[0] = min(other[0], box[0])
+                        other[1] = min(other[1], box[1])
+                        other[2] = max(other[2], box[2])
+                        other[3] = max(other[3], box[3])
+                        changed = True
+                        break
+                else:
+                    result.append(box)
+            merged = result
+        return merged
+
+    def _summarize(self, detections, iou_threshold=None):
+        # Count, boxes and max confidence for the person class, computed on
+        # whole arrays (see postprocess.py)
+        return summarize_people(detections, iou_threshold=iou_threshold)
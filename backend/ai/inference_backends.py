@@ -0,0 +1,171 @@
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+from config import Config
+
+# CPU inference backends for HumanDetector. Every backend takes a list of
+# BGR frames and returns, per frame, person detections as NumPy arrays:
+# (xyxy boxes [N, 4] in frame pixels, confidences [N], class ids [N]).
+
+
+class UltralyticsBackend:
+    name = "ultralytics"
+
+    def __init__(self, model_path=None):
+        from ultralytics import YOLO
+        self.model = YOLO(model_path or Config.variant_weights())
+
+    def predict(self, frames, imgsz=None):
+        kwargs = {"imgsz": imgsz} if imgsz else {}
+        results = self.model(frames, classes=[Config.HUMAN_CLASS_ID], verbose=False, **kwargs)
+
+        # One device->host transfer per tensor instead of per box
+        detections = []
+        for result in results:
+            boxes = result.boxes
+            detections.append((
+                boxes.xyxy.cpu().numpy(),
+                boxes.conf.cpu().numpy(),
+                boxes.cls.cpu().numpy(),
+            ))
+        return detections
+
+
+class _ExportedYoloBackend(ABC):
+    # Shared pre/post-processing for YOLOv8 graphs exported from ultralytics.
+    # Output layout is [batch, 4 + num_classes, anchors] with cx, cy, w, h first.
+
+    input_size = 640
+    fixed_batch = False
+
+    @abstractmethod
+    def _run(self, blob):
+        # Run the graph on an [N, 3, H, W] float32 blob; returns its raw output
+        ...
+
+    def predict(self, frames, imgsz=None):
+        # Exported graphs have a fixed input size; imgsz hints are ignored
+        letterboxed = [self._letterbox(frame) for frame in frames]
+        images = [image for image, _, _ in letterboxed]
+
+        if self.fixed_batch:
+            outputs = np.concatenate([self._run(self._blob([image])) for image in images])
+        else:
+            outputs = self._run(self._blob(images))
+
+        return [
+            self._postprocess(output, ratio, pad)
+            for output, (_, ratio, pad) in zip(outputs, letterboxed)
+        ]
+
+    def _letterbox(self, frame):
+        size = self.input_size
+        height, width = frame.shape[:2]
+        ratio = min(size / height, size / width)
+        new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+
+        resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        left, top = (size - new_w) // 2, (size - new_h) // 2
+        image = cv2.copyMakeBorder(
+            resized, top, size - new_h - top, left, size - new_w - left,
+            cv2.BORDER_CONSTANT, value=(114, 114, 114),
+        )
+        return image, ratio, (left, top)
+
+    def _blob(self, images):
+        # NCHW float32 RGB in [0, 1]
+        return cv2.dnn.blobFromImages(images, 1.0 / 255.0, swapRB=True)
+
+    def _postprocess(self, output, ratio, pad):
+        scores = output[4 + Config.HUMAN_CLASS_ID]
+        keep = scores >= Config.BACKEND_MIN_CONFIDENCE
+        if not keep.any():
+            return np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.float32)
+
+        cx, cy, w, h = output[:4, keep]
+        conf = scores[keep]
+
+        # Undo letterbox padding and scaling
+        x1 = (cx - w / 2 - pad[0]) / ratio
+        y1 = (cy - h / 2 - pad[1]) / ratio
+        xywh = np.stack([x1, y1, w / ratio, h / ratio], axis=1)
+
+        indices = cv2.dnn.NMSBoxes(
+            xywh.tolist(), conf.tolist(), Config.BACKEND_MIN_CONFIDENCE, Config.NMS_IOU_THRESHOLD
+        )
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+
+        xywh, conf = xywh[indices], conf[indices]
+        xyxy = np.concatenate([xywh[:, :2], xywh[:, :2] + xywh[:, 2:]], axis=1)
+        return xyxy.astype(np.float32), conf.astype(np.float32), np.full(len(conf), Config.HUMAN_CLASS_ID, np.float32)
+
+
+class OnnxRuntimeBackend(_ExportedYoloBackend):
+    name = "onnxruntime"
+
+    def __init__(self, model_path=None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("INFERENCE_BACKEND='onnxruntime' requires: pip install onnxruntime")
+
+        if model_path is None:
+            model_path = Config.ONNX_INT8_MODEL_PATH if Config.USE_INT8 else Config.ONNX_MODEL_PATH
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if Config.INFERENCE_THREADS:
+            options.intra_op_num_threads = Config.INFERENCE_THREADS
+
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+
+        # Dynamic exports report symbolic dims; static exports fix batch to 1
+        batch, _, height, _ = model_input.shape
+        self.fixed_batch = isinstance(batch, int)
+        if isinstance(height, int):
+            self.input_size = height
+
+    def _run(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVinoBackend(_ExportedYoloBackend):
+    name = "openvino"
+
+    def __init__(self, model_path=None):
+        try:
+            import openvino as ov
+        except ImportError:
+            raise ImportError("INFERENCE_BACKEND='openvino' requires: pip install openvino")
+
+        core = ov.Core()
+        config = {"INFERENCE_NUM_THREADS": Config.INFERENCE_THREADS} if Config.INFERENCE_THREADS else {}
+        model = core.read_model(model_path or Config.OPENVINO_MODEL_PATH)
+
+        model_input = model.inputs[0].get_partial_shape()
+        self.fixed_batch = model_input[0].is_static
+        if model_input[2].is_static:
+            self.input_size = model_input[2].get_length()
+
+        self.compiled = core.compile_model(model, "CPU", config)
+        self.output = self.compiled.output(0)
+
+    def _run(self, blob):
+        return self.compiled(blob)[self.output]
+
+
+BACKENDS = {
+    "ultralytics": UltralyticsBackend,
+    "onnxruntime": OnnxRuntimeBackend,
+    "openvino": OpenVinoBackend,
+}
+
+
+def create_backend(name=None, model_path=None):
+    name = Config.INFERENCE_BACKEND if name is None else name
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}', expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name](model_path)
@@ -1,49 +1,435 @@
-from fastapi import FastAPI, UploadFile, File, Response
-import cv2
-import numpy as np
+import asyncio
+from typing import List, Optional
 
+from fastapi import (
+    FastAPI, UploadFile, File, Form, Header, Request, Response, HTTPException,
+    WebSocket, WebSocketDisconnect,
+)
+from pydantic import BaseModel
+
+from config import Config
 from motion_detector import IntelligentMotionDetector
+from tamper_detector import TamperDetector
+from person_tracker import PersonTracker
 from human_detector import HumanDetector
+from batcher import MicroBatcher
+from executors import ExecutorLayer
+from stream_state import StreamStateRegistry
+from frame_ingest import decode_jpeg, decode_jpeg_reduced, frame_from_raw, read_shared_frame, ensure_bgr
+from frame_slot import LatestFrameSlot
+from model_registry import registry
 
 app = FastAPI(title="VirtualEye AI Module")
 
-# Initialize models globally (loaded exactly once)
-motion_tracker = IntelligentMotionDetector()
-human_tracker = HumanDetector()
+# Motion baselines are kept per camera so streams never diff against each other
+motion_states = StreamStateRegistry(
+    IntelligentMotionDetector,
+    Config.MAX_STREAMS,
+    Config.STREAM_IDLE_SECONDS,
+)
+
+# Tamper references (blackout, occlusion, defocus, scene change) likewise
+tamper_states = StreamStateRegistry(
+    TamperDetector,
+    Config.MAX_STREAMS,
+    Config.STREAM_IDLE_SECONDS,
+)
+
+# Person tracks between YOLO runs, per camera
+track_states = StreamStateRegistry(
+    PersonTracker,
+    Config.MAX_STREAMS,
+    Config.STREAM_IDLE_SECONDS,
+)
+tracking_stats = {"inferred": 0, "tracked": 0}
+
+# Initialize models globally (loaded exactly once).
+# With model worker processes enabled each worker loads its own copy instead;
+# they only exist when offloading is on, otherwise YOLO runs in this process.
+MODEL_PROCESSES = Config.MODEL_PROCESS_WORKERS if Config.EXECUTOR_OFFLOAD_ENABLED else 0
+human_tracker = HumanDetector() if MODEL_PROCESSES == 0 else None
+
+# Thread pool for OpenCV stages, dedicated thread or processes for YOLO
+executors = ExecutorLayer(
+    human_tracker,
+    Config.EXECUTOR_OFFLOAD_ENABLED,
+    Config.CV_THREAD_WORKERS,
+    MODEL_PROCESSES,
+)
+
+
+async def run_detect_batch(frames):
+    return await executors.run_model("detect_batch", frames)
+
+
+# Coalesces concurrent /detect calls into single YOLO batches
+batcher = MicroBatcher(run_detect_batch, Config.BATCH_MAX_FRAMES, Config.BATCH_MAX_WAIT_MS)
+
+
+@app.on_event("startup")
+async def start_workers():
+    executors.start()
+    # Model worker processes warm up in their initializer
+    if Config.MODEL_WARMUP and human_tracker is not None:
+        await executors.run_model("warmup")
+    if Config.MICRO_BATCHING_ENABLED:
+        batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    await batcher.stop()
+    executors.shutdown()
+
+
+def detect_motion(frame, camera_id, prescale=1.0):
+    # Tamper statistics come first and ride along in the motion result under
+    # "tamper" until the response is assembled (see split_tamper)
+    tamper_res = None
+    if Config.TAMPER_ENABLED:
+        with tamper_states.acquire(camera_id) as tamper_tracker:
+            tamper_res = tamper_tracker.detect(frame, prescale)
+
+    # Frames of one camera are diffed in order against that camera's baseline
+    with motion_states.acquire(camera_id) as motion_tracker:
+        motion_res = motion_tracker.detect(frame, prescale)
+    motion_res["tamper"] = tamper_res
+    return motion_res
+
+
+def split_tamper(motion_res):
+    # A covered, blacked-out or blurred view has nothing for YOLO to find.
+    # A changed scene still does (it may be a person right at the lens), so
+    # only the reasons in TAMPER_GATE_REASONS skip YOLO; all are reported.
+    tamper_res = motion_res.pop("tamper", None)
+    return tamper_res, blocks_detection(tamper_res)
+
+
+def blocks_detection(tamper_res):
+    return bool(tamper_res and tamper_res["tampered"] and tamper_res["reason"] in Config.TAMPER_GATE_REASONS)
+
+
+def decode_and_detect_motion(contents, camera_id):
+    # Runs on the cv thread pool: decode + motion are pure OpenCV work.
+    # Returns (frame, motion_res); motion_res is None if the image is invalid
+    # and frame is None when motion did not pass and no full decode was needed.
+    reduction = Config.MOTION_DECODE_REDUCTION
+    if reduction == 1:
+        frame = decode_jpeg(contents)
+        if frame is None:
+            return None, None
+        return frame, detect_motion(frame, camera_id)
+
+    # Most frames stop at the motion gate, so decode those straight to a
+    # reduced grayscale image and pay for a full color decode only on motion
+    gray = decode_jpeg_reduced(contents, reduction)
+    if gray is None:
+        return None, None
+
+    motion_res = detect_motion(gray, camera_id, 1.0 / reduction)
+    if not motion_res["motionDetected"] or blocks_detection(motion_res["tamper"]):
+        return None, motion_res
+
+    frame = decode_jpeg(contents)
+    if frame is None:
+        return None, None
+    return frame, motion_res
+
+
+def propagate_tracks(frame, camera_id):
+    # Returns the tracked result, or None when the tracker wants a YOLO run
+    # on this frame (before propagating, or because a track decayed on it)
+    with track_states.acquire(camera_id) as tracker:
+        if tracker.needs_inference():
+            return None
+        return tracker.propagate(frame)
+
+
+def update_tracks(frame, camera_id, boxes, confidences):
+    with track_states.acquire(camera_id) as tracker:
+        return tracker.update(frame, boxes, confidences)
+
+
+def skip_tracks(camera_id):
+    with track_states.acquire(camera_id) as tracker:
+        tracker.skip()
+
+
+async def detect_tracked(frame, camera_id):
+    # The per-camera lock is only held inside each cv step, never across the
+    # model call, so other cameras are not blocked while YOLO runs
+    human_res = await executors.run_cv(propagate_tracks, frame, camera_id)
+    if human_res is not None:
+        tracking_stats["tracked"] += 1
+        return human_res
+
+    # Same detection as untracked frames: area filter and cascade included
+    detected = await executors.run_model("detect", frame)
+    tracking_stats["inferred"] += 1
+    return await executors.run_cv(
+        update_tracks, frame, camera_id, detected["boxes"], detected["confidences"]
+    )
+
+
+def skipped_human():
+    return {
+        "detected": False,
+        "confidence": 0.0,
+        "timestamp": 0.0,
+        "skipped": True
+    }
+
 
 @app.post("/detect")
-async def detect_human(image: UploadFile = File(...)):
+async def detect_human(
+    image: UploadFile = File(...),
+    camera_id: str = Form(Config.DEFAULT_STREAM_ID),
+):
     # Read raw image payload
     contents = await image.read()
-    npimg = np.frombuffer(contents, np.uint8)
-    frame = cv2.imdecode(npimg, cv2.IMREAD_COLOR)
+    return await detect_jpeg(contents, camera_id)
 
-    if frame is None:
+
+async def detect_jpeg(contents, camera_id):
+    # 1. Step: Decode + Motion Detection Check
+    frame, motion_res = await executors.run_cv(decode_and_detect_motion, contents, camera_id)
+
+    if motion_res is None:
         return {"error": "Failed to decode image"}
-    
-    # 1. Step: Motion Detection Check
-    motion_res = motion_tracker.detect(frame)
-    
-    if not motion_res["motionDetected"]:
+
+    return await detect_after_motion(frame, motion_res, camera_id)
+
+
+async def detect_after_motion(frame, motion_res, camera_id):
+    tamper_res, blocked = split_tamper(motion_res)
+    if not motion_res["motionDetected"] or blocked:
+        if Config.TRACKING_ENABLED:
+            await executors.run_cv(skip_tracks, camera_id)
         return {
             "motion": motion_res,
-            "human": {
-                "detected": False,
-                "confidence": 0.0,
-                "timestamp": 0.0,
-                "skipped": True
-            }
+            "tamper": tamper_res,
+            "human": skipped_human()
         }
-        
+
+    # Raw gray frames only need expanding to BGR once YOLO must run
+    if frame.ndim == 2 or frame.shape[2] == 1:
+        frame = await executors.run_cv(ensure_bgr, frame)
+
     # 2. Step: Human Detection run conditionally to save performance
-    human_res = human_tracker.detect(frame)
+    if Config.TRACKING_ENABLED:
+        # Full YOLO only every few frames; the tracker fills in the rest
+        human_res = await detect_tracked(frame, camera_id)
+    elif Config.ROI_INFERENCE_ENABLED:
+        # Only the padded regions around motion reach the model
+        human_res = await executors.run_model("detect_regions", frame, motion_res["motionBoxes"])
+    elif Config.MICRO_BATCHING_ENABLED:
+        human_res = await batcher.submit(frame)
+    else:
+        human_res = await executors.run_model("detect", frame)
     human_res["skipped"] = False
-    
+
     return {
         "motion": motion_res,
+        "tamper": tamper_res,
         "human": human_res
     }
 
+
+@app.post("/detect/raw")
+async def detect_human_raw(
+    request: Request,
+    x_frame_shape: str = Header(...),
+    x_camera_id: str = Header(Config.DEFAULT_STREAM_ID),
+):
+    # Body is an uncompressed uint8 frame, shape given as "HxWx3" (BGR) or "HxW" (gray).
+    # The frame is a view over the request body: no JPEG decode, no extra copy.
+    try:
+        frame = frame_from_raw(await request.body(), x_frame_shape)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    motion_res = await executors.run_cv(detect_motion, frame, x_camera_id)
+    return await detect_after_motion(frame, motion_res, x_camera_id)
+
+
+class SharedFrame(BaseModel):
+    name: str
+    shape: List[int]
+    camera_id: str = Config.DEFAULT_STREAM_ID
+
+
+@app.post("/detect/shm")
+async def detect_human_shm(payload: SharedFrame):
+    # Co-located producers write frames into a multiprocessing.shared_memory
+    # segment and send only its name; the frame is copied out and the
+    # segment closed before detection, so batched frames never pin it.
+    try:
+        frame = read_shared_frame(payload.name, payload.shape)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    motion_res = await executors.run_cv(detect_motion, frame, payload.camera_id)
+    return await detect_after_motion(frame, motion_res, payload.camera_id)
+
+
+@app.post("/detect/batch")
+async def detect_human_batch(
+    images: List[UploadFile] = File(...),
+    camera_ids: Optional[List[str]] = Form(None),
+):
+    if len(images) > Config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {Config.MAX_BATCH_SIZE} frames per batch"
+        )
+
+    # camera_ids[i] names the stream of images[i]; omitted ids use the default stream
+    camera_ids = camera_ids or []
+    if len(camera_ids) > len(images):
+        raise HTTPException(status_code=422, detail="More camera_ids than images")
+    camera_ids = camera_ids + [Config.DEFAULT_STREAM_ID] * (len(images) - len(camera_ids))
+
+    results = []
+    pending = []  # (result index, frame, motion boxes) of frames that passed the motion gate
+
+    # With tracking on, frames go through each camera's tracker in order, as
+    # they would one by one on /detect. Once a camera has a frame waiting for
+    # this batch's YOLO run, its later tracker steps are deferred and
+    # replayed after the run, so nothing propagates from a stale frame.
+    tracking = Config.TRACKING_ENABLED
+    waiting = set()
+    deferred = []  # (result index, camera id, frame, or None for a skip)
+
+    for image, camera_id in zip(images, camera_ids):
+        frame, motion_res = await executors.run_cv(
+            decode_and_detect_motion, await image.read(), camera_id
+        )
+        if motion_res is None:
+            results.append({"error": "Failed to decode image"})
+            continue
+
+        tamper_res, blocked = split_tamper(motion_res)
+        results.append({"motion": motion_res, "tamper": tamper_res, "human": skipped_human()})
+        index = len(results) - 1
+
+        if not motion_res["motionDetected"] or blocked:
+            if tracking and camera_id in waiting:
+                deferred.append((index, camera_id, None))
+            elif tracking:
+                await executors.run_cv(skip_tracks, camera_id)
+            continue
+
+        if tracking and camera_id not in waiting:
+            human_res = await executors.run_cv(propagate_tracks, frame, camera_id)
+            if human_res is not None:
+                tracking_stats["tracked"] += 1
+                human_res["skipped"] = False
+                results[index]["human"] = human_res
+                continue
+
+        pending.append((index, frame, motion_res["motionBoxes"]))
+        if tracking:
+            waiting.add(camera_id)
+            deferred.append((index, camera_id, frame))
+
+    # Only motion-positive frames reach YOLO, all of them in one forward pass.
+    # With ROI inference (and no tracking, which needs full frames) each frame
+    # runs on its own motion crops instead, exactly as it would on /detect.
+    if pending:
+        if Config.ROI_INFERENCE_ENABLED and not tracking:
+            human_results = [
+                await executors.run_model("detect_regions", frame, boxes)
+                for _, frame, boxes in pending
+            ]
+        else:
+            human_results = await run_detect_batch([frame for _, frame, _ in pending])
+        for (index, _, _), human_res in zip(pending, human_results):
+            human_res["skipped"] = False
+            results[index]["human"] = human_res
+
+    for index, camera_id, frame in deferred:
+        if frame is None:
+            await executors.run_cv(skip_tracks, camera_id)
+            continue
+        detected = results[index]["human"]
+        tracking_stats["inferred"] += 1
+        human_res = await executors.run_cv(
+            update_tracks, frame, camera_id, detected["boxes"], detected["confidences"]
+        )
+        human_res["skipped"] = False
+        results[index]["human"] = human_res
+
+    return {"results": results}
+
+
+@app.websocket("/detect/stream")
+async def detect_stream(websocket: WebSocket, camera_id: str = Config.DEFAULT_STREAM_ID):
+    # Persistent connection for a camera producer: send JPEG frames as binary
+    # messages, receive one JSON result per processed frame. Frames that arrive
+    # while the previous one is still being analysed replace each other, so
+    # results always describe the newest frame rather than a growing backlog.
+    await websocket.accept()
+    slot = LatestFrameSlot()
+
+    async def receive_frames():
+        try:
+            while True:
+                slot.put(await websocket.receive_bytes())
+        except (WebSocketDisconnect, RuntimeError, KeyError):
+            # RuntimeError/KeyError: disconnected or non-binary message
+            pass
+        finally:
+            slot.close()
+
+    receiver = asyncio.create_task(receive_frames())
+    try:
+        while True:
+            item = await slot.take()
+            if item is None:
+                break
+
+            seq, contents = item
+            result = await detect_jpeg(contents, camera_id)
+            result["seq"] = seq
+            result["dropped"] = slot.dropped
+            await websocket.send_json(result)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+
+
+@app.get("/metrics/batcher")
+async def batcher_metrics():
+    return batcher.metrics()
+
+
+@app.get("/metrics/streams")
+async def stream_metrics():
+    return motion_states.metrics()
+
+
+@app.get("/metrics/models")
+async def model_metrics():
+    # Models loaded in this process (worker processes keep their own)
+    return registry.metrics()
+
+
+@app.get("/metrics/cascade")
+async def cascade_metrics():
+    # Counted by the detector that ran the frames (one worker's with process workers)
+    return await executors.run_model("cascade_metrics")
+
+
+@app.get("/metrics/tracking")
+async def tracking_metrics():
+    frames = tracking_stats["inferred"] + tracking_stats["tracked"]
+    return {
+        **tracking_stats,
+        "inferenceRate": tracking_stats["inferred"] / frames if frames else 0.0,
+        "streams": track_states.metrics(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+
+import numpy as np
+from config import Config
+from inference_backends import create_backend
+
+# Process-wide registry of loaded models. Each (backend, weights) pair is
+# loaded once, on first use, however many HumanDetectors ask for it; a
+# per-entry lock serialises predict() calls, since neither the ultralytics
+# predictor nor an OpenVINO infer request is safe to call from two threads.
+# Every entry records its load time, warm-up time and the resident memory
+# the load added, for /metrics/models.
+
+
+def resident_mb():
+    # Current RSS from /proc, falling back to the peak where /proc is missing
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return 0.0  # Windows: memory is not reported
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def resolve_model_path(backend, variant=None):
+    # ultralytics loads the variant's .pt file (Config.variant_weights);
+    # exported backends only have MODEL_VARIANT's export, selected by None
+    variant = Config.MODEL_VARIANT if variant is None else variant
+    if variant not in Config.MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}', expected one of {sorted(Config.MODEL_VARIANTS)}")
+    if backend == "ultralytics":
+        return Config.variant_weights(variant)
+    if variant == Config.MODEL_VARIANT:
+        return None
+    raise ValueError(f"Model variant '{variant}' needs INFERENCE_BACKEND='ultralytics'; "
+                     f"export it and pass its path instead")
+
+
+class SharedModel:
+    # A loaded backend plus the bookkeeping the registry reports
+    def __init__(self, name, model_path, backend, load_seconds, memory_mb):
+        self.name = name
+        self.model_path = model_path
+        self.backend = backend
+        self.lock = threading.Lock()
+
+        self.load_seconds = load_seconds
+        self.memory_mb = memory_mb
+        self.warmup_seconds = None
+        self.first_predict_seconds = None
+        self.predictions = 0
+
+    def predict(self, frames, imgsz=None):
+        with self.lock:
+            started = time.perf_counter()
+            detections = self.backend.predict(frames, imgsz=imgsz)
+            if self.first_predict_seconds is None:
+                self.first_predict_seconds = time.perf_counter() - started
+            self.predictions += 1
+            return detections
+
+    def warmup(self):
+        # One dummy inference allocates buffers and builds kernels, so the
+        # first real frame is not the one that pays for it
+        if self.warmup_seconds is not None:
+            return
+        width, height = Config.MODEL_WARMUP_SIZE
+        with self.lock:
+            started = time.perf_counter()
+            self.backend.predict([np.zeros((height, width, 3), np.uint8)])
+            self.warmup_seconds = time.perf_counter() - started
+
+    def metrics(self):
+        def ms(seconds):
+            return None if seconds is None else round(1000.0 * seconds, 1)
+
+        return {
+            "backend": self.name,
+            "modelPath": self.model_path,
+            "loadMs": ms(self.load_seconds),
+            "warmupMs": ms(self.warmup_seconds),
+            "firstPredictMs": ms(self.first_predict_seconds),
+            "memoryMb": round(self.memory_mb, 1),
+            "predictions": self.predictions,
+        }
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> lock held while that model loads
+
+    def get(self, backend=None, model_path=None):
+        backend = Config.INFERENCE_BACKEND if backend is None else backend
+        if backend == "ultralytics" and model_path is None:
+            model_path = Config.variant_weights()  # same weights, same entry
+        key = (backend, model_path)
+
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        # Only callers of the same model wait on its load; others proceed
+        with self._lock:
+            load_lock = self._loading.setdefault(key, threading.Lock())
+        with load_lock:
+            model = self._models.get(key)
+            if model is None:
+                before = resident_mb()
+                started = time.perf_counter()
+                loaded = create_backend(backend, model_path)
+                model = SharedModel(backend, model_path, loaded,
+                                    time.perf_counter() - started, resident_mb() - before)
+                with self._lock:
+                    self._models[key] = model
+        return model
+
+    def get_variant(self, variant=None, backend=None):
+        backend = Config.INFERENCE_BACKEND if backend is None else backend
+        return self.get(backend, resolve_model_path(backend, variant))
+
+    def metrics(self):
+        with self._lock:
+            models = list(self._models.values())
+        return {
+            "models": [model.metrics() for model in models],
+            "residentMb": round(resident_mb(), 1),
+        }
+
+
+registry = ModelRegistry()
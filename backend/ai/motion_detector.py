@@ -1,43 +1,77 @@
 import cv2
 import time
 from config import Config
+from background_models import create_background_model
 
 class IntelligentMotionDetector:
-    def __init__(self):
+    def __init__(self, downscale=None, backend=None):
         self.contour_threshold = Config.MOTION_CONTOUR_THRESHOLD
-        self.prev_frame = None
-
-    def detect(self, frame):
-        # Convert to grayscale and apply Gaussian Blur
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
-
-        # Baseline frame needed for differencing
-        if self.prev_frame is None:
-            self.prev_frame = gray
-            return {"motionDetected": False, "motionArea": 0.0}
-
-        # Subtractive Frame Differencing
-        frame_delta = cv2.absdiff(self.prev_frame, gray)
-        thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
-        
+
+        # Foreground mask source (see background_models.py)
+        self.background = create_background_model(backend)
+        self.frame_shape = None
+
+        # Motion analysis can run on a reduced copy of the frame; areas and
+        # boxes are mapped back to full-resolution units before returning.
+        self.scale = Config.MOTION_DOWNSCALE if downscale is None else downscale
+
+    def detect(self, frame, prescale=1.0):
+        # prescale is how much the caller already shrank the frame (e.g. a
+        # reduced JPEG decode); we only resize further if asked for less.
+        scale = prescale
+        if self.scale < prescale:
+            extra = self.scale / prescale
+            frame = cv2.resize(frame, None, fx=extra, fy=extra, interpolation=cv2.INTER_AREA)
+            scale = self.scale
+
+        blur = max(3, int(round(21 * scale))) | 1
+
+        # Convert to grayscale (raw gray frames arrive single-channel) and apply Gaussian Blur
+        if frame.ndim == 3 and frame.shape[2] == 3:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = frame.reshape(frame.shape[:2])
+        gray = cv2.GaussianBlur(gray, (blur, blur), 0)
+
+        # A resolution change invalidates whatever baseline we have
+        if gray.shape != self.frame_shape:
+            self.background.reset()
+            self.frame_shape = gray.shape
+
+        # Foreground mask from the configured background model;
+        # None while the baseline is still being built
+        thresh = self.background.apply(gray)
+        if thresh is None:
+            return {"motionDetected": False, "motionArea": 0.0, "motionBoxes": []}
+
         # Dilate holes caused by jitter
         thresh = cv2.dilate(thresh, None, iterations=2)
-        
+
         # Find continuous boundries around change
-        contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        self.prev_frame = gray
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # Contour areas shrink with the square of the downscale factor
+        area_scale = 1.0 / (scale * scale)
 
         max_area = 0.0
+        boxes = []
         for c in contours:
-            area = cv2.contourArea(c)
+            area = cv2.contourArea(c) * area_scale
             if area > max_area:
                 max_area = float(area)
-        
+            if area > self.contour_threshold:
+                x, y, w, h = cv2.boundingRect(c)
+                boxes.append([
+                    int(x / scale),
+                    int(y / scale),
+                    int((x + w) / scale),
+                    int((y + h) / scale),
+                ])
+
         motion_detected = max_area > self.contour_threshold
 
         return {
             "motionDetected": motion_detected,
-            "motionArea": float(max_area)
+            "motionArea": float(max_area),
+            "motionBoxes": boxes,
         }
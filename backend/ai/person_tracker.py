@@ -0,0 +1,229 @@
+import time
+
+import cv2
+import numpy as np
+from config import Config
+
+# Person tracks kept between YOLO runs for one camera. A full detection is
+# needed only every TRACK_REDETECT_INTERVAL frames, when a visible track's
+# confidence has decayed below CONFIDENCE_THRESHOLD (any track's below
+# TRACK_MIN_CONFIDENCE) or when nothing is being tracked; the frames in
+# between move the existing boxes along with pyramidal Lucas-Kanade optical
+# flow ("flow") or simply hold them ("hold"). A propagated frame on which a
+# visible track would fall below CONFIDENCE_THRESHOLD is handed back to YOLO,
+# so "detected" always implies a confidence at or above the threshold.
+#
+# Detections are associated to tracks greedily by IoU, falling back to the
+# nearest centroid within TRACK_MAX_CENTROID_SHIFT box sizes, so a person
+# keeps a stable id while in view and each new id means someone entered.
+
+
+class _Track:
+    def __init__(self, track_id, box, confidence, now):
+        self.id = track_id
+        self.box = box
+        self.confidence = confidence
+        self.misses = 0
+        self.first_seen = now
+
+
+def iou_matrix(a, b):
+    # Pairwise IoU of [N, 4] and [M, 4] xyxy boxes
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+class PersonTracker:
+    def __init__(self, propagation=None):
+        self.propagation = Config.TRACK_PROPAGATION if propagation is None else propagation
+        self.tracks = []
+        self.next_id = 1
+        self.prev_gray = None
+        self.frames_since_inference = 0
+
+    def reset(self):
+        self.tracks = []
+        self.prev_gray = None
+        self.frames_since_inference = 0
+
+    def skip(self):
+        # The caller skipped a frame (no motion, or a tampered view): flow
+        # across the gap would be meaningless, so the next frame that
+        # reaches the tracker runs YOLO. Tracks are kept so ids stay stable.
+        self.prev_gray = None
+        self.frames_since_inference = Config.TRACK_REDETECT_INTERVAL
+
+    def needs_inference(self):
+        if not self.tracks or self.frames_since_inference + 1 >= Config.TRACK_REDETECT_INTERVAL:
+            return True
+        # A visible track that decayed below CONFIDENCE_THRESHOLD is re-checked
+        # by YOLO before "detected" can change, so the flag never flips on a
+        # propagated frame
+        visible = [track.confidence for track in self.tracks if track.misses == 0]
+        if visible and min(visible) < Config.CONFIDENCE_THRESHOLD:
+            return True
+        return min(track.confidence for track in self.tracks) < Config.TRACK_MIN_CONFIDENCE
+
+    def _gray(self, frame):
+        if frame.ndim == 3 and frame.shape[2] == 3:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = frame.reshape(frame.shape[:2])
+        scale = Config.TRACK_FLOW_SCALE
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def update(self, frame, boxes, confidences):
+        # Fold a full YOLO result (xyxy boxes, confidences) into the tracks
+        now = time.time()
+        boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+        confidences = np.asarray(confidences, np.float32)
+        keep = confidences >= Config.CONFIDENCE_THRESHOLD
+        boxes, confidences = boxes[keep], confidences[keep]
+
+        matched_tracks, matched_dets = self._associate(boxes)
+        for t, d in zip(matched_tracks, matched_dets):
+            track = self.tracks[t]
+            track.box = boxes[d]
+            track.confidence = float(confidences[d])
+            track.misses = 0
+
+        # Tracks the model no longer sees are kept for a few runs in case of
+        # a missed detection, then dropped
+        matched = set(matched_tracks)
+        survivors = []
+        for t, track in enumerate(self.tracks):
+            if t not in matched:
+                track.misses += 1
+                track.confidence *= Config.TRACK_CONFIDENCE_DECAY
+                if track.misses > Config.TRACK_MAX_MISSES:
+                    continue
+            survivors.append(track)
+
+        new_ids = []
+        taken = set(matched_dets)
+        for d in range(len(boxes)):
+            if d not in taken:
+                survivors.append(_Track(self.next_id, boxes[d], float(confidences[d]), now))
+                new_ids.append(self.next_id)
+                self.next_id += 1
+
+        self.tracks = survivors
+        self.prev_gray = self._gray(frame) if self.propagation == "flow" else None
+        self.frames_since_inference = 0
+        return self._result(now, inferred=True, new_ids=new_ids)
+
+    def propagate(self, frame):
+        # Carry the tracks over a frame that was not sent to the model.
+        # Returns None when a visible track decayed below CONFIDENCE_THRESHOLD
+        # on this frame: the caller runs YOLO on it and calls update().
+        now = time.time()
+        self.frames_since_inference += 1
+        if self.propagation == "flow":
+            self._propagate_flow(frame)
+        else:
+            for track in self.tracks:
+                track.confidence *= Config.TRACK_CONFIDENCE_DECAY
+        if any(track.confidence < Config.CONFIDENCE_THRESHOLD for track in self.tracks if track.misses == 0):
+            return None
+        return self._result(now, inferred=False, new_ids=[])
+
+    def _propagate_flow(self, frame):
+        gray = self._gray(frame)
+        prev, self.prev_gray = self.prev_gray, gray
+        if not self.tracks:
+            return
+        if prev is None or prev.shape != gray.shape:
+            for track in self.tracks:
+                track.confidence *= Config.TRACK_CONFIDENCE_DECAY
+            return
+
+        # A small grid of points inside each box, tracked in one LK call
+        scale = Config.TRACK_FLOW_SCALE
+        grid = np.linspace(0.2, 0.8, Config.TRACK_FLOW_POINTS, dtype=np.float32)
+        gx, gy = np.meshgrid(grid, grid)
+        offsets = np.stack([gx.ravel(), gy.ravel()], axis=1)
+
+        boxes = np.array([track.box for track in self.tracks], np.float32) * scale
+        sizes = boxes[:, 2:] - boxes[:, :2]
+        points = boxes[:, None, :2] + offsets[None] * sizes[:, None]
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(
+            prev, gray, points.reshape(-1, 1, 2), None, winSize=(15, 15), maxLevel=2
+        )
+        shifts = (moved.reshape(points.shape) - points) / scale
+        ok = status.reshape(points.shape[:2]).astype(bool)
+
+        height, width = frame.shape[:2]
+        for track, shift, good in zip(self.tracks, shifts, ok):
+            # Confidence decays every frame, faster when the points are lost
+            share = good.mean()
+            track.confidence *= Config.TRACK_CONFIDENCE_DECAY * (0.5 + 0.5 * share)
+            if share == 0:
+                continue
+            dx, dy = np.median(shift[good], axis=0)
+            track.box = np.clip(track.box + np.array([dx, dy, dx, dy], np.float32),
+                                0, [width, height, width, height]).astype(np.float32)
+
+    def _associate(self, boxes):
+        if not self.tracks or not len(boxes):
+            return [], []
+
+        track_boxes = np.array([track.box for track in self.tracks], np.float32)
+        scores = iou_matrix(track_boxes, boxes)
+
+        # Centroid fallback for fast movers whose boxes no longer overlap:
+        # distance in units of the track's box diagonal, scored below any IoU match
+        centers_t = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        centers_d = (boxes[:, :2] + boxes[:, 2:]) / 2
+        diag = np.linalg.norm(track_boxes[:, 2:] - track_boxes[:, :2], axis=1)
+        dist = np.linalg.norm(centers_t[:, None] - centers_d[None], axis=2) / np.maximum(diag[:, None], 1.0)
+        near = (scores < Config.TRACK_IOU_THRESHOLD) & (dist < Config.TRACK_MAX_CENTROID_SHIFT)
+        scores = np.where(near, Config.TRACK_IOU_THRESHOLD * (1 - dist / Config.TRACK_MAX_CENTROID_SHIFT) * 0.5,
+                          np.where(scores >= Config.TRACK_IOU_THRESHOLD, scores, 0.0))
+
+        # Greedy assignment, best pair first
+        matched_tracks, matched_dets = [], []
+        for flat in np.argsort(scores, axis=None)[::-1]:
+            t, d = np.unravel_index(flat, scores.shape)
+            if scores[t, d] <= 0:
+                break
+            if t in matched_tracks or d in matched_dets:
+                continue
+            matched_tracks.append(int(t))
+            matched_dets.append(int(d))
+        return matched_tracks, matched_dets
+
+    def _result(self, now, inferred, new_ids):
+        # Same shape as postprocess.summarize_people (highest confidence
+        # first), plus the tracks. Visible tracks are all at or above
+        # CONFIDENCE_THRESHOLD: update() filters on it and propagate() hands
+        # the frame back to YOLO once one decays below it.
+        visible = sorted((track for track in self.tracks if track.misses == 0),
+                         key=lambda track: track.confidence, reverse=True)
+        confidences = np.array([track.confidence for track in visible], np.float64)
+        return {
+            "detected": bool(visible),
+            "confidence": float(confidences[0]) if visible else 0.0,
+            "timestamp": now,
+            "inferred": inferred,
+            "count": len(visible),
+            "boxes": [[int(v) for v in track.box] for track in visible],
+            "confidences": np.round(confidences, 3).tolist(),
+            "tracks": [
+                {
+                    "id": track.id,
+                    "box": [int(v) for v in track.box],
+                    "confidence": round(float(track.confidence), 3),
+                    "ageSeconds": round(now - track.first_seen, 1),
+                }
+                for track in visible
+            ],
+            "newTracks": new_ids,
+        }
@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+from config import Config
+
+# Vectorized person postprocessing shared by every HumanDetector path.
+# Input is what inference_backends return per image, (xyxy [N, 4],
+# confidences [N], class ids [N]) NumPy arrays, plus the (x, y) offset of
+# each image in the source frame (non-zero for ROI crops). Filtering,
+# NMS and the summary are done on whole arrays; nothing loops per box in
+# Python except the greedy NMS, which loops per kept box.
+
+
+def nms(boxes, scores, iou_threshold):
+    # Greedy class-agnostic NMS; returns kept indices, highest score first
+    order = np.argsort(scores)[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        x1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        iou = inter / np.maximum(areas[best] + areas[rest] - inter, 1e-6)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def merge_detections(detections, offsets=None):
+    # Concatenate per-image detections into frame coordinates
+    if not detections:
+        return np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.float32)
+
+    boxes, conf, cls = zip(*detections)
+    boxes = [np.asarray(b, np.float32).reshape(-1, 4) for b in boxes]
+    if offsets is not None:
+        boxes = [b + np.array([x, y, x, y], np.float32) for b, (x, y) in zip(boxes, offsets)]
+    return (
+        np.concatenate(boxes),
+        np.concatenate([np.asarray(c, np.float32).reshape(-1) for c in conf]),
+        np.concatenate([np.asarray(c, np.float32).reshape(-1) for c in cls]),
+    )
+
+
+def summarize_people(detections, offsets=None, iou_threshold=None, timestamp=None):
+    # Person count, boxes (frame pixels, highest confidence first) and the
+    # max person confidence. "confidence" keeps its old meaning: the best
+    # person score even when it falls below CONFIDENCE_THRESHOLD.
+    boxes, conf, cls = merge_detections(detections, offsets)
+
+    person = cls == Config.HUMAN_CLASS_ID
+    max_conf = float(conf[person].max()) if person.any() else 0.0
+
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = person & (conf >= Config.CONFIDENCE_THRESHOLD) & (areas >= Config.MIN_PERSON_AREA)
+    boxes, conf = boxes[keep], conf[keep]
+
+    if iou_threshold is not None and len(conf) > 1:
+        order = nms(boxes, conf, iou_threshold)
+    else:
+        order = np.argsort(conf)[::-1]
+    boxes, conf = boxes[order], conf[order]
+
+    return {
+        "detected": bool(len(conf)),
+        "confidence": max_conf,
+        "count": int(len(conf)),
+        "boxes": np.rint(boxes).astype(np.int32).tolist(),
+        # float64 first: a rounded float32 still serializes as 0.8999999761...
+        "confidences": np.round(conf.astype(np.float64), 3).tolist(),
+        "timestamp": time.time() if timestamp is None else timestamp,
+    }
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class _StreamEntry:
+    def __init__(self, state):
+        self.state = state
+        self.lock = threading.Lock()
+        self.last_seen = time.monotonic()
+
+
+class StreamStateRegistry:
+    # Bounded LRU of per-stream state objects keyed by camera/stream id.
+    # Streams idle for longer than idle_seconds are evicted, and the least
+    # recently used stream is dropped once max_streams is exceeded.
+
+    def __init__(self, factory, max_streams, idle_seconds):
+        self.factory = factory
+        self.max_streams = max_streams
+        self.idle_seconds = idle_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @contextmanager
+    def acquire(self, stream_id):
+        # Yields the stream's state with its lock held, so frames from the
+        # same stream are processed one at a time while other streams proceed.
+        entry = self._get_entry(stream_id)
+        with entry.lock:
+            yield entry.state
+
+    def _get_entry(self, stream_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(stream_id)
+            if entry is None:
+                entry = _StreamEntry(self.factory())
+                self._entries[stream_id] = entry
+            else:
+                self._entries.move_to_end(stream_id)
+            entry.last_seen = now
+
+            self._evict(now)
+            return entry
+
+    def _evict(self, now):
+        # Oldest entries sit at the front of the OrderedDict
+        while self._entries:
+            stream_id, entry = next(iter(self._entries.items()))
+            idle = now - entry.last_seen > self.idle_seconds
+            if not idle and len(self._entries) <= self.max_streams:
+                break
+            del self._entries[stream_id]
+            self.evictions += 1
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "activeStreams": len(self._entries),
+                "maxStreams": self.max_streams,
+                "idleSeconds": self.idle_seconds,
+                "evictions": self.evictions,
+            }
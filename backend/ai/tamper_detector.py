@@ -0,0 +1,162 @@
+import cv2
+import numpy as np
+from config import Config
+
+# Camera tamper detection from a handful of whole-frame statistics on a tiny
+# grayscale copy of the frame, cheap enough to run on every frame before the
+# motion gate:
+#
+#   blackout     dark and flat (lens capped, signal lost)
+#   occlusion    a large share of the frame has gone featureless (hand,
+#                cloth, spray paint) compared with the reference
+#   defocus      Laplacian variance has collapsed against the reference
+#   sceneChange  the gray histogram or the coarse layout no longer matches
+#                the reference (camera moved or turned)
+#
+# The reference is averaged from the first frames of a stream and drifts
+# slowly with clean frames, so gradual lighting changes are absorbed.
+
+REASONS = ("blackout", "occlusion", "defocus", "sceneChange")
+
+
+class TamperDetector:
+    def __init__(self, frame_size=None):
+        self.frame_size = tuple(Config.TAMPER_FRAME_SIZE if frame_size is None else frame_size)
+        self.block = Config.TAMPER_BLOCK_SIZE
+        self.bins = Config.TAMPER_HIST_BINS
+        self.alpha = Config.TAMPER_REFERENCE_ALPHA
+        self.reset()
+
+    def reset(self):
+        self.frame_shape = None
+        self.frames_seen = 0
+        # Reference statistics of the untampered view
+        self.ref_hist = None
+        self.ref_layout = None
+        self.ref_sharpness = 0.0
+        self.ref_flat = 0.0
+        # Consecutive suspect frames, and how long a changed scene has persisted
+        self.suspect_frames = 0
+        self.changed_frames = 0
+
+    def _small_gray(self, frame):
+        # Shrink first so the color conversion only touches a few thousand
+        # pixels. An INTER_AREA pass over a 1080p frame costs ~7 ms, so large
+        # frames are point-sampled to twice the analysis size and only that
+        # is area-averaged (~0.15 ms at any input size)
+        width, height = self.frame_size
+        if frame.shape[1] > 2 * width and frame.shape[0] > 2 * height:
+            frame = cv2.resize(frame, (2 * width, 2 * height), interpolation=cv2.INTER_NEAREST)
+        small = cv2.resize(frame, self.frame_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3 and small.shape[2] == 3:
+            return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.reshape(small.shape[:2])
+
+    def _measure(self, gray):
+        mean, std = cv2.meanStdDev(gray)
+        sharpness = float(cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))[1][0, 0]) ** 2
+
+        hist = cv2.calcHist([gray], [0], None, [self.bins], [0, 256])
+        cv2.normalize(hist, hist, 1.0, 0.0, cv2.NORM_L1)
+
+        # Per-cell standard deviation from block means of x and x^2
+        g = gray.astype(np.float32)
+        grid = (self.frame_size[0] // self.block, self.frame_size[1] // self.block)
+        cell_mean = cv2.resize(g, grid, interpolation=cv2.INTER_AREA)
+        cell_sq = cv2.resize(g * g, grid, interpolation=cv2.INTER_AREA)
+        cell_std = np.sqrt(np.maximum(cell_sq - cell_mean * cell_mean, 0.0))
+        flat = float(np.count_nonzero(cell_std < Config.TAMPER_FLAT_STD)) / cell_std.size
+
+        return {
+            "mean": float(mean[0, 0]),
+            "std": float(std[0, 0]),
+            "sharpness": sharpness,
+            "flat": flat,
+            "hist": hist,
+            "layout": cell_mean,
+        }
+
+    def _update_reference(self, stats, weight):
+        if self.ref_hist is None:
+            self.ref_hist = stats["hist"].copy()
+            self.ref_layout = stats["layout"].copy()
+            self.ref_sharpness = stats["sharpness"]
+            self.ref_flat = stats["flat"]
+            return
+        cv2.accumulateWeighted(stats["hist"], self.ref_hist, weight)
+        cv2.accumulateWeighted(stats["layout"], self.ref_layout, weight)
+        self.ref_sharpness += weight * (stats["sharpness"] - self.ref_sharpness)
+        self.ref_flat += weight * (stats["flat"] - self.ref_flat)
+
+    def _classify(self, stats, distance, correlation):
+        if stats["mean"] < Config.TAMPER_BLACKOUT_MEAN and stats["std"] < Config.TAMPER_FLAT_STD:
+            return "blackout"
+        if self.ref_hist is None:
+            return None
+        if stats["flat"] - self.ref_flat >= Config.TAMPER_COVERED_FRACTION:
+            return "occlusion"
+        if stats["sharpness"] < Config.TAMPER_DEFOCUS_RATIO * self.ref_sharpness:
+            return "defocus"
+        if distance > Config.TAMPER_SCENE_DISTANCE or correlation < Config.TAMPER_SCENE_CORRELATION:
+            return "sceneChange"
+        return None
+
+    def detect(self, frame, prescale=1.0):
+        # prescale is accepted for symmetry with the motion detector; every
+        # frame is reduced to frame_size regardless of the incoming size
+        gray = self._small_gray(frame)
+
+        # A resolution change means a different source or decode path
+        if frame.shape[:2] != self.frame_shape:
+            self.reset()
+            self.frame_shape = frame.shape[:2]
+
+        stats = self._measure(gray)
+
+        distance = 0.0
+        correlation = 1.0
+        if self.ref_hist is not None:
+            distance = float(cv2.compareHist(self.ref_hist, stats["hist"], cv2.HISTCMP_BHATTACHARYYA))
+            # Coarse layout match: a moved camera rearranges the cell means
+            correlation = float(cv2.matchTemplate(stats["layout"], self.ref_layout, cv2.TM_CCOEFF_NORMED)[0, 0])
+            if not np.isfinite(correlation):
+                correlation = 0.0 if stats["std"] < Config.TAMPER_FLAT_STD else 1.0
+
+        self.frames_seen += 1
+        if self.frames_seen <= Config.TAMPER_WARMUP_FRAMES:
+            reason = self._classify(stats, 0.0, 1.0) if self.ref_hist is None else None
+            if reason is None:
+                # Running average over the warmup frames
+                self._update_reference(stats, 1.0 / self.frames_seen)
+        else:
+            reason = self._classify(stats, distance, correlation)
+
+        if reason is None:
+            self.suspect_frames = 0
+            self.changed_frames = 0
+            self._update_reference(stats, self.alpha)
+        else:
+            self.suspect_frames += 1
+
+        if reason == "sceneChange":
+            # A camera that stays pointed somewhere new has been repositioned:
+            # flag it, then accept the new view as the reference
+            self.changed_frames += 1
+            if self.changed_frames >= Config.TAMPER_REBASE_FRAMES:
+                self.ref_hist = None
+                self._update_reference(stats, 1.0)
+                self.suspect_frames = 0
+                self.changed_frames = 0
+        else:
+            self.changed_frames = 0
+
+        tampered = self.suspect_frames >= Config.TAMPER_HOLD_FRAMES
+        return {
+            "tampered": tampered,
+            "reason": reason if tampered else None,
+            "brightness": round(stats["mean"], 2),
+            "contrast": round(stats["std"], 2),
+            "sharpness": round(stats["sharpness"] / self.ref_sharpness, 3) if self.ref_sharpness else 1.0,
+            "coveredFraction": round(max(0.0, stats["flat"] - self.ref_flat), 3),
+            "sceneDistance": round(distance, 3),
+        }
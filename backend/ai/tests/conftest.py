@@ -0,0 +1,38 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+# The AI module imports its siblings flat (from config import Config), as
+# when main.py is run from backend/ai
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+_ai_config = []  # the AI config module, once imported
+
+
+@contextmanager
+def ai_imports():
+    # backend/ai/config.py would shadow the backend's `config` package, so
+    # the AI directory and its config module are only visible while the AI
+    # test modules are imported. The AI modules bind Config at import time.
+    backend_config = sys.modules.pop("config", None)
+    if _ai_config:
+        sys.modules["config"] = _ai_config[0]
+    sys.path.insert(0, AI_DIR)
+    try:
+        yield
+    finally:
+        sys.path.remove(AI_DIR)
+        ai_config = sys.modules.pop("config", None)
+        if ai_config is not None and not _ai_config:
+            _ai_config.append(ai_config)
+        if backend_config is not None:
+            sys.modules["config"] = backend_config
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    with ai_imports():
+        yield
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import pytest
+
+import background_models
+from config import Config
+
+WARMUP = {"frame_diff": 1, "running_avg": 1, "mog2": 5, "knn": 5}
+
+
+def scene(block_x=100):
+    # Blurred grayscale texture with a bright 40x80 block, as the motion gate sees it
+    rng = np.random.default_rng(0)
+    frame = np.kron(rng.integers(40, 120, (30, 40)), np.ones((8, 8))).astype(np.uint8)
+    frame[80:160, block_x:block_x + 40] = 250
+    return cv2.GaussianBlur(frame, (21, 21), 0)
+
+
+@pytest.fixture(autouse=True)
+def warmup(monkeypatch):
+    monkeypatch.setattr(Config, "BG_WARMUP_FRAMES", 5)
+
+
+@pytest.mark.parametrize("name", sorted(background_models.BACKENDS))
+def test_static_scene_is_quiet_and_a_moving_block_is_not(name):
+    model = background_models.create_background_model(name)
+    masks = [model.apply(scene()) for _ in range(WARMUP[name] + 10)]
+
+    assert all(mask is None for mask in masks[:WARMUP[name]])
+    assert all(mask is not None and not mask.any() for mask in masks[WARMUP[name]:])
+
+    for block_x in (140, 180, 220):
+        mask = model.apply(scene(block_x))
+        assert mask.dtype == np.uint8 and set(np.unique(mask)) <= {0, 255}
+        # The block's leading edge is new foreground
+        assert (mask[90:150, block_x + 20:block_x + 40] == 255).mean() > 0.9
+
+
+@pytest.mark.parametrize("name", sorted(background_models.BACKENDS))
+def test_reset_restarts_the_warmup(name):
+    model = background_models.create_background_model(name)
+    for _ in range(WARMUP[name] + 3):
+        model.apply(scene())
+
+    model.reset()
+    assert [model.apply(scene(220)) is None for _ in range(WARMUP[name] + 1)] == [True] * WARMUP[name] + [False]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown motion backend"):
+        background_models.create_background_model("optical_flow")
@@ -0,0 +1,79 @@
+import asyncio
+
+from batcher import MicroBatcher
+
+
+class RecordingRunner:
+    def __init__(self, error=None, block=False):
+        self.batches = []
+        self.error = error
+        self.release = asyncio.Event() if block else None
+
+    async def __call__(self, frames):
+        self.batches.append(list(frames))
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return [frame * 10 for frame in frames]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_full_batch_is_dispatched_without_waiting():
+    async def scenario():
+        runner = RecordingRunner()
+        batcher = MicroBatcher(runner, max_batch_size=3, max_wait_ms=10_000)
+        batcher.start()
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(3))), 1.0)
+        await batcher.stop()
+        return runner, results, batcher
+
+    runner, results, batcher = run(scenario())
+    assert results == [0, 10, 20]
+    assert runner.batches == [[0, 1, 2]]
+    assert batcher.metrics()["batchSizeHistogram"] == {"3": 1}
+
+
+def test_partial_batch_is_dispatched_after_the_wait():
+    async def scenario():
+        runner = RecordingRunner()
+        batcher = MicroBatcher(runner, max_batch_size=8, max_wait_ms=20)
+        batcher.start()
+        results = await asyncio.wait_for(asyncio.gather(batcher.submit(1), batcher.submit(2)), 1.0)
+        await batcher.stop()
+        return runner, results
+
+    runner, results = run(scenario())
+    assert results == [10, 20]
+    assert runner.batches == [[1, 2]]
+
+
+def test_batch_error_reaches_every_caller():
+    async def scenario():
+        batcher = MicroBatcher(RecordingRunner(error=ValueError("bad frame")), max_batch_size=2, max_wait_ms=10)
+        batcher.start()
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    results = run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_stop_fails_the_running_batch_and_the_queue():
+    async def scenario():
+        runner = RecordingRunner(block=True)
+        batcher = MicroBatcher(runner, max_batch_size=1, max_wait_ms=10)
+        batcher.start()
+        running = asyncio.ensure_future(batcher.submit(1))
+        queued = asyncio.ensure_future(batcher.submit(2))
+        while not runner.batches:
+            await asyncio.sleep(0)
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(running, queued, return_exceptions=True), 1.0)
+
+    results = run(scenario())
+    assert [str(r) for r in results] == ["Micro-batcher stopped"] * 2
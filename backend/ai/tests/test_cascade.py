@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+import human_detector
+import inference_backends
+import model_registry
+from config import Config
+from human_detector import HumanDetector
+
+PERSON = Config.HUMAN_CLASS_ID
+
+
+def dets(*boxes):
+    # (x1, y1, x2, y2, conf, cls) rows -> backend output tuple
+    rows = np.array(boxes, np.float32).reshape(-1, 6)
+    return rows[:, :4], rows[:, 4], rows[:, 5]
+
+
+class FakeBackend:
+    # Replays per-frame outputs keyed by the frame's fill value
+    outputs = {}
+    calls = []
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path
+
+    def predict(self, frames, imgsz=None):
+        FakeBackend.calls.append((self.model_path, len(frames)))
+        return [self.outputs[(self.model_path, int(frame.flat[0]))] for frame in frames]
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    # The escalation variant is only loadable through ultralytics
+    monkeypatch.setitem(inference_backends.BACKENDS, "ultralytics", FakeBackend)
+    monkeypatch.setattr(human_detector, "registry", model_registry.ModelRegistry())
+    monkeypatch.setattr(Config, "MODEL_VARIANT", "yolov8n")
+    monkeypatch.setattr(Config, "MODEL_VARIANTS", {"yolov8n": "models/yolov8n.pt", "yolov8s": "small.pt"})
+    monkeypatch.setattr(Config, "CASCADE_ESCALATE_VARIANT", "yolov8s")
+    monkeypatch.setattr(Config, "CASCADE_LOW_CONFIDENCE", 0.35)
+    monkeypatch.setattr(Config, "CASCADE_HIGH_CONFIDENCE", 0.85)
+    monkeypatch.setattr(Config, "CASCADE_ON_CROP", False)
+    FakeBackend.outputs = {}
+    FakeBackend.calls = []
+    return HumanDetector(backend="ultralytics", model_path="gate.pt", cascade=True)
+
+
+def frame(value):
+    return np.full((480, 640, 3), value, np.uint8)
+
+
+@pytest.mark.parametrize("conf, expected", [
+    ([0.9, 0.5], "positive"),   # a confident person settles the frame
+    ([0.5, 0.4], "escalate"),
+    ([0.2], "negative"),
+    ([], "negative"),
+])
+def test_decision_uses_best_person_score(monkeypatch, conf, expected):
+    monkeypatch.setattr(Config, "CASCADE_LOW_CONFIDENCE", 0.35)
+    monkeypatch.setattr(Config, "CASCADE_HIGH_CONFIDENCE", 0.85)
+    conf = np.array(conf, np.float32)
+    assert HumanDetector.cascade_decision(conf, np.full(len(conf), PERSON, np.float32)) == expected
+
+
+def test_other_classes_do_not_escalate(monkeypatch):
+    assert HumanDetector.cascade_decision(np.array([0.6], np.float32), np.array([2.0], np.float32)) == "negative"
+
+
+def test_only_uncertain_frames_reach_the_larger_model(detector):
+    FakeBackend.outputs = {
+        ("gate.pt", 1): dets([0, 0, 100, 200, 0.9, PERSON], [200, 0, 300, 200, 0.5, PERSON]),
+        ("gate.pt", 2): dets([0, 0, 100, 200, 0.5, PERSON]),
+        ("gate.pt", 3): dets(),
+        ("small.pt", 2): dets([0, 0, 100, 200, 0.8, PERSON]),
+    }
+
+    results = detector.detect_batch([frame(1), frame(2), frame(3)])
+
+    assert [r["escalated"] for r in results] == [False, True, False]
+    assert [r["detected"] for r in results] == [True, True, False]
+    assert FakeBackend.calls == [("gate.pt", 3), ("small.pt", 1)]
+    assert detector.cascade_metrics()["escalationRate"] == pytest.approx(1 / 3)
+
+
+def test_roi_crops_go_through_the_cascade(detector):
+    FakeBackend.outputs = {
+        # Crop-relative box of an uncertain person
+        ("gate.pt", 2): dets([10, 10, 60, 150, 0.5, PERSON]),
+        ("small.pt", 2): dets([100, 100, 150, 240, 0.8, PERSON]),
+    }
+
+    result = detector.detect_regions(frame(2), [[100, 100, 150, 240]])
+
+    assert result["escalated"] and result["detected"]
+    assert result["boxes"] == [[100, 100, 150, 240]]
+    assert FakeBackend.calls == [("gate.pt", 1), ("small.pt", 1)]
+
+
+@pytest.mark.parametrize("backend", ["onnxruntime", "openvino"])
+def test_exported_backends_reject_the_cascade_at_construction(detector, monkeypatch, backend):
+    # Exported backends only serve MODEL_VARIANT: fail at startup, not on
+    # the first ambiguous frame
+    monkeypatch.setattr(Config, "MODEL_PATH", None)
+    monkeypatch.setattr(human_detector.registry, "get", lambda *args: FakeBackend())
+    with pytest.raises(ValueError, match="Cascade"):
+        HumanDetector(backend=backend, cascade=True)
+    assert HumanDetector(backend=backend, cascade=False).escalation_path is None
@@ -0,0 +1,155 @@
+from unittest import mock
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import inference_backends
+from config import Config
+from executors import ExecutorLayer
+from motion_detector import IntelligentMotionDetector
+from person_tracker import PersonTracker
+from stream_state import StreamStateRegistry
+
+
+class NoModel:
+    # main.py loads its detector at import; these tests replace it
+    def __init__(self, model_path=None):
+        pass
+
+
+with mock.patch.dict(inference_backends.BACKENDS, {"ultralytics": NoModel}):
+    import main
+
+
+class StubDetector:
+    # "Detects" the bright block of a test frame as one person
+    def __init__(self):
+        self.calls = []
+
+    def _person(self, frame):
+        ys, xs = np.nonzero(frame[..., 0] > 128)
+        return {
+            "detected": True, "confidence": 0.9, "count": 1,
+            "boxes": [[int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1]],
+            "confidences": [0.9], "timestamp": 0.0,
+        }
+
+    def detect(self, frame):
+        self.calls.append(("detect", 1))
+        return self._person(frame)
+
+    def detect_batch(self, frames):
+        self.calls.append(("detect_batch", len(frames)))
+        return [self._person(frame) for frame in frames]
+
+    def detect_regions(self, frame, boxes):
+        self.calls.append(("detect_regions", len(boxes)))
+        return {**self._person(frame), "roi": True}
+
+
+def jpeg(block_x=None):
+    frame = np.zeros((240, 320, 3), np.uint8)
+    if block_x is not None:
+        frame[60:180, block_x:block_x + 60] = 255
+    return cv2.imencode(".jpg", frame)[1].tobytes()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    detector = StubDetector()
+    monkeypatch.setattr(main, "executors", ExecutorLayer(detector, False, 1, 0))
+    monkeypatch.setattr(main, "motion_states", StreamStateRegistry(IntelligentMotionDetector, 8, 300))
+    monkeypatch.setattr(main, "track_states", StreamStateRegistry(PersonTracker, 8, 300))
+    monkeypatch.setattr(main, "tracking_stats", {"inferred": 0, "tracked": 0})
+    for name, value in {
+        "MOTION_BACKEND": "frame_diff", "MOTION_DOWNSCALE": 1.0, "MOTION_DECODE_REDUCTION": 1,
+        "TAMPER_ENABLED": False, "ROI_INFERENCE_ENABLED": False, "TRACKING_ENABLED": False,
+        "TRACK_PROPAGATION": "hold", "TRACK_REDETECT_INTERVAL": 5,
+    }.items():
+        monkeypatch.setattr(Config, name, value)
+    return TestClient(main.app), detector
+
+
+def post_batch(client, frames):
+    files = [("images", (f"{i}.jpg", data, "image/jpeg")) for i, (_, data) in enumerate(frames)]
+    response = client.post("/detect/batch", files=files, data={"camera_ids": [cam for cam, _ in frames]})
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_results_keep_item_order_and_only_motion_reaches_yolo(client):
+    client, detector = client
+    results = post_batch(client, [
+        ("A", jpeg()), ("B", jpeg()),              # first frames: baselines only
+        ("A", jpeg(40)), ("B", jpeg(200)),
+        ("B", jpeg(200)),                          # unchanged: stops at the motion gate
+        ("A", b"not a jpeg"),
+    ])
+
+    assert [r["human"]["skipped"] for r in results[:5]] == [True, True, False, False, True]
+    assert results[2]["human"]["boxes"] == [[40, 60, 100, 180]]
+    assert results[3]["human"]["boxes"] == [[200, 60, 260, 180]]
+    assert results[5] == {"error": "Failed to decode image"}
+    assert detector.calls == [("detect_batch", 2)]
+
+
+def test_roi_inference_applies_to_batch_items(client, monkeypatch):
+    client, detector = client
+    monkeypatch.setattr(Config, "ROI_INFERENCE_ENABLED", True)
+    results = post_batch(client, [("A", jpeg()), ("A", jpeg(40))])
+
+    assert results[1]["human"]["roi"] and results[1]["human"]["boxes"] == [[40, 60, 100, 180]]
+    assert detector.calls == [("detect_regions", 1)]
+
+
+def test_tracked_frames_are_replayed_after_the_batch_run(client, monkeypatch):
+    client, detector = client
+    monkeypatch.setattr(Config, "TRACKING_ENABLED", True)
+    results = post_batch(client, [
+        ("A", jpeg()), ("B", jpeg()),
+        ("A", jpeg(40)),    # A has no tracks: waits for this batch's YOLO run
+        ("B", jpeg(200)),
+        ("A", jpeg(80)),    # A is waiting: deferred, not propagated from a stale track
+        ("B", jpeg(200)),   # no motion while waiting: its skip is deferred too
+    ])
+
+    assert detector.calls == [("detect_batch", 3)]
+    a1, b1, a2, b2 = (results[i]["human"] for i in (2, 3, 4, 5))
+    assert a1["inferred"] and a1["newTracks"] == [1] and a1["boxes"] == [[40, 60, 100, 180]]
+    assert b1["inferred"] and b1["newTracks"] == [1]
+    # The replayed update matched A's existing track and moved it
+    assert a2["inferred"] and a2["newTracks"] == [] and a2["boxes"] == [[80, 60, 140, 180]]
+    assert b2["skipped"]
+    assert main.tracking_stats == {"inferred": 3, "tracked": 0}
+
+    # Next batch: A propagates its track, B's skip forced a fresh YOLO run
+    results = post_batch(client, [("A", jpeg(120)), ("B", jpeg(240))])
+    assert not results[0]["human"]["inferred"] and results[0]["human"]["boxes"] == [[80, 60, 140, 180]]
+    assert results[1]["human"]["inferred"] and results[1]["human"]["boxes"] == [[240, 60, 300, 180]]
+    assert detector.calls[-1] == ("detect_batch", 1)
+    assert main.tracking_stats == {"inferred": 4, "tracked": 1}
+
+
+@pytest.mark.parametrize("reduction", [2, 4, 8])
+def test_reduced_decode_finds_the_same_motion_as_a_full_decode(client, monkeypatch, reduction):
+    def frame(block_x):
+        image = np.full((480, 640, 3), 60, np.uint8)
+        image[100:340, block_x:block_x + 120] = 220
+        return cv2.imencode(".jpg", image)[1].tobytes()
+
+    def run(camera_id):
+        return [main.decode_and_detect_motion(frame(x), camera_id) for x in (100, 100, 300)]
+
+    full = run("full")
+    monkeypatch.setattr(Config, "MOTION_DECODE_REDUCTION", reduction)
+    reduced = run("reduced")
+
+    # No motion: the reduced path stops before the full color decode
+    assert reduced[1] == (None, full[1][1])
+    (full_frame, full_motion), (reduced_frame, motion) = full[2], reduced[2]
+    assert reduced_frame.shape == full_frame.shape == (480, 640, 3)
+    # Frame differencing flags both where the block left and where it went
+    assert motion["motionDetected"] and len(motion["motionBoxes"]) == len(full_motion["motionBoxes"]) == 2
+    np.testing.assert_allclose(sorted(motion["motionBoxes"]), sorted(full_motion["motionBoxes"]), atol=2 * reduction + 2)
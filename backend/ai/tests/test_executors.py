@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+
+from executors import ExecutorLayer
+
+
+class FakeDetector:
+    def detect(self, frame):
+        return {"frame": frame, "thread": threading.current_thread().name}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_disabled_layer_runs_inline():
+    layer = ExecutorLayer(FakeDetector(), enabled=False, cv_threads=2, model_processes=0)
+    layer.start()
+    caller = threading.current_thread().name
+
+    assert run(layer.run_model("detect", 1)) == {"frame": 1, "thread": caller}
+    assert run(layer.run_cv(lambda: threading.current_thread().name)) == caller
+
+
+def test_enabled_layer_offloads_cv_and_model_work():
+    layer = ExecutorLayer(FakeDetector(), enabled=True, cv_threads=2, model_processes=0)
+    layer.start()
+    try:
+        assert run(layer.run_model("detect", 1))["thread"].startswith("yolo")
+        assert run(layer.run_cv(lambda: threading.current_thread().name)).startswith("cv")
+    finally:
+        layer.shutdown()
+
+    # After shutdown calls fall back to running inline
+    assert run(layer.run_model("detect", 2))["thread"] == threading.current_thread().name
+
+
+def test_model_processes_require_offloading():
+    with pytest.raises(ValueError):
+        ExecutorLayer(None, enabled=False, cv_threads=2, model_processes=2)
+    with pytest.raises(ValueError):
+        ExecutorLayer(None, enabled=True, cv_threads=2, model_processes=0)
+    # Worker processes load their own model; no in-process detector needed
+    ExecutorLayer(None, enabled=True, cv_threads=2, model_processes=2)
@@ -0,0 +1,51 @@
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pytest
+
+from frame_ingest import frame_from_raw, parse_shape, read_shared_frame
+
+
+@pytest.fixture
+def segment():
+    shm = shared_memory.SharedMemory(create=True, size=4 * 6 * 3)
+    yield shm
+    shm.close()
+    # read_shared_frame untracks the segment (before 3.13); we are also the producer here
+    if os.name == "posix" and sys.version_info < (3, 13):
+        resource_tracker.register("/" + shm.name, "shared_memory")
+    shm.unlink()
+
+
+def test_parse_shape():
+    assert parse_shape("4x6x3") == (4, 6, 3)
+    assert parse_shape([4, 6]) == (4, 6)
+    with pytest.raises(ValueError):
+        parse_shape("4x6x2")
+
+
+def test_frame_from_raw_checks_size():
+    assert frame_from_raw(bytes(24), "4x6").shape == (4, 6)
+    with pytest.raises(ValueError):
+        frame_from_raw(bytes(23), "4x6")
+
+
+def test_read_shared_frame_copies_out_of_segment(segment):
+    producer = np.ndarray((4, 6, 3), np.uint8, buffer=segment.buf)
+    producer[:] = 7
+
+    frame = read_shared_frame(segment.name, "4x6x3")
+    producer[:] = 9
+    del producer
+
+    assert frame.shape == (4, 6, 3)
+    assert (frame == 7).all()  # a copy, not a view that pins the mapping
+
+
+def test_read_shared_frame_rejects_bad_segments(segment):
+    with pytest.raises(ValueError):
+        read_shared_frame(segment.name, "40x60x3")
+    with pytest.raises(ValueError):
+        read_shared_frame("virtualeye-missing-segment", "4x6x3")
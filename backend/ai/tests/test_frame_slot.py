@@ -0,0 +1,53 @@
+import asyncio
+
+from frame_slot import LatestFrameSlot
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_newest_frame_wins():
+    async def scenario():
+        slot = LatestFrameSlot()
+        for frame in ("f1", "f2", "f3"):
+            slot.put(frame)
+        return slot, await slot.take()
+
+    slot, taken = run(scenario())
+    assert taken == (3, "f3")
+    assert slot.received == 3 and slot.dropped == 2
+
+
+def test_take_waits_for_the_next_frame():
+    async def scenario():
+        slot = LatestFrameSlot()
+        waiting = asyncio.ensure_future(slot.take())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        slot.put("f1")
+        return slot, await asyncio.wait_for(waiting, 1.0)
+
+    slot, taken = run(scenario())
+    assert taken == (1, "f1") and slot.dropped == 0
+
+
+def test_close_drains_then_ends():
+    async def scenario():
+        slot = LatestFrameSlot()
+        slot.put("last")
+        slot.close()
+        return await slot.take(), await slot.take()
+
+    assert run(scenario()) == ((1, "last"), None)
+
+
+def test_close_wakes_a_waiting_take():
+    async def scenario():
+        slot = LatestFrameSlot()
+        waiting = asyncio.ensure_future(slot.take())
+        await asyncio.sleep(0)
+        slot.close()
+        return await asyncio.wait_for(waiting, 1.0)
+
+    assert run(scenario()) is None
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from config import Config
+from inference_backends import _ExportedYoloBackend
+
+NUM_CLASSES = 3
+
+
+def anchor(box, person, other=0.0, ratio=1.0, pad=(0, 0)):
+    # Model-space (cx, cy, w, h, class scores...) column for a frame-space box
+    x1, y1, x2, y2 = box
+    cx = (x1 + x2) / 2 * ratio + pad[0]
+    cy = (y1 + y2) / 2 * ratio + pad[1]
+    scores = [0.0] * NUM_CLASSES
+    scores[Config.HUMAN_CLASS_ID] = person
+    scores[(Config.HUMAN_CLASS_ID + 1) % NUM_CLASSES] = other
+    return [cx, cy, (x2 - x1) * ratio, (y2 - y1) * ratio, *scores]
+
+
+class FakeExport(_ExportedYoloBackend):
+    # Replays one synthetic output per frame in place of a graph
+    def __init__(self, outputs, fixed_batch=False):
+        self.outputs = outputs
+        self.fixed_batch = fixed_batch
+        self.blobs = []
+
+    def _run(self, blob):
+        self.blobs.append(blob.shape)
+        start = sum(shape[0] for shape in self.blobs[:-1])
+        return np.stack(self.outputs[start:start + blob.shape[0]])
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(Config, "BACKEND_MIN_CONFIDENCE", 0.25)
+    monkeypatch.setattr(Config, "NMS_IOU_THRESHOLD", 0.7)
+
+
+def output(*anchors):
+    return np.array(anchors, np.float32).T  # [4 + classes, anchors]
+
+
+def test_letterbox_centres_a_wide_frame():
+    image, ratio, pad = FakeExport([])._letterbox(np.zeros((720, 1280, 3), np.uint8))
+    assert image.shape == (640, 640, 3)
+    assert ratio == pytest.approx(0.5) and pad == (0, 140)
+    assert (image[:140] == 114).all() and (image[500:] == 114).all()
+
+
+@pytest.mark.parametrize("fixed_batch", [False, True])
+def test_boxes_come_back_in_frame_pixels(fixed_batch):
+    # 1280x720 -> 640x360 at ratio 0.5, padded by 140 rows on top
+    wide = dict(ratio=0.5, pad=(0, 140))
+    # 480x640 portrait -> 480x640 at ratio 1.0, padded by 80 columns on the left
+    tall = dict(ratio=1.0, pad=(80, 0))
+    backend = FakeExport([
+        output(
+            anchor([100, 200, 300, 600], 0.9, **wide),
+            anchor([104, 204, 304, 604], 0.6, **wide),   # duplicate: removed by NMS
+            anchor([800, 100, 900, 300], 0.1, **wide),   # below the confidence floor
+            anchor([500, 100, 700, 300], 0.1, other=0.95, **wide),  # another class
+        ),
+        output(anchor([10, 20, 110, 320], 0.8, **tall), *[anchor([0, 0, 10, 10], 0.0, **tall)] * 3),
+    ], fixed_batch=fixed_batch)
+
+    frames = [np.zeros((720, 1280, 3), np.uint8), np.zeros((640, 480, 3), np.uint8)]
+    (boxes_a, conf_a, cls_a), (boxes_b, conf_b, _) = backend.predict(frames)
+
+    np.testing.assert_allclose(boxes_a, [[100, 200, 300, 600]], atol=1e-3)
+    np.testing.assert_allclose(conf_a, [0.9], atol=1e-6)
+    assert cls_a.tolist() == [Config.HUMAN_CLASS_ID]
+    np.testing.assert_allclose(boxes_b, [[10, 20, 110, 320]], atol=1e-3)
+    np.testing.assert_allclose(conf_b, [0.8], atol=1e-6)
+    assert backend.blobs == ([(1, 3, 640, 640)] * 2 if fixed_batch else [(2, 3, 640, 640)])
+
+
+def test_frame_without_people_returns_empty_arrays():
+    backend = FakeExport([output(anchor([0, 0, 100, 100], 0.1))])
+    boxes, conf, cls = backend.predict([np.zeros((480, 640, 3), np.uint8)])[0]
+    assert boxes.shape == (0, 4) and conf.shape == (0,) and cls.shape == (0,)
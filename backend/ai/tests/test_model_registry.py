@@ -0,0 +1,53 @@
+import pytest
+
+import inference_backends
+from config import Config
+from model_registry import ModelRegistry, resolve_model_path
+
+
+@pytest.fixture(autouse=True)
+def variants(monkeypatch):
+    monkeypatch.setattr(Config, "MODEL_VARIANT", "yolov8n")
+    monkeypatch.setattr(Config, "MODEL_PATH", None)
+
+
+def test_ultralytics_paths_follow_model_variant(monkeypatch):
+    assert resolve_model_path("ultralytics") == "models/yolov8n.pt"
+    assert resolve_model_path("ultralytics", "yolov8s") == "models/yolov8s.pt"
+
+    monkeypatch.setattr(Config, "MODEL_VARIANT", "yolov8s")
+    assert resolve_model_path("ultralytics") == "models/yolov8s.pt"
+
+
+def test_model_path_overrides_only_the_default_variant(monkeypatch):
+    monkeypatch.setattr(Config, "MODEL_PATH", "custom.pt")
+    assert resolve_model_path("ultralytics") == "custom.pt"
+    assert resolve_model_path("ultralytics", "yolov8s") == "models/yolov8s.pt"
+
+
+def test_exported_backends_only_serve_the_default_variant():
+    assert resolve_model_path("onnxruntime") is None
+    with pytest.raises(ValueError):
+        resolve_model_path("onnxruntime", "yolov8s")
+
+
+def test_unknown_variant():
+    with pytest.raises(ValueError):
+        resolve_model_path("ultralytics", "yolov9x")
+
+
+def test_registry_loads_each_model_once(monkeypatch):
+    loads = []
+
+    class Backend:
+        def __init__(self, model_path=None):
+            loads.append(model_path)
+
+    monkeypatch.setitem(inference_backends.BACKENDS, "ultralytics", Backend)
+    registry = ModelRegistry()
+
+    # The default and its explicit name are the same weights
+    assert registry.get("ultralytics") is registry.get_variant("yolov8n", "ultralytics")
+    assert registry.get_variant("yolov8s", "ultralytics") is not registry.get("ultralytics")
+    assert loads == ["models/yolov8n.pt", "models/yolov8s.pt"]
+    assert [m["modelPath"] for m in registry.metrics()["models"]] == loads
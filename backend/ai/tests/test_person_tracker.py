@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from config import Config
+from person_tracker import PersonTracker
+
+FRAME = np.zeros((240, 320, 3), np.uint8)
+BOX = [40, 40, 100, 200]
+
+
+@pytest.fixture(autouse=True)
+def tracking_config(monkeypatch):
+    monkeypatch.setattr(Config, "CONFIDENCE_THRESHOLD", 0.5)
+    monkeypatch.setattr(Config, "TRACK_REDETECT_INTERVAL", 5)
+    monkeypatch.setattr(Config, "TRACK_MIN_CONFIDENCE", 0.2)
+    monkeypatch.setattr(Config, "TRACK_CONFIDENCE_DECAY", 0.8)
+
+
+def test_decay_below_threshold_forces_inference_instead_of_flicker():
+    tracker = PersonTracker(propagation="hold")
+    assert tracker.update(FRAME, [BOX], [0.7])["detected"]
+
+    assert not tracker.needs_inference()
+    res = tracker.propagate(FRAME)  # 0.56: still above the threshold
+    assert res["detected"] and not tracker.needs_inference()
+    assert res["confidence"] >= Config.CONFIDENCE_THRESHOLD
+    assert res["confidences"] == [0.56]
+
+    # 0.448: this frame goes to YOLO rather than reporting a sub-threshold detection
+    assert tracker.propagate(FRAME) is None
+    assert tracker.needs_inference()
+
+    res = tracker.update(FRAME, [], [])
+    assert not res["detected"] and res["newTracks"] == []
+
+
+def test_result_matches_summarize_people_shape():
+    tracker = PersonTracker(propagation="hold")
+    res = tracker.update(FRAME, [BOX, [200, 40, 260, 200]], [0.6, 0.9])
+    assert res["count"] == 2
+    assert res["confidences"] == [0.9, 0.6]
+    assert res["boxes"] == [[200, 40, 260, 200], BOX]
+    assert res["confidence"] == pytest.approx(0.9)
+
+
+def test_ids_are_stable_and_new_people_get_new_ids():
+    tracker = PersonTracker(propagation="hold")
+    first = tracker.update(FRAME, [BOX], [0.9])
+    assert first["newTracks"] == [1]
+
+    moved = [b + 5 for b in BOX]
+    second = tracker.update(FRAME, [moved, [200, 40, 260, 200]], [0.9, 0.8])
+    assert second["newTracks"] == [2]
+    assert sorted(t["id"] for t in second["tracks"]) == [1, 2]
+
+
+def test_skip_forces_inference_and_keeps_ids():
+    tracker = PersonTracker(propagation="flow")
+    tracker.update(FRAME, [BOX], [0.9])
+    assert not tracker.needs_inference()
+
+    tracker.skip()
+    assert tracker.needs_inference()
+    assert tracker.prev_gray is None
+
+    res = tracker.update(FRAME, [BOX], [0.9])
+    assert res["newTracks"] == [] and res["tracks"][0]["id"] == 1
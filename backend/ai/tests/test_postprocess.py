@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from config import Config
+from postprocess import nms, summarize_people
+
+PERSON = Config.HUMAN_CLASS_ID
+
+
+def dets(*rows):
+    # (x1, y1, x2, y2, conf, cls) rows -> backend output tuple
+    rows = np.array(rows, np.float32).reshape(-1, 6)
+    return rows[:, :4], rows[:, 4], rows[:, 5]
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(Config, "CONFIDENCE_THRESHOLD", 0.5)
+    monkeypatch.setattr(Config, "MIN_PERSON_AREA", 0)
+
+
+def test_nms_keeps_the_best_of_overlapping_boxes():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60]], np.float32)
+    scores = np.array([0.6, 0.9, 0.7], np.float32)
+    assert nms(boxes, scores, 0.5).tolist() == [1, 2]
+
+
+def test_summary_filters_class_threshold_and_area(monkeypatch):
+    monkeypatch.setattr(Config, "MIN_PERSON_AREA", 50)
+    res = summarize_people([dets(
+        [0, 0, 10, 10, 0.9, PERSON],       # kept
+        [20, 20, 30, 30, 0.4, PERSON],     # below threshold
+        [40, 40, 42, 42, 0.95, PERSON],    # too small
+        [0, 0, 50, 50, 0.99, PERSON + 1],  # not a person
+    )])
+    assert res["detected"] and res["count"] == 1
+    assert res["boxes"] == [[0, 0, 10, 10]]
+    assert res["confidence"] == pytest.approx(0.95)  # best person score, before the area filter
+
+
+def test_summary_reports_sub_threshold_confidence():
+    res = summarize_people([dets([0, 0, 10, 10, 0.3, PERSON])])
+    assert not res["detected"] and res["count"] == 0
+    assert res["confidence"] == pytest.approx(0.3)
+
+
+def test_crop_offsets_and_cross_crop_nms():
+    # The same person seen by two overlapping crops is counted once
+    parts = [dets([10, 10, 30, 50, 0.8, PERSON]), dets([0, 0, 20, 40, 0.9, PERSON])]
+    res = summarize_people(parts, offsets=[(100, 0), (110, 10)], iou_threshold=0.5)
+    assert res["count"] == 1
+    assert res["boxes"] == [[110, 10, 130, 50]]
+    assert res["confidences"] == [0.9]
+
+
+def test_empty_input():
+    res = summarize_people([])
+    assert res["count"] == 0 and res["boxes"] == [] and res["confidence"] == 0.0
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from config import Config
+from human_detector import HumanDetector
+from motion_detector import IntelligentMotionDetector
+
+FRAME = np.zeros((480, 640, 3), np.uint8)
+
+
+@pytest.fixture(autouse=True)
+def roi_config(monkeypatch):
+    monkeypatch.setattr(Config, "ROI_PADDING", 0.25)
+    monkeypatch.setattr(Config, "ROI_MIN_PADDING", 32)
+    monkeypatch.setattr(Config, "ROI_MAX_COVERAGE", 0.6)
+
+
+def test_regions_are_padded_and_clamped_to_the_frame():
+    regions = HumanDetector.select_regions(FRAME, [
+        [10, 20, 110, 220],     # 100x200: padded 32 (minimum) by 50, clipped at the top-left
+        [600, 400, 640, 480],   # in the bottom-right corner: clipped there
+        [300, 200, 340, 240],   # well inside: minimum padding on every side
+    ])
+    assert regions == [[0, 0, 142, 270], [568, 368, 640, 480], [268, 168, 372, 272]]
+
+
+def test_overlapping_padded_boxes_become_one_region():
+    # Two contours of one person 20px apart overlap once padded; the far one does not
+    regions = HumanDetector.select_regions(FRAME, [[100, 100, 150, 150], [170, 100, 220, 150], [500, 300, 540, 340]])
+    assert regions == [[68, 68, 252, 182], [468, 268, 572, 372]]
+
+
+def test_merge_repeats_until_no_regions_intersect():
+    # The third box only bridges the first two; edge-touching boxes stay apart
+    assert HumanDetector._merge_overlapping([[0, 0, 10, 10], [20, 0, 30, 10], [5, 0, 25, 10]]) == [[0, 0, 30, 10]]
+    assert HumanDetector._merge_overlapping([[0, 0, 10, 10], [10, 0, 20, 10]]) == [[0, 0, 10, 10], [10, 0, 20, 10]]
+
+
+def test_full_frame_is_used_when_regions_cover_too_much():
+    assert HumanDetector.select_regions(FRAME, [[50, 50, 590, 430]]) == []
+    assert HumanDetector.select_regions(FRAME, []) == []
+
+
+@pytest.mark.parametrize("downscale", [0.5, 0.25])
+def test_downscaled_motion_boxes_are_in_full_resolution_pixels(downscale):
+    moved = FRAME.copy()
+    moved[100:300, 200:300] = 255
+
+    def run(scale):
+        detector = IntelligentMotionDetector(downscale=scale, backend="frame_diff")
+        detector.detect(FRAME)
+        return detector.detect(moved)
+
+    full, reduced = run(1.0), run(downscale)
+    assert len(reduced["motionBoxes"]) == len(full["motionBoxes"]) == 1
+    # Blur and dilation grow the box by a few reduced pixels
+    np.testing.assert_allclose(reduced["motionBoxes"][0], full["motionBoxes"][0], atol=2 / downscale + 2)
+    assert reduced["motionArea"] == pytest.approx(full["motionArea"], rel=0.15)
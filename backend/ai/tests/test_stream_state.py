@@ -0,0 +1,52 @@
+import pytest
+
+import stream_state
+from stream_state import StreamStateRegistry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(stream_state.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_each_stream_keeps_its_own_state(clock):
+    registry = StreamStateRegistry(list, max_streams=4, idle_seconds=60)
+    with registry.acquire("cam-a") as a:
+        a.append(1)
+    with registry.acquire("cam-b") as b:
+        assert b == []
+    with registry.acquire("cam-a") as a:
+        assert a == [1]
+
+
+def test_least_recently_used_stream_is_evicted(clock):
+    registry = StreamStateRegistry(list, max_streams=2, idle_seconds=60)
+    for stream_id in ("a", "b", "a", "c"):
+        with registry.acquire(stream_id) as state:
+            state.append(stream_id)
+
+    # "b" was the least recently used when "c" arrived
+    with registry.acquire("a") as a:
+        assert a == ["a", "a"]
+    assert registry.metrics()["evictions"] == 1
+    with registry.acquire("b") as b:
+        assert b == []  # recreated
+    assert registry.metrics() == {"activeStreams": 2, "maxStreams": 2, "idleSeconds": 60, "evictions": 2}
+
+
+def test_idle_streams_are_evicted(clock):
+    registry = StreamStateRegistry(list, max_streams=8, idle_seconds=60)
+    for stream_id in ("a", "b"):
+        with registry.acquire(stream_id):
+            pass
+    clock[0] += 30
+    with registry.acquire("b"):
+        pass
+    clock[0] += 45  # "a" idle for 75 s, "b" for 45 s
+
+    with registry.acquire("c"):
+        pass
+    metrics = registry.metrics()
+    assert metrics["activeStreams"] == 2 and metrics["evictions"] == 1
@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+import pytest
+
+from config import Config
+from tamper_detector import TamperDetector
+
+# Bright left half, dark right half, with a blocky texture: sharp edges, and
+# still textured (not featureless) once blurred
+_rng = np.random.default_rng(0)
+_texture = np.kron(_rng.integers(-40, 40, (24, 32)), np.ones((8, 8), int))[..., None]
+SCENE = np.clip(np.where(np.arange(256) < 128, 170, 70)[None, :, None] + _texture, 0, 255)
+SCENE = np.repeat(SCENE, 3, axis=2).astype(np.uint8)
+
+
+@pytest.fixture(autouse=True)
+def tamper_config(monkeypatch):
+    monkeypatch.setattr(Config, "TAMPER_WARMUP_FRAMES", 3)
+    monkeypatch.setattr(Config, "TAMPER_HOLD_FRAMES", 3)
+    monkeypatch.setattr(Config, "TAMPER_REBASE_FRAMES", 5)
+
+
+def warmed_up():
+    detector = TamperDetector()
+    for _ in range(Config.TAMPER_WARMUP_FRAMES):
+        assert not detector.detect(SCENE)["tampered"]
+    return detector
+
+
+def feed(detector, frame, frames):
+    return [detector.detect(frame) for _ in range(frames)]
+
+
+def test_clean_scene_is_not_tampered():
+    detector = warmed_up()
+    res = feed(detector, SCENE, 10)[-1]
+    assert not res["tampered"] and res["reason"] is None
+    assert res["sharpness"] == pytest.approx(1.0, abs=0.05)
+
+
+def test_blackout_is_flagged_after_the_hold():
+    detector = warmed_up()
+    results = feed(detector, np.zeros_like(SCENE), 3)
+    assert [r["tampered"] for r in results] == [False, False, True]
+    assert results[-1]["reason"] == "blackout"
+
+
+def test_blackout_from_the_first_frame():
+    # No reference yet: a capped lens is still recognised
+    results = feed(TamperDetector(), np.zeros_like(SCENE), 3)
+    assert results[-1]["tampered"] and results[-1]["reason"] == "blackout"
+
+
+def test_occlusion():
+    detector = warmed_up()
+    covered = SCENE.copy()
+    covered[:, :224] = 128
+    res = feed(detector, covered, 3)[-1]
+    assert res["tampered"] and res["reason"] == "occlusion"
+    assert res["coveredFraction"] >= Config.TAMPER_COVERED_FRACTION
+
+
+def test_defocus():
+    detector = warmed_up()
+    res = feed(detector, cv2.GaussianBlur(SCENE, (0, 0), 3), 3)[-1]
+    assert res["tampered"] and res["reason"] == "defocus"
+    assert res["sharpness"] < Config.TAMPER_DEFOCUS_RATIO
+
+
+def test_scene_change_is_flagged_then_becomes_the_reference():
+    detector = warmed_up()
+    moved = np.ascontiguousarray(SCENE[:, ::-1])
+    results = feed(detector, moved, Config.TAMPER_REBASE_FRAMES - 1)
+    assert results[-1]["tampered"] and results[-1]["reason"] == "sceneChange"
+
+    # Held for TAMPER_REBASE_FRAMES: the new view is accepted
+    assert not detector.detect(moved)["tampered"]
+    assert not feed(detector, moved, 5)[-1]["tampered"]
+
+
+def test_a_single_clean_frame_resets_the_hold():
+    detector = warmed_up()
+    dark = np.zeros_like(SCENE)
+    feed(detector, dark, 2)
+    assert not detector.detect(SCENE)["tampered"]
+    assert [r["tampered"] for r in feed(detector, dark, 3)] == [False, False, True]
+
+
+def test_resolution_change_starts_a_new_reference():
+    detector = warmed_up()
+    detector.detect(cv2.resize(SCENE, (320, 240)))
+    assert detector.frames_seen == 1
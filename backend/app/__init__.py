@@ -38,6 +38,21 @@ def create_app():
     # Initialize JWT
     jwt.init_app(app)
 
+    # Build collection indexes in the background so startup never waits on Mongo
+    if app.config.get("MONGO_URI"):
+        import threading
+        from .models.alert_model import ensure_alert_indexes
+        from .services.detection_writer import ensure_detection_indexes
+
+        def build_indexes():
+            try:
+                print("[VirtualEye] Alert indexes ready:", ensure_alert_indexes(mongo.db), flush=True)
+                print("[VirtualEye] Detection indexes ready:", ensure_detection_indexes(mongo.db), flush=True)
+            except Exception as e:
+                print(f"[VirtualEye] Could not create indexes: {e}", flush=True)
+
+        threading.Thread(target=build_indexes, name="mongo-indexes", daemon=True).start()
+
     # Initialize default alert rules
     # with app.app_context():
     #     from .models.alert_rule_model import create_default_rules
@@ -49,6 +64,7 @@ def create_app():
     from .routes.health_routes import health_bp
     from .routes.user_routes import user_bp
     from .routes.alert_routes import alert_bp
+    from .routes.detection_routes import detection_bp
     # from .routes.camera_stream_routes import stream_bp  # Removed for Single ESP32 Camera Architecture
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -56,6 +72,7 @@ def create_app():
     app.register_blueprint(health_bp, url_prefix="/api")
     app.register_blueprint(user_bp, url_prefix="/api/users")
     app.register_blueprint(alert_bp, url_prefix="/api")
+    app.register_blueprint(detection_bp, url_prefix="/api/detection")
     # app.register_blueprint(stream_bp) # Removed for Single ESP32 Camera Architecture
 
     @app.errorhandler(404)
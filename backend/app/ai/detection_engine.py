@@ -0,0 +1,229 @@
+"""
+VirtualEye Backend - Continuous Detection Engine
+One long-running engine per camera holds a persistent subscription to the
+camera's frame hub (shared with live viewers), samples frames at the rate the
+frame-rate governor grants it and sends them to the AI module, which applies
+the tamper check, the motion gate and YOLO. The latest result is kept in memory for the API to
+read.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from ..config import Config
+from ..extensions import mongo
+from ..models.alert_model import DEFAULT_TOGGLES, get_system_alert_toggles
+from ..services.alert_aggregator import alert_aggregator
+from ..services.camera_stream_service import get_camera_hub
+from ..services.detection_writer import detection_writer
+from .frame_rate_governor import FrameRateGovernor
+
+# Backoff applied when the camera stream or the AI module is unavailable
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
+
+
+class DetectionEngine:
+    """Samples one camera's stream and runs detection on it continuously."""
+
+    def __init__(self, camera: dict, governor: FrameRateGovernor, ai_service_url: str):
+        self.camera = camera
+        self.camera_id = camera["cameraId"]
+        self.governor = governor
+        self.detect_url = f"{ai_service_url.rstrip('/')}/detect"
+
+        self._session = requests.Session()  # keep-alive to the AI module
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._latest = None
+        self._alert_state = None  # what the previous sampled frame alerted on
+        self._stats = {"framesSampled": 0, "errors": 0, "reconnects": 0, "state": "stopped"}
+
+    # ── Lifecycle ───────────────────────────────────────────────────────────
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.governor.register(self.camera_id)
+        self._thread = threading.Thread(
+            target=self._run, name=f"detection-{self.camera_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.governor.unregister(self.camera_id)
+
+    # ── Results ─────────────────────────────────────────────────────────────
+    def latest_result(self):
+        with self._lock:
+            return dict(self._latest) if self._latest else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cameraId": self.camera_id, **self._stats}
+
+    # ── Engine loop ─────────────────────────────────────────────────────────
+    def _set_state(self, state: str):
+        with self._lock:
+            self._stats["state"] = state
+
+    def _run(self):
+        print(f"[Detection] Engine started for {self.camera_id}", flush=True)
+        delay = RETRY_DELAY
+        while not self._stop.is_set():
+            self._set_state("running")
+            try:
+                if self._consume_stream():
+                    delay = RETRY_DELAY
+            except Exception as e:
+                print(f"[Detection] {self.camera_id} engine error: {e}", flush=True)
+
+            if self._stop.is_set():
+                break
+
+            # Stream ended or the AI module failed: back off, then resubscribe
+            with self._lock:
+                self._stats["reconnects"] += 1
+                self._stats["state"] = "backoff"
+            print(f"[Detection] {self.camera_id} reconnecting in {delay:.0f}s", flush=True)
+            self._stop.wait(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+
+        self._set_state("stopped")
+        print(f"[Detection] Engine stopped for {self.camera_id}", flush=True)
+
+    def _consume_stream(self) -> bool:
+        """Sample frames until the stream ends; True if any frame was processed."""
+        hub = get_camera_hub(self.camera)
+        frames = hub.subscribe()
+        processed = False
+        next_due = 0.0
+        try:
+            for jpeg in frames:
+                if self._stop.is_set():
+                    break
+
+                # The hub always hands out its newest frame, so skipping
+                # frames between samples never builds a backlog
+                now = time.monotonic()
+                if now < next_due:
+                    continue
+                next_due = now + self.governor.interval(self.camera_id)
+
+                result = self._detect(jpeg)
+                self.governor.report(self.camera_id, result)
+                self._publish(result)
+                self._raise_alerts(result)
+                if result["success"]:
+                    detection_writer.record(result)
+                processed = True
+        finally:
+            frames.close()
+        return processed
+
+    def _detect(self, jpeg: bytes) -> dict:
+        started = time.monotonic()
+        resp = self._session.post(
+            self.detect_url,
+            files={"image": ("frame.jpg", jpeg, "image/jpeg")},
+            data={"camera_id": self.camera_id},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        body = resp.json()
+
+        result = {
+            "cameraId": self.camera_id,
+            "success": "error" not in body,
+            "motion": body.get("motion"),
+            "human": body.get("human"),
+            "tamper": body.get("tamper"),
+            "latencyMs": round(1000.0 * (time.monotonic() - started), 1),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        if "error" in body:
+            result["error"] = body["error"]
+        return result
+
+    def _raise_alerts(self, result: dict):
+        # Alerts fire when the camera's state changes (or someone new is
+        # tracked), not on every sampled frame; the aggregator still merges
+        # repeats within its cooldown into one event
+        if not result["success"]:
+            return
+        alert, state = self._classify(result)
+        new_tracks = (result.get("human") or {}).get("newTracks")
+        changed = state != self._alert_state
+        self._alert_state = state
+        if alert is None or not (changed or new_tracks):
+            return
+
+        toggles = get_system_alert_toggles(mongo.db) if mongo.db is not None else DEFAULT_TOGGLES
+        alert_type, message = alert
+        if toggles.get(alert_type, True):
+            alert_aggregator.record(alert_type, message, self.camera_id)
+
+    def _classify(self, result: dict):
+        """Return ((alert type, message) or None, state key) for one result."""
+        tamper = result.get("tamper") or {}
+        human = result.get("human") or {}
+        if tamper.get("tampered"):
+            message = f"Camera tampering ({tamper['reason']}) on {self.camera_id}"
+            return ("cameraCovered", message), ("cameraCovered", tamper["reason"])
+        if human.get("newTracks"):
+            # The AI module's tracker assigns an id per person, so a new id is someone entering
+            ids = ", ".join(str(i) for i in human["newTracks"])
+            return ("humanDetects", f"New person entered on {self.camera_id} (track {ids})"), "humanDetects"
+        if human.get("detected"):
+            return ("humanDetects", f"Person detected on {self.camera_id}"), "humanDetects"
+        if (result.get("motion") or {}).get("motionDetected"):
+            return ("motionDetects", f"Motion detected on {self.camera_id}"), "motionDetects"
+        return None, None
+
+    def _publish(self, result: dict):
+        with self._lock:
+            self._latest = result
+            self._stats["framesSampled"] += 1
+            if not result["success"]:
+                self._stats["errors"] += 1
+
+
+# ── Registry ────────────────────────────────────────────────────────────────
+_engines = {}
+_engines_lock = threading.Lock()
+
+# One governor shares the inference budget between every engine in the process
+governor = FrameRateGovernor(
+    idle_fps=Config.VIRTUALEYE_DETECTION_IDLE_FPS,
+    active_fps=Config.VIRTUALEYE_DETECTION_ACTIVE_FPS,
+    budget_fps=Config.VIRTUALEYE_INFERENCE_BUDGET_FPS,
+    hold_seconds=Config.VIRTUALEYE_ACTIVITY_HOLD_SECONDS,
+)
+
+
+def start_engine(camera: dict, ai_service_url: str = None) -> DetectionEngine:
+    """Start (or return the running) detection engine for a camera."""
+    ai_service_url = ai_service_url or Config.VIRTUALEYE_AI_SERVICE_URL
+
+    with _engines_lock:
+        engine = _engines.get(camera["cameraId"])
+        if engine is None:
+            engine = DetectionEngine(camera, governor, ai_service_url)
+            _engines[camera["cameraId"]] = engine
+    engine.start()
+    return engine
+
+
+def get_engine(camera_id: str):
+    return _engines.get(camera_id)
+
+
+def all_engines() -> list:
+    with _engines_lock:
+        return list(_engines.values())
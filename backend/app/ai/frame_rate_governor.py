@@ -0,0 +1,145 @@
+"""
+VirtualEye Backend - Adaptive Detection Frame-Rate Governor
+Decides how often each camera's detection engine samples a frame. A camera
+with recent motion or people runs at the active rate, a static scene drops to
+the idle rate, and the sum over all cameras is capped by a global inference
+budget (inferences/sec) shared with max-min fairness: cameras asking for less
+than an equal share get what they ask for, the rest split what remains.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Window used to measure effective (actually achieved) rates
+MEASURE_WINDOW_SECONDS = 10.0
+
+# Wait between samples when a camera is granted no rate at all (idle_fps=0
+# or an exhausted budget), so the engine still notices when activity starts
+MAX_INTERVAL_SECONDS = 5.0
+
+
+def _prune(timestamps: deque, horizon: float):
+    while timestamps and timestamps[0] < horizon:
+        timestamps.popleft()
+
+
+class _CameraState:
+    def __init__(self):
+        self.active_until = 0.0
+        self.active = False         # activity as of the last rebalance
+        self.desired_fps = 0.0
+        self.granted_fps = 0.0
+        self.samples = deque()      # monotonic timestamps of sampled frames
+        self.inferences = deque()   # timestamps of frames that reached YOLO
+
+
+class FrameRateGovernor:
+    """Per-camera sampling rates under a shared inference budget."""
+
+    def __init__(self, idle_fps: float, active_fps: float, budget_fps: float, hold_seconds: float):
+        self.idle_fps = idle_fps
+        self.active_fps = active_fps
+        self.budget_fps = budget_fps
+        self.hold_seconds = hold_seconds
+
+        self._cameras = {}
+        self._lock = threading.Lock()
+
+    # ── Engine hooks ────────────────────────────────────────────────────────
+    def register(self, camera_id: str):
+        with self._lock:
+            if camera_id not in self._cameras:
+                self._cameras[camera_id] = _CameraState()
+                self._rebalance(time.monotonic())
+
+    def unregister(self, camera_id: str):
+        with self._lock:
+            if self._cameras.pop(camera_id, None) is not None:
+                self._rebalance(time.monotonic())
+
+    def interval(self, camera_id: str) -> float:
+        """Seconds the camera should wait before sampling its next frame."""
+        with self._lock:
+            state = self._cameras.get(camera_id)
+            # Unregistered cameras are outside the budget and sample at the idle rate
+            fps = self.idle_fps if state is None else state.granted_fps
+            return 1.0 / fps if fps > 0 else MAX_INTERVAL_SECONDS
+
+    def report(self, camera_id: str, result: dict):
+        """Record a processed sample and adapt the camera's rate to its scene."""
+        now = time.monotonic()
+        motion = (result.get("motion") or {}).get("motionDetected", False)
+        human = result.get("human") or {}
+
+        with self._lock:
+            state = self._cameras.get(camera_id)
+            if state is None:
+                return
+
+            state.samples.append(now)
+            # Frames the AI module's tracker carried over never reached YOLO
+            if human and not human.get("skipped", True) and human.get("inferred", True):
+                state.inferences.append(now)
+            # Keep only the measuring window, whether or not metrics() is polled
+            horizon = now - MEASURE_WINDOW_SECONDS
+            _prune(state.samples, horizon)
+            _prune(state.inferences, horizon)
+
+            if motion or human.get("detected"):
+                state.active_until = now + self.hold_seconds
+
+            # Only recompute shares when a camera changes between idle/active,
+            # compared with what the last rebalance saw so an expired hold
+            # (a static report after hold_seconds) also counts as a change
+            if state.active != (state.active_until > now):
+                self._rebalance(now)
+
+    # ── Allocation ──────────────────────────────────────────────────────────
+    def _rebalance(self, now: float):
+        for state in self._cameras.values():
+            state.active = state.active_until > now
+            state.desired_fps = self.active_fps if state.active else self.idle_fps
+
+        # Max-min fair water-filling over desired rates
+        remaining = self.budget_fps
+        pending = sorted(self._cameras.values(), key=lambda s: s.desired_fps)
+        while pending:
+            share = remaining / len(pending)
+            state = pending.pop(0)
+            state.granted_fps = min(state.desired_fps, share)
+            remaining -= state.granted_fps
+
+    # ── Metrics ─────────────────────────────────────────────────────────────
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        horizon = now - MEASURE_WINDOW_SECONDS
+
+        with self._lock:
+            # Activity can lapse without a report; refresh desired/granted rates
+            self._rebalance(now)
+
+            cameras = {}
+            total_inference_fps = 0.0
+            total_granted = 0.0
+            for camera_id, state in self._cameras.items():
+                _prune(state.samples, horizon)
+                _prune(state.inferences, horizon)
+                inference_fps = len(state.inferences) / MEASURE_WINDOW_SECONDS
+                total_inference_fps += inference_fps
+                total_granted += state.granted_fps
+                cameras[camera_id] = {
+                    "active": state.active_until > now,
+                    "desiredFps": round(state.desired_fps, 3),
+                    "grantedFps": round(state.granted_fps, 3),
+                    "effectiveFps": round(len(state.samples) / MEASURE_WINDOW_SECONDS, 3),
+                    "inferenceFps": round(inference_fps, 3),
+                }
+
+        return {
+            "budgetFps": self.budget_fps,
+            "allocatedFps": round(total_granted, 3),
+            "inferenceFps": round(total_inference_fps, 3),
+            "budgetUtilization": round(total_inference_fps / self.budget_fps, 3) if self.budget_fps else 0.0,
+            "cameras": cameras,
+        }
@@ -55,3 +55,28 @@ class Config:
     VIRTUALEYE_CAMERA_SIMULATOR: str = os.getenv(
         "VIRTUALEYE_CAMERA_SIMULATOR", "true"
     )
+    VIRTUALEYE_CAMERA_RELAY_MODE: str = os.getenv(
+        "VIRTUALEYE_CAMERA_RELAY_MODE", "passthrough"
+    )
+
+    # ── Detection Engine ──────────────────────────────────────────
+    VIRTUALEYE_DETECTION_ENGINE: str = os.getenv("VIRTUALEYE_DETECTION_ENGINE", "false")
+    VIRTUALEYE_DETECTION_IDLE_FPS: float = float(os.getenv("VIRTUALEYE_DETECTION_IDLE_FPS", "0.5"))
+    VIRTUALEYE_DETECTION_ACTIVE_FPS: float = float(os.getenv("VIRTUALEYE_DETECTION_ACTIVE_FPS", "5"))
+    VIRTUALEYE_INFERENCE_BUDGET_FPS: float = float(os.getenv("VIRTUALEYE_INFERENCE_BUDGET_FPS", "8"))
+    VIRTUALEYE_ACTIVITY_HOLD_SECONDS: float = float(os.getenv("VIRTUALEYE_ACTIVITY_HOLD_SECONDS", "10"))
+    VIRTUALEYE_AI_SERVICE_URL: str = os.getenv("VIRTUALEYE_AI_SERVICE_URL", "http://localhost:8000")
+    VIRTUALEYE_DETECTION_FLUSH_SECONDS: float = float(os.getenv("VIRTUALEYE_DETECTION_FLUSH_SECONDS", "5"))
+    VIRTUALEYE_DETECTION_MAX_BUFFERED: int = int(os.getenv("VIRTUALEYE_DETECTION_MAX_BUFFERED", "50000"))
+    VIRTUALEYE_DETECTION_OVERFLOW: str = os.getenv("VIRTUALEYE_DETECTION_OVERFLOW", "spill")
+    VIRTUALEYE_DETECTION_SPILL_PATH: str = os.getenv("VIRTUALEYE_DETECTION_SPILL_PATH", "detections_spill.jsonl")
+
+    # ── Caches ────────────────────────────────────────────────────
+    VIRTUALEYE_USER_CACHE_SIZE: int = int(os.getenv("VIRTUALEYE_USER_CACHE_SIZE", "1024"))
+    VIRTUALEYE_USER_CACHE_TTL: float = float(os.getenv("VIRTUALEYE_USER_CACHE_TTL", "30"))
+
+    # ── Alerts ────────────────────────────────────────────────────
+    VIRTUALEYE_ALERT_COOLDOWN_SECONDS: float = float(os.getenv("VIRTUALEYE_ALERT_COOLDOWN_SECONDS", "60"))
+    VIRTUALEYE_ALERT_FLUSH_SECONDS: float = float(os.getenv("VIRTUALEYE_ALERT_FLUSH_SECONDS", "1.0"))
+    VIRTUALEYE_ALERT_RETENTION_DAYS: float = float(os.getenv("VIRTUALEYE_ALERT_RETENTION_DAYS", "30"))
+    VIRTUALEYE_ALERT_CONFIG_CACHE_TTL: float = float(os.getenv("VIRTUALEYE_ALERT_CONFIG_CACHE_TTL", "60"))
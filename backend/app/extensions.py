@@ -3,6 +3,7 @@ VirtualEye Backend - Flask Extensions
 Centralised extension initialisation (imported by the app factory).
 """
 
+from flask import request
 from flask_pymongo import PyMongo
 from flask_jwt_extended import JWTManager
 
@@ -11,3 +12,11 @@ mongo = PyMongo()
 
 # JWT Manager — handles token creation and verification
 jwt = JWTManager()
+
+
+@jwt.token_verification_loader
+def verify_token_scope(jwt_header, jwt_data):
+    # Scoped tokens (the alert stream token) are only valid on the endpoint
+    # named by their `scope` claim
+    scope = jwt_data.get("scope")
+    return scope is None or scope == request.endpoint
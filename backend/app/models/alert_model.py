@@ -0,0 +1,209 @@
+"""
+VirtualEye Backend - Alert Model
+Index management and history queries for the MongoDB 'alerts' collection,
+and cached per-user toggles from 'alert_configs'. History is paged with an
+opaque keyset cursor over (timestamp, _id), so every page is an index range
+scan no matter how deep the client has scrolled.
+"""
+
+from __future__ import annotations
+import base64
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from ..utils.cache import MongoVersionStamp, TTLCache
+
+# Alerts older than this are removed by Mongo's TTL monitor (keyed on createdAt)
+RETENTION_DAYS = float(os.environ.get("VIRTUALEYE_ALERT_RETENTION_DAYS", "30"))
+
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+# Fields returned by the history API
+HISTORY_PROJECTION = {
+    "type": 1, "cameraId": 1, "message": 1, "count": 1,
+    "firstSeen": 1, "lastSeen": 1, "timestamp": 1, "viewed": 1,
+}
+
+# Error code Mongo returns when an index exists with different options
+_INDEX_OPTIONS_CONFLICT = 85
+
+# Default config if no configured toggles
+DEFAULT_TOGGLES = {
+    "motionDetects": True,
+    "humanDetects": True,
+    "cameraCovered": True
+}
+
+# Per-user toggles; a PUT in any worker bumps the stamp and clears every cache
+CONFIG_CACHE_TTL = float(os.environ.get("VIRTUALEYE_ALERT_CONFIG_CACHE_TTL", "60"))
+_config_stamp = MongoVersionStamp("alert_configs")
+config_cache = TTLCache(maxsize=4096, ttl=CONFIG_CACHE_TTL, version_source=_config_stamp.read)
+
+
+def ensure_alert_indexes(db) -> List[str]:
+    """Create the alerts indexes (idempotent); return their names."""
+    alerts = db.alerts
+    names = [
+        # Unfiltered history pages and the keyset tiebreak
+        alerts.create_index([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id"),
+        # Filtered history pages
+        alerts.create_index([("type", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="type_timestamp_id"),
+        alerts.create_index([("cameraId", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="camera_timestamp_id"),
+    ]
+
+    ttl = int(RETENTION_DAYS * 86400)
+    try:
+        names.append(alerts.create_index("createdAt", name="createdAt_ttl", expireAfterSeconds=ttl))
+    except OperationFailure as e:
+        if e.code != _INDEX_OPTIONS_CONFLICT:
+            raise
+        # Retention changed since the index was built: update it in place
+        db.command("collMod", "alerts", index={"name": "createdAt_ttl", "expireAfterSeconds": ttl})
+        names.append("createdAt_ttl")
+    return names
+
+
+def serialize_alert(doc: dict) -> dict:
+    """Convert an alert document to its JSON form (string id, no internal dates)."""
+    payload = {k: v for k, v in doc.items() if k not in ("_id", "createdAt")}
+    payload["id"] = str(doc["_id"])
+    return payload
+
+
+# ── Keyset cursor ───────────────────────────────────────────────────────────
+def encode_cursor(doc: dict) -> str:
+    raw = json.dumps([doc["timestamp"], str(doc["_id"])]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, ObjectId]:
+    """Return (timestamp, _id) of the last alert on the previous page; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, oid = json.loads(raw)
+        return str(timestamp), ObjectId(oid)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _iso(value: str) -> str:
+    # Normalise to the naive-UTC isoformat() used for stored timestamps so
+    # string ranges compare correctly; offsets are converted, not dropped
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _until_bound(value: str) -> Tuple[str, str]:
+    # A date-only `to` covers that whole (UTC) day: everything before the next midnight
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        return "$lte", _iso(value)
+    return "$lt", datetime.combine(day + timedelta(days=1), datetime.min.time()).isoformat()
+
+
+def build_history_query(
+    alert_type: Optional[str] = None,
+    camera_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    """Build the history filter; raises ValueError on malformed dates or cursor."""
+    query = {}
+    if alert_type:
+        query["type"] = alert_type
+    if camera_id:
+        query["cameraId"] = camera_id
+
+    time_range = {}
+    if since:
+        time_range["$gte"] = _iso(since)
+    if until:
+        op, bound = _until_bound(until)
+        time_range[op] = bound
+    if time_range:
+        query["timestamp"] = time_range
+
+    if cursor:
+        last_ts, last_id = decode_cursor(cursor)
+        after = {"$or": [
+            {"timestamp": {"$lt": last_ts}},
+            {"timestamp": last_ts, "_id": {"$lt": last_id}},
+        ]}
+        query = {"$and": [query, after]} if query else after
+    return query
+
+
+def find_alert_history(db, limit: int = HISTORY_PAGE_SIZE, **filters) -> Tuple[List[dict], Optional[str]]:
+    """Return one page of alerts, newest first, and the cursor for the next page."""
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+    docs = list(
+        db.alerts.find(build_history_query(**filters), HISTORY_PROJECTION)
+        .sort([("timestamp", DESCENDING), ("_id", DESCENDING)])
+        .limit(limit + 1)
+    )
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return [serialize_alert(doc) for doc in docs[:limit]], next_cursor
+
+
+# ── Alert configuration ─────────────────────────────────────────────────────
+def _load_config(db, user_id: str) -> dict:
+    # The defaults are inserted before anything is cached, so a cached
+    # config always matches a stored document
+    cfg = db.alert_configs.find_one({"userId": user_id}, {"_id": 0})
+    if not cfg:
+        cfg = {"userId": user_id, "toggles": dict(DEFAULT_TOGGLES)}
+        db.alert_configs.insert_one(dict(cfg))
+    return cfg
+
+
+def get_alert_config(db, user_id: str) -> dict:
+    """Return the user's config document, creating it with the defaults if missing."""
+    cfg = config_cache.get_or_load(user_id, lambda: _load_config(db, user_id))
+    return {**cfg, "toggles": dict(cfg.get("toggles", DEFAULT_TOGGLES))}
+
+
+def get_alert_toggles(db, user_id: str) -> dict:
+    """Return the user's toggles, creating the default config if missing."""
+    return get_alert_config(db, user_id)["toggles"]
+
+
+# Cache key for the merged toggles; user ids are ObjectId strings, never "*"
+SYSTEM_TOGGLES_KEY = "*"
+
+
+def _load_system_toggles(db) -> dict:
+    configs = list(db.alert_configs.find({}, {"_id": 0, "toggles": 1}))
+    if not configs:
+        return dict(DEFAULT_TOGGLES)
+    return {
+        alert_type: any(cfg.get("toggles", DEFAULT_TOGGLES).get(alert_type, True) for cfg in configs)
+        for alert_type in DEFAULT_TOGGLES
+    }
+
+
+def get_system_alert_toggles(db) -> dict:
+    """Return the toggles for alerts raised by the detection engines.
+
+    Alerts are shared by every user, so a type is on while any stored config
+    enables it (the defaults apply when no config exists yet).
+    """
+    return dict(config_cache.get_or_load(SYSTEM_TOGGLES_KEY, lambda: _load_system_toggles(db)))
+
+
+def update_alert_toggles(db, user_id: str, toggles: dict):
+    """Store the user's toggles and invalidate cached copies in every worker."""
+    db.alert_configs.update_one({"userId": user_id}, {"$set": {"toggles": toggles}}, upsert=True)
+    config_cache.invalidate(user_id)
+    config_cache.invalidate(SYSTEM_TOGGLES_KEY)
+    _config_stamp.bump()
@@ -1,16 +1,19 @@
 """
 VirtualEye Backend - User Model
 Provides helper functions to create, fetch, and validate user documents
-stored in the MongoDB 'users' collection.
+stored in the MongoDB 'users' collection. Serialized users and the user
+list are cached per worker; create/delete invalidate them in every worker.
 """
 
 from __future__ import annotations
+import os
 from typing import Optional, List
 from datetime import datetime, timezone
 from bson import ObjectId
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask import abort
 from ..extensions import mongo
+from ..utils.cache import MongoVersionStamp, TTLCache
 
 
 def _db():
@@ -21,6 +24,24 @@ def _db():
     return db
 
 
+# ── User cache ─────────────────────────────────────────────────────────────
+# Serialized users keyed by id, plus the full list under _ALL_USERS
+_ALL_USERS = "__all__"
+_users_stamp = MongoVersionStamp("users")
+user_cache = TTLCache(
+    maxsize=int(os.environ.get("VIRTUALEYE_USER_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("VIRTUALEYE_USER_CACHE_TTL", "30")),
+    version_source=_users_stamp.read,
+)
+
+
+def _invalidate_users(user_id: str = None):
+    if user_id:
+        user_cache.invalidate(user_id)
+    user_cache.invalidate(_ALL_USERS)
+    _users_stamp.bump()
+
+
 # ── Default permissions by role ────────────────────────────────────────────
 DEFAULT_PERMISSIONS = {
     "ADMIN": {
@@ -57,6 +78,7 @@ def create_user(
         "createdAt": datetime.now(timezone.utc),
     }
     result = _db().users.insert_one(doc)
+    _invalidate_users()
     return str(result.inserted_id)
 
 
@@ -77,15 +99,30 @@ def delete_user_by_id(user_id: str) -> bool:
     """Delete a user by ID. Returns True if a document was deleted."""
     try:
         result = _db().users.delete_one({"_id": ObjectId(user_id)})
-        return result.deleted_count == 1
     except Exception:
         return False
+    _invalidate_users(user_id)
+    return result.deleted_count == 1
+
+
+def get_user_profile(user_id: str) -> Optional[dict]:
+    """Return the serialized user (cached), or None if it does not exist."""
+    profile = user_cache.get(user_id)
+    if profile is None:
+        user = find_user_by_id(user_id)
+        if user is None:
+            return None
+        profile = _serialize(user)
+        user_cache.set(user_id, profile)
+    return dict(profile)
 
 
 def get_all_users() -> List[dict]:
     """Return all user documents (without passwordHash)."""
-    users = _db().users.find({}, {"passwordHash": 0})
-    return [_serialize(u) for u in users]
+    users = user_cache.get_or_load(
+        _ALL_USERS, lambda: [_serialize(u) for u in _db().users.find({}, {"passwordHash": 0})]
+    )
+    return [dict(u) for u in users]
 
 
 def verify_password(user: dict, password: str) -> bool:
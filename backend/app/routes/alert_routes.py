@@ -1,28 +1,31 @@
-from flask import Blueprint, jsonify, request
-from .auth_routes import jwt_required, get_jwt_identity
+from datetime import timedelta
+
+from flask import Blueprint, Response, jsonify, request
+from bson import ObjectId
+from bson.errors import InvalidId
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, jwt_required
 from ..extensions import mongo
-from datetime import datetime
+from ..services.alert_aggregator import alert_aggregator
+from ..models.alert_model import (
+    find_alert_history, get_alert_config, get_alert_toggles, serialize_alert, update_alert_toggles,
+)
+from ..services.alert_broadcaster import AUTH_EXPIRED_SSE, BACKLOG_SIZE, alert_broadcaster, format_sse
+from config.camera_config import PRIMARY_CAMERA
 
 alert_bp = Blueprint("alert_bp", __name__)
 
-# Default config if no configured toggles
-DEFAULT_TOGGLES = {
-    "motionDetects": True,
-    "humanDetects": True,
-    "cameraCovered": True
-}
+# EventSource cannot send headers, so /alerts/stream takes its JWT in the query
+# string, where server and proxy logs record it. Only this short-lived token,
+# scoped to the stream endpoint, is accepted there; it is never the session token.
+STREAM_TOKEN_SCOPE = "alert_bp.stream_alerts"
+STREAM_TOKEN_SECONDS = 60
 
 @alert_bp.route("/alerts/config", methods=["GET"])
 @jwt_required()
 def get_config():
     """Gets the user or global alert toggles."""
     user_id = get_jwt_identity()
-    cfg = mongo.db.alert_configs.find_one({"userId": user_id}, {"_id": 0})
-    if not cfg:
-        # Default fallback
-        cfg = {"userId": user_id, "toggles": DEFAULT_TOGGLES}
-        mongo.db.alert_configs.insert_one(cfg)
-        cfg.pop("_id", None)
+    cfg = get_alert_config(mongo.db, user_id)
     return jsonify(cfg), 200
 
 @alert_bp.route("/alerts/config", methods=["PUT"])
@@ -32,21 +35,32 @@ def update_config():
     user_id = get_jwt_identity()
     data = request.json
     toggles = data.get("toggles", {})
-    
-    mongo.db.alert_configs.update_one(
-        {"userId": user_id},
-        {"$set": {"toggles": toggles}},
-        upsert=True
-    )
+
+    update_alert_toggles(mongo.db, user_id, toggles)
     return jsonify({"message": "Alert configuration updated.", "toggles": toggles}), 200
 
 @alert_bp.route("/alerts/history", methods=["GET"])
 @jwt_required()
 def get_history():
-    """Retrieves recent alerts."""
-    # Assuming alerts are stored in db.alerts
-    alerts = list(mongo.db.alerts.find({}, {"_id": 0}).sort("timestamp", -1).limit(50))
-    return jsonify({"alerts": alerts}), 200
+    """Retrieves alerts newest first, one keyset-paginated page at a time.
+
+    Query params: type, cameraId, from, to (ISO dates; offsets are
+    converted to UTC and a date-only `to` includes that whole day), limit,
+    cursor (the nextCursor of the previous page).
+    """
+    try:
+        alerts, next_cursor = find_alert_history(
+            mongo.db,
+            limit=request.args.get("limit", 50, type=int),
+            alert_type=request.args.get("type"),
+            camera_id=request.args.get("cameraId"),
+            since=request.args.get("from"),
+            until=request.args.get("to"),
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return jsonify({"alerts": alerts, "nextCursor": next_cursor}), 200
 
 @alert_bp.route("/alerts/trigger", methods=["POST"])
 @jwt_required()
@@ -55,23 +69,17 @@ def trigger_alert():
     data = request.json
     alert_type = data.get("type") # "motionDetects", "humanDetects", "cameraCovered"
     message = data.get("message", "Incoming Alert")
+    camera_id = data.get("cameraId", PRIMARY_CAMERA["id"])
 
     # Fetch global or system-wide toggles
     # For simplicity, we just check against the triggering user's config
     user_id = get_jwt_identity()
-    cfg = mongo.db.alert_configs.find_one({"userId": user_id})
-    toggles = getattr(cfg, "toggles", DEFAULT_TOGGLES) if cfg and "toggles" in cfg else DEFAULT_TOGGLES
+    toggles = get_alert_toggles(mongo.db, user_id)
 
     # Check if the alert type is toggled ON
     if toggles.get(alert_type, True):
-        alert_event = {
-            "type": alert_type,
-            "message": message,
-            "timestamp": datetime.utcnow().isoformat(),
-            "viewed": False
-        }
-        mongo.db.alerts.insert_one(alert_event)
-        alert_event.pop("_id", None)
+        # Repeats within the cooldown are merged into one event, written in batches
+        alert_event = serialize_alert(alert_aggregator.record(alert_type, message, camera_id))
         return jsonify({"message": "Alert registered", "alert": alert_event}), 201
     else:
         return jsonify({"message": "Alert ignored (toggled off)"}), 200
@@ -79,10 +87,84 @@ def trigger_alert():
 @alert_bp.route("/alerts/recent", methods=["GET"])
 @jwt_required()
 def get_recent_alerts():
-    """Used for polling the newest unread alerts for the popup."""
-    # This polls unviewed alerts
-    alerts = list(mongo.db.alerts.find({"viewed": False}, {"_id": 0}).sort("timestamp", -1))
-    # Mark them as viewed
-    if alerts:
-        mongo.db.alerts.update_many({"viewed": False}, {"$set": {"viewed": True}})
-    return jsonify({"alerts": alerts}), 200
+    """Deprecated: poll for alerts newer than a cursor (use /alerts/stream).
+
+    Query params: since (the `cursor` of the previous response), limit.
+    Without `since` the newest alerts are returned. Read-only: each client
+    keeps its own cursor, nothing is marked viewed for other clients.
+    """
+    limit = max(1, min(request.args.get("limit", 50, type=int), BACKLOG_SIZE))
+    since = request.args.get("since")
+    try:
+        since = ObjectId(since) if since else None
+    except (InvalidId, TypeError):
+        return jsonify({"message": "Invalid since cursor."}), 400
+
+    if since is None:
+        docs = list(mongo.db.alerts.find().sort("_id", -1).limit(limit))[::-1]
+    else:
+        docs = list(mongo.db.alerts.find({"_id": {"$gt": since}}).sort("_id", 1).limit(limit))
+    alerts = [serialize_alert(doc) for doc in docs]
+    cursor = alerts[-1]["id"] if alerts else (str(since) if since else None)
+    return jsonify({"alerts": alerts, "cursor": cursor}), 200
+
+@alert_bp.route("/alerts/stream-token", methods=["POST"])
+@jwt_required()
+def issue_stream_token():
+    """Issues a short-lived token that can only open /alerts/stream."""
+    token = create_access_token(
+        identity=get_jwt_identity(),
+        expires_delta=timedelta(seconds=STREAM_TOKEN_SECONDS),
+        additional_claims={"scope": STREAM_TOKEN_SCOPE, "sessionExp": get_jwt()["exp"]},
+    )
+    return jsonify({"token": token, "expiresIn": STREAM_TOKEN_SECONDS}), 200
+
+@alert_bp.route("/alerts/stream", methods=["GET"])
+@jwt_required(locations=["query_string"])
+def stream_alerts():
+    """Server-Sent Events stream of new alerts (replaces polling /alerts/recent).
+
+    The client's cursor is the id of the last alert it received: EventSource
+    sends it back as Last-Event-ID on reconnect, and `?since=` seeds it on a
+    fresh page load. Mongo is only read when the cursor predates the backlog.
+
+    Authenticated with `?jwt=<token from /alerts/stream-token>`. That token
+    only has to be valid when the stream opens; the stream ends with an
+    `auth-expired` event when the session token it was issued from expires,
+    so the client logs in again rather than reconnecting with a rejected token.
+    Alerts are fanned out in process memory: the backend must run as a
+    single process (see alert_broadcaster).
+    """
+    claims = get_jwt()
+    if claims.get("scope") != STREAM_TOKEN_SCOPE:
+        return jsonify({"message": "A stream token from /alerts/stream-token is required."}), 401
+
+    cursor = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        cursor = ObjectId(cursor) if cursor else None
+    except (InvalidId, TypeError):
+        cursor = None
+
+    missed = []
+    if cursor is not None and not alert_broadcaster.covers(cursor):
+        missed = [
+            serialize_alert(doc) for doc in
+            mongo.db.alerts.find({"_id": {"$gt": cursor}}).sort("_id", 1).limit(BACKLOG_SIZE)
+        ]
+        if missed:
+            cursor = ObjectId(missed[-1]["id"])
+
+    expires_at = claims.get("sessionExp")
+
+    def events():
+        yield "retry: 3000\n\n"
+        for payload in missed:
+            yield format_sse(payload)
+        for payload in alert_broadcaster.subscribe(cursor, until=expires_at):
+            yield format_sse(payload) if payload is not None else ": keep-alive\n\n"
+        yield AUTH_EXPIRED_SSE
+
+    return Response(events(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
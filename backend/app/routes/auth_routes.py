@@ -12,18 +12,16 @@ from flask import Blueprint, request, jsonify, redirect, current_app, url_for
 from flask_jwt_extended import (
     create_access_token,
     jwt_required,
-    get_jwt_identity,
-    get_jwt,
 )
 import requests as http_requests
 
 from ..models.user_model import (
     create_user,
     find_user_by_email,
-    find_user_by_id,
     verify_password,
     serialize_user,
 )
+from ..utils.auth import current_user, require_role
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -40,21 +38,12 @@ def _build_token_identity(user: dict) -> dict:
 
 # ── POST /api/auth/register ─────────────────────────────────────────────────
 @auth_bp.route("/register", methods=["POST"])
-@jwt_required()
+@require_role("ADMIN")
 def register():
     """
     Create a new user. Only ADMIN role can call this endpoint.
     Body: { email, password, name, role (optional), permissions (optional) }
     """
-    claims = get_jwt()
-    identity = get_jwt_identity()
-
-    # Support both identity stored as dict or sub-claim
-    caller_role = claims.get("role") or (identity.get("role") if isinstance(identity, dict) else None)
-
-    if caller_role != "ADMIN":
-        return jsonify({"message": "Forbidden: ADMIN role required."}), 403
-
     data = request.get_json(silent=True) or {}
     email = data.get("email", "").strip()
     password = data.get("password", "").strip()
@@ -119,11 +108,10 @@ def login():
 @jwt_required()
 def me():
     """Return the currently authenticated user's profile."""
-    user_id = get_jwt_identity()
-    user = find_user_by_id(user_id)
+    user = current_user()
     if not user:
         return jsonify({"message": "User not found."}), 404
-    return jsonify({"user": serialize_user(user)}), 200
+    return jsonify({"user": user}), 200
 
 
 # ── GET /api/auth/google/login ───────────────────────────────────────────────
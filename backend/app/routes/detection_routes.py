@@ -0,0 +1,46 @@
+"""
+VirtualEye Backend - Detection Routes
+
+GET /api/detection/latest              — latest result for every running engine
+GET /api/detection/<cameraId>/latest   — latest result for one camera
+GET /api/detection/governor            — per-camera fps and inference budget use
+"""
+
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+
+from ..ai.detection_engine import all_engines, get_engine, governor
+
+detection_bp = Blueprint("detection", __name__)
+
+
+# ── GET /api/detection/latest ────────────────────────────────────────────────
+@detection_bp.route("/latest", methods=["GET"])
+@jwt_required()
+def latest_all():
+    """Return the in-memory latest result and engine stats for every camera."""
+    return jsonify({
+        "cameras": [
+            {"result": engine.latest_result(), "engine": engine.stats()}
+            for engine in all_engines()
+        ]
+    }), 200
+
+
+# ── GET /api/detection/governor ──────────────────────────────────────────────
+@detection_bp.route("/governor", methods=["GET"])
+@jwt_required()
+def governor_stats():
+    """Return granted/effective fps per camera and global budget utilization."""
+    return jsonify(governor.metrics()), 200
+
+
+# ── GET /api/detection/<cameraId>/latest ─────────────────────────────────────
+@detection_bp.route("/<camera_id>/latest", methods=["GET"])
+@jwt_required()
+def latest_for_camera(camera_id: str):
+    """Return the latest detection result for a single camera."""
+    engine = get_engine(camera_id)
+    if engine is None:
+        return jsonify({"message": "No detection engine running for this camera."}), 404
+    return jsonify({"result": engine.latest_result(), "engine": engine.stats()}), 200
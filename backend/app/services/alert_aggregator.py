@@ -0,0 +1,231 @@
+"""
+VirtualEye Backend - Alert Aggregator
+Merges repeated alerts of the same type from the same camera into a single
+event while they keep arriving within a cooldown window. An event carries
+`count`, `firstSeen` and `lastSeen`; a person standing in frame becomes one
+alert whose count grows instead of one document per detected frame.
+
+Events are written behind: a flusher thread inserts new events with one
+insert_many and updates grown ones with one bulk_write per flush interval.
+If Mongo falls behind, the oldest pending events beyond the limit are dropped.
+"""
+
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Seconds of silence after which the next alert starts a new event
+COOLDOWN_SECONDS = float(os.environ.get("VIRTUALEYE_ALERT_COOLDOWN_SECONDS", "60"))
+
+# Seconds between flushes, and pending writes that trigger an early flush
+FLUSH_INTERVAL = float(os.environ.get("VIRTUALEYE_ALERT_FLUSH_SECONDS", "1.0"))
+FLUSH_BATCH_SIZE = 500
+
+# Events held in memory while Mongo is unavailable; the oldest are dropped beyond it
+MAX_PENDING = int(os.environ.get("VIRTUALEYE_ALERT_MAX_PENDING", "10000"))
+
+_DUPLICATE_KEY = 11000
+
+
+class _Event:
+    def __init__(self, doc: dict, now: float):
+        self.doc = doc
+        self.last_seen = now      # monotonic, for the cooldown
+        self.version = 1          # bumped on every merge
+        self.inserted = False
+
+
+class AlertAggregator:
+    """Cooldown-based alert deduplication with batched Mongo writes."""
+
+    def __init__(self, get_collection, cooldown_seconds: float = COOLDOWN_SECONDS,
+                 flush_interval: float = FLUSH_INTERVAL, flush_batch_size: int = FLUSH_BATCH_SIZE,
+                 max_pending: int = MAX_PENDING, autostart: bool = True):
+        # get_collection() is called at flush time so Mongo can be initialised
+        # late; it returns None until then and flushes wait for it
+        self._get_collection = get_collection
+        self.autostart = autostart  # False: caller flushes, no background thread
+        self.cooldown_seconds = cooldown_seconds
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.max_pending = max_pending
+
+        self._open = {}       # (type, cameraId) -> _Event still inside its cooldown
+        self._pending = {}    # _id -> _Event with changes not yet written, oldest first
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._listeners = []  # called with each newly opened event
+
+        self._stats = {"received": 0, "events": 0, "flushes": 0, "writes": 0, "flushErrors": 0, "dropped": 0}
+
+    # ── Recording ───────────────────────────────────────────────────────────
+    def record(self, alert_type: str, message: str, camera_id: str) -> dict:
+        """Merge an alert into its open event (or open a new one); return the event."""
+        now = time.monotonic()
+        timestamp = datetime.utcnow().isoformat()
+        key = (alert_type, camera_id)
+
+        with self._lock:
+            self._stats["received"] += 1
+            event = self._open.get(key)
+            if event is not None and now - event.last_seen <= self.cooldown_seconds:
+                event.doc["count"] += 1
+                event.doc["lastSeen"] = timestamp
+                event.doc["message"] = message
+                event.last_seen = now
+                event.version += 1
+            else:
+                event = _Event({
+                    "_id": ObjectId(),
+                    "type": alert_type,
+                    "cameraId": camera_id,
+                    "message": message,
+                    "count": 1,
+                    "firstSeen": timestamp,
+                    "lastSeen": timestamp,
+                    "timestamp": timestamp,
+                    "viewed": False,
+                    "createdAt": datetime.utcnow(),  # BSON date for the TTL index
+                }, now)
+                self._open[key] = event
+                self._stats["events"] += 1
+            self._pending[event.doc["_id"]] = event
+            self._apply_backpressure()
+            snapshot = dict(event.doc)
+            flush_now = len(self._pending) >= self.flush_batch_size
+            # Listeners run under the lock, so they see new events in the
+            # order their ObjectIds were assigned (subscriber cursors rely on it)
+            if event.version == 1:
+                for listener in self._listeners:
+                    listener(dict(snapshot))
+
+        self._ensure_started()
+        if flush_now:
+            self._wake.set()
+        return snapshot
+
+    def add_listener(self, listener):
+        """Register a callable notified of every new event (not of merges).
+
+        Listeners are called with the aggregator lock held: they must be quick
+        and must not call back into the aggregator.
+        """
+        self._listeners.append(listener)
+
+    # ── Flushing ────────────────────────────────────────────────────────────
+    def flush(self) -> int:
+        """Write pending events to Mongo; return the number of DB round trips."""
+        with self._flush_lock:
+            with self._lock:
+                inserts, updates = [], []
+                for event in self._pending.values():
+                    pending = (event, event.version, dict(event.doc))
+                    (updates if event.inserted else inserts).append(pending)
+                self._prune_open()
+            # Mongo is initialised late (or not configured): keep them pending
+            collection = self._get_collection()
+            if (not inserts and not updates) or collection is None:
+                return 0
+
+            writes = 0
+            if inserts:
+                try:
+                    self._insert(collection, [doc for _, _, doc in inserts])
+                    writes += 1
+                    self._mark_written(inserts)
+                except Exception as e:
+                    self._flush_failed(e)
+            if updates:
+                try:
+                    collection.bulk_write([
+                        UpdateOne({"_id": doc["_id"]}, {"$set": {
+                            "count": doc["count"],
+                            "lastSeen": doc["lastSeen"],
+                            "message": doc["message"],
+                        }})
+                        for _, _, doc in updates
+                    ], ordered=False)
+                    writes += 1
+                    self._mark_written(updates)
+                except Exception as e:
+                    self._flush_failed(e)
+
+            if writes:
+                with self._lock:
+                    self._stats["flushes"] += 1
+                    self._stats["writes"] += writes
+            return writes
+
+    @staticmethod
+    def _insert(collection, docs):
+        try:
+            collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # A retry after a partial write re-sends events that already
+            # landed; those duplicate-key errors mean the write succeeded
+            if any(err.get("code") != _DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                raise
+
+    def _flush_failed(self, error):
+        # Unwritten events stay pending and are retried on the next flush
+        with self._lock:
+            self._stats["flushErrors"] += 1
+        print(f"[Alerts] Flush failed: {error}", flush=True)
+
+    def _mark_written(self, written):
+        with self._lock:
+            for event, version, _ in written:
+                event.inserted = True
+                # Merged again while the write was in flight: keep it pending
+                if event.version == version:
+                    self._pending.pop(event.doc["_id"], None)
+
+    def _apply_backpressure(self):
+        # Mongo keeps failing (or is not configured): forget the oldest changes
+        while len(self._pending) > self.max_pending:
+            del self._pending[next(iter(self._pending))]
+            self._stats["dropped"] += 1
+
+    def _prune_open(self):
+        # Events past their cooldown can no longer be merged into
+        now = time.monotonic()
+        for key, event in list(self._open.items()):
+            if now - event.last_seen > self.cooldown_seconds:
+                del self._open[key]
+
+    def _ensure_started(self):
+        if not self.autostart or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="alert-flusher", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    # ── Metrics ─────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "openEvents": len(self._open), "pending": len(self._pending)}
+
+
+def _alerts_collection():
+    from ..extensions import mongo
+    return mongo.db.alerts if mongo.db is not None else None
+
+
+# Process-wide aggregator shared by the alert routes and the detection engines
+alert_aggregator = AlertAggregator(_alerts_collection)
@@ -0,0 +1,106 @@
+"""
+VirtualEye Backend - Alert Broadcaster
+Pushes newly registered alert events to Server-Sent Events subscribers. Events
+are kept in a small in-memory backlog ordered by their ObjectId, and each
+client resumes from its own cursor (the id of the last event it received,
+sent back by EventSource as Last-Event-ID) instead of Mongo's global `viewed`
+flag. Delivering an alert to any number of dashboards costs no DB operations.
+
+The broadcaster, like the alert aggregator that feeds it, lives in process
+memory: run the backend as a single process (run.py's threaded server, or
+one worker behind gunicorn) or dashboards connected to one worker miss the
+alerts registered in another.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+from bson import ObjectId
+
+from ..models.alert_model import serialize_alert
+from .alert_aggregator import alert_aggregator
+
+# Events kept for clients that reconnect; older cursors are served from Mongo
+BACKLOG_SIZE = 256
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15.0
+
+
+# Last event of a stream whose token expired; the client must re-authenticate
+# instead of letting EventSource reconnect with the stale token
+AUTH_EXPIRED_SSE = "event: auth-expired\ndata: {}\n\n"
+
+
+def format_sse(payload: dict) -> str:
+    return f"id: {payload['id']}\nevent: alert\ndata: {json.dumps(payload)}\n\n"
+
+
+class AlertBroadcaster:
+    """Fan-out of new alert events to streaming subscribers."""
+
+    def __init__(self, backlog: int = BACKLOG_SIZE):
+        self._events = deque(maxlen=backlog)  # (ObjectId, payload)
+        self._cond = threading.Condition()
+        self._subscribers = 0
+        self._published = 0
+
+    def publish(self, event: dict):
+        with self._cond:
+            self._events.append((event["_id"], serialize_alert(event)))
+            self._published += 1
+            self._cond.notify_all()
+
+    def covers(self, cursor: ObjectId) -> bool:
+        """True if every event after `cursor` is still in the backlog."""
+        with self._cond:
+            return bool(self._events) and cursor >= self._events[0][0]
+
+    def subscribe(self, cursor: ObjectId = None, heartbeat: float = HEARTBEAT_SECONDS, until: float = None):
+        """Yield payloads of events newer than `cursor`, or None as a heartbeat.
+
+        Without a cursor the stream starts at the newest event: only alerts
+        registered after the client connected are delivered. The stream ends
+        at `until` (a Unix time), if given.
+        """
+        with self._cond:
+            self._subscribers += 1
+            if cursor is None and self._events:
+                cursor = self._events[-1][0]
+        try:
+            while True:
+                timeout = heartbeat
+                if until is not None:
+                    timeout = min(heartbeat, until - time.time())
+                    if timeout <= 0:
+                        return
+                with self._cond:
+                    has_new = self._cond.wait_for(
+                        lambda: self._events and (cursor is None or self._events[-1][0] > cursor),
+                        timeout=timeout,
+                    )
+                    fresh = [
+                        (event_id, payload) for event_id, payload in self._events
+                        if cursor is None or event_id > cursor
+                    ] if has_new else []
+                if not fresh:
+                    if until is None or time.time() < until:
+                        yield None
+                    continue
+                for event_id, payload in fresh:
+                    cursor = event_id
+                    yield payload
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"subscribers": self._subscribers, "published": self._published, "backlog": len(self._events)}
+
+
+# Every new event opened by the aggregator is pushed to connected dashboards
+alert_broadcaster = AlertBroadcaster()
+alert_aggregator.add_listener(alert_broadcaster.publish)
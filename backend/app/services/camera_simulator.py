@@ -7,6 +7,9 @@ import cv2
 import threading
 from flask import Flask, Response
 
+from .frame_hub import get_hub
+from .mjpeg_relay import transcode_frames
+
 simulator_app = Flask(__name__)
 
 # ✅ OPEN CAMERA ONLY ONCE
@@ -21,24 +24,23 @@ else:
 def generate_frames():
     """
     Generate MJPEG stream without reopening camera.
+    The webcam is read and JPEG-encoded once per frame by the frame hub;
+    every viewer receives the same bytes.
     """
-    global camera
-
-    while True:
-        success, frame = camera.read()
-
-        if not success:
-            continue
-
-        ret, buffer = cv2.imencode('.jpg', frame)
-        frame_bytes = buffer.tobytes()
-
-        yield (
-            b'--frame\r\n'
-            b'Content-Type: image/jpeg\r\n\r\n' +
-            frame_bytes +
-            b'\r\n'
-        )
+    # Keep the global webcam open across hub restarts (release=False)
+    hub = get_hub("simulator", lambda: transcode_frames(lambda: camera, release=False))
+
+    frames = hub.subscribe()
+    try:
+        for frame_bytes in frames:
+            yield (
+                b'--frame\r\n'
+                b'Content-Type: image/jpeg\r\n\r\n' +
+                frame_bytes +
+                b'\r\n'
+            )
+    finally:
+        frames.close()
 
 
 @simulator_app.route('/')
@@ -1,19 +1,48 @@
+import os
 import cv2
-import time
 from ..extensions import mongo
+from .frame_hub import get_hub
+from .mjpeg_relay import passthrough_frames, transcode_frames
 
-def get_camera_capture(camera):
-    camera_type = camera.get("type")
-    camera_url = camera.get("url")
-    camera_id = camera.get("cameraId")
-
+def get_camera_source_url(camera):
     # If it's the laptop camera and we are in simulation mode
     from config.camera_config import PRIMARY_CAMERA
-    source = PRIMARY_CAMERA["url"]
+    return PRIMARY_CAMERA["url"]
+
+
+def get_camera_capture(camera):
+    camera_id = camera.get("cameraId")
+    source = get_camera_source_url(camera)
     print(f"[Stream] Initializing {camera_id} via ESP32: {source}", flush=True)
     return cv2.VideoCapture(source, cv2.CAP_FFMPEG)
 
 
+def get_frame_source(camera):
+    """
+    Build the frame hub source for a camera.
+    'passthrough' (default) relays the ESP32's JPEG bytes without decoding;
+    'transcode' decodes via OpenCV and re-encodes, for non-MJPEG sources.
+    """
+    mode = os.environ.get("VIRTUALEYE_CAMERA_RELAY_MODE", "passthrough").lower()
+    if mode == "transcode":
+        return lambda: transcode_frames(lambda: get_camera_capture(camera))
+
+    url = get_camera_source_url(camera)
+
+    def relay():
+        print(f"[Stream] Relaying {camera.get('cameraId')} from ESP32: {url}", flush=True)
+        return passthrough_frames(url)
+    return relay
+
+
+def get_camera_hub(camera):
+    """
+    Return the shared frame hub for a camera's source. Hubs are keyed by source
+    URL so stream viewers and the detection engine share one upstream connection.
+    """
+    return get_hub(get_camera_source_url(camera), get_frame_source(camera))
+
+
 def generate_frames(camera_id):
     # Find camera in DB
     camera = mongo.db.cameras.find_one({"cameraId": camera_id})
@@ -22,47 +51,21 @@ def generate_frames(camera_id):
         print(f"[Stream] Camera {camera_id} not found in DB", flush=True)
         return
 
-    # Retry loop to open camera
-    cap = None
-    for attempt in range(5):
-        cap = get_camera_capture(camera)
-        if cap.isOpened():
-            break
-        print(f"[Stream] Attempt {attempt+1} to open {camera_id} failed", flush=True)
-        cap.release()
-        time.sleep(2)
-    
-    if not cap or not cap.isOpened():
-        print(f"[Stream] Could not open stream for {camera_id} after retries", flush=True)
-        return
+    # All viewers of a camera share one reader (and one connection to the
+    # ESP32) through its frame hub; JPEG bytes are relayed, not re-encoded.
+    hub = get_camera_hub(camera)
 
-    print(f"[Stream] Sending frames for {camera_id}...", flush=True)
+    print(f"[Stream] Sending frames for {camera_id} ({hub.subscriber_count} other viewers)", flush=True)
 
+    frames = hub.subscribe()
     try:
-        while True:
-            success, frame = cap.read()
-            if not success:
-                # If frame fails, wait a bit and retry
-                print(f"[Stream] Frame read fail for {camera_id}, retrying read...", flush=True)
-                time.sleep(0.5)
-                # Check if camera still opened
-                if not cap.isOpened():
-                    break
-                continue
-
-            # Encode frame as JPEG
-            ret, buffer = cv2.imencode('.jpg', frame)
-            if not ret:
-                continue
-
-            frame_bytes = buffer.tobytes()
-
+        for frame_bytes in frames:
             # Yield in MJPEG format
             yield (b'--frame\r\n'
                    b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
     except Exception as e:
         print(f"[Stream] Error in stream generation for {camera_id}: {e}", flush=True)
     finally:
-        if cap:
-            cap.release()
+        # Unsubscribe right away so the reader stops with the last viewer
+        frames.close()
         print(f"[Stream] Stream connection closed for {camera_id}", flush=True)
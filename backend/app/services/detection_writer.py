@@ -0,0 +1,265 @@
+"""
+VirtualEye Backend - Detection Result Writer
+Write-behind persistence for the per-frame results of the detection engines.
+Results are folded into one compact document per camera per minute:
+
+    {cameraId, minute, count, motionCount, humanCount, maxConfidence,
+     samples: [{s: second, m: motion, a: motionArea, h: human, c: conf, l: latencyMs}]}
+
+A minute is written once it has closed, with insert_many(ordered=False) every
+flush interval, or earlier when the buffer passes its size threshold (a
+minute may then be split over several documents). If Mongo falls behind,
+the oldest documents beyond the buffer limit are dropped or spilled to a
+local JSON-lines file that is replayed once writes succeed again.
+"""
+
+import atexit
+import os
+import shutil
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+from bson import ObjectId, json_util
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+# Seconds between flushes, and buffered samples that force an early flush
+FLUSH_INTERVAL = float(os.environ.get("VIRTUALEYE_DETECTION_FLUSH_SECONDS", "5"))
+FLUSH_SAMPLES = 2000
+
+# Samples held in memory while Mongo is unavailable before backpressure applies
+MAX_BUFFERED_SAMPLES = int(os.environ.get("VIRTUALEYE_DETECTION_MAX_BUFFERED", "50000"))
+
+# "drop" discards the oldest buffered minutes, "spill" appends them to SPILL_PATH
+OVERFLOW_POLICY = os.environ.get("VIRTUALEYE_DETECTION_OVERFLOW", "spill")
+SPILL_PATH = os.environ.get("VIRTUALEYE_DETECTION_SPILL_PATH", "detections_spill.jsonl")
+
+# Late results (network delay) still land in their minute within this grace
+CLOSE_GRACE = timedelta(seconds=5)
+
+INSERT_CHUNK = 1000
+_DUPLICATE_KEY = 11000
+
+
+def _minute_of(timestamp: datetime) -> datetime:
+    return timestamp.replace(second=0, microsecond=0)
+
+
+class DetectionWriter:
+    """Buffers detection results and writes them as per-minute bucket documents."""
+
+    def __init__(self, get_collection, flush_interval: float = FLUSH_INTERVAL,
+                 flush_samples: int = FLUSH_SAMPLES, max_buffered: int = MAX_BUFFERED_SAMPLES,
+                 overflow: str = OVERFLOW_POLICY, spill_path: str = SPILL_PATH, autostart: bool = True):
+        if overflow not in ("drop", "spill"):
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected 'drop' or 'spill'")
+        # get_collection() is called at flush time so Mongo can be initialised
+        # late; it returns None until then and flushes wait for it
+        self._get_collection = get_collection
+        self.flush_interval = flush_interval
+        self.flush_samples = flush_samples
+        self.max_buffered = max_buffered
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.autostart = autostart
+
+        self._buckets = {}     # (cameraId, minute) -> open bucket document
+        self._ready = deque()  # closed bucket documents waiting to be written
+        self._buffered = 0     # samples across _buckets and _ready
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+        self._stats = {"received": 0, "written": 0, "docsWritten": 0, "flushes": 0,
+                       "flushErrors": 0, "dropped": 0, "spilled": 0, "replayed": 0}
+
+    # ── Recording ───────────────────────────────────────────────────────────
+    def record(self, result: dict):
+        """Buffer one engine result ({cameraId, motion, human, latencyMs, timestamp})."""
+        timestamp = datetime.fromisoformat(result["timestamp"])
+        minute = _minute_of(timestamp)
+        motion = result.get("motion") or {}
+        human = result.get("human") or {}
+
+        sample = {
+            "s": round(timestamp.second + timestamp.microsecond / 1e6, 3),
+            "m": bool(motion.get("motionDetected")),
+            "a": motion.get("motionArea", 0),
+            "h": bool(human.get("detected")),
+            "c": round(float(human.get("confidence", 0.0)), 3),
+            "l": result.get("latencyMs"),
+        }
+
+        with self._lock:
+            self._stats["received"] += 1
+            key = (result["cameraId"], minute)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = {
+                    "_id": ObjectId(),
+                    "cameraId": result["cameraId"],
+                    "minute": minute,
+                    "count": 0,
+                    "motionCount": 0,
+                    "humanCount": 0,
+                    "maxConfidence": 0.0,
+                    "samples": [],
+                }
+            bucket["samples"].append(sample)
+            bucket["count"] += 1
+            bucket["motionCount"] += sample["m"]
+            bucket["humanCount"] += sample["h"]
+            bucket["maxConfidence"] = max(bucket["maxConfidence"], sample["c"])
+            self._buffered += 1
+            # Wake the flusher once, when the threshold is crossed. While Mongo
+            # is down the buffer stays above it; waking on every sample would
+            # retry the failing write back to back instead of every interval.
+            flush_now = self._buffered == self.flush_samples
+
+        self._ensure_started()
+        if flush_now:
+            self._wake.set()
+
+    # ── Flushing ────────────────────────────────────────────────────────────
+    def flush(self, force: bool = False) -> int:
+        """Write closed minutes (all minutes if forced or over the size threshold)."""
+        with self._flush_lock:
+            with self._lock:
+                self._close_buckets(force or self._buffered >= self.flush_samples)
+                self._apply_backpressure()
+                docs = list(self._ready)
+            # Mongo is initialised late (or not configured): keep buffering
+            collection = self._get_collection()
+            if not docs or collection is None:
+                return 0
+
+            try:
+                self._insert(collection, docs)
+            except Exception as e:
+                # Documents stay queued (with their _ids) and are retried next flush
+                with self._lock:
+                    self._stats["flushErrors"] += 1
+                print(f"[DetectionWriter] Flush failed: {e}", flush=True)
+                return 0
+
+            with self._lock:
+                for _ in docs:
+                    written = self._ready.popleft()
+                    self._buffered -= written["count"]
+                    self._stats["written"] += written["count"]
+                self._stats["docsWritten"] += len(docs)
+                self._stats["flushes"] += 1
+
+            self._replay_spill(collection)
+            return len(docs)
+
+    def _close_buckets(self, everything: bool):
+        cutoff = _minute_of(datetime.utcnow() - CLOSE_GRACE) - timedelta(minutes=1)
+        for key in sorted(self._buckets, key=lambda k: k[1]):
+            if everything or key[1] <= cutoff:
+                self._ready.append(self._buckets.pop(key))
+
+    def _apply_backpressure(self):
+        # Oldest minutes go first; open buckets are never dropped
+        while self._buffered > self.max_buffered and self._ready:
+            doc = self._ready.popleft()
+            self._buffered -= doc["count"]
+            if self.overflow == "spill" and self._spill(doc):
+                self._stats["spilled"] += doc["count"]
+            else:
+                self._stats["dropped"] += doc["count"]
+
+    def _insert(self, collection, docs):
+        for i in range(0, len(docs), INSERT_CHUNK):
+            try:
+                collection.insert_many(docs[i:i + INSERT_CHUNK], ordered=False)
+            except BulkWriteError as e:
+                # A retry after a partial write re-sends documents that already
+                # landed; those duplicate-key errors mean the write succeeded
+                if any(err.get("code") != _DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                    raise
+
+    # ── Spill file ──────────────────────────────────────────────────────────
+    def _spill(self, doc) -> bool:
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(json_util.dumps(doc) + "\n")
+            return True
+        except OSError as e:
+            print(f"[DetectionWriter] Spill to {self.spill_path} failed: {e}", flush=True)
+            return False
+
+    def _replay_spill(self, collection):
+        # Only after a successful flush: Mongo is reachable again. The file is
+        # streamed in INSERT_CHUNK batches, so it is never loaded whole; after
+        # a failure it is replayed from the start and the duplicate-key errors
+        # of already written documents are ignored by _insert
+        if self.overflow != "spill" or not os.path.exists(self.spill_path):
+            return
+        replaying = f"{self.spill_path}.replay"
+        replayed = 0
+        try:
+            os.replace(self.spill_path, replaying)
+            with open(replaying, encoding="utf-8") as f:
+                chunk = []
+                for line in f:
+                    if line.strip():
+                        chunk.append(json_util.loads(line))
+                    if len(chunk) >= INSERT_CHUNK:
+                        self._insert(collection, chunk)
+                        replayed += sum(doc["count"] for doc in chunk)
+                        chunk = []
+                if chunk:
+                    self._insert(collection, chunk)
+                    replayed += sum(doc["count"] for doc in chunk)
+            os.remove(replaying)
+        except Exception as e:
+            print(f"[DetectionWriter] Spill replay failed, will retry: {e}", flush=True)
+            if os.path.exists(replaying):
+                # Put the unreplayed documents back in front of any newer spill
+                with open(replaying, "a", encoding="utf-8") as out:
+                    if os.path.exists(self.spill_path):
+                        with open(self.spill_path, encoding="utf-8") as newer:
+                            shutil.copyfileobj(newer, out)
+                os.replace(replaying, self.spill_path)
+            return
+        with self._lock:
+            self._stats["replayed"] += replayed
+
+    # ── Background flusher ──────────────────────────────────────────────────
+    def _ensure_started(self):
+        if not self.autostart or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="detection-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush, True)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    # ── Metrics ─────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "buffered": self._buffered,
+                    "openBuckets": len(self._buckets), "queuedDocs": len(self._ready)}
+
+
+def ensure_detection_indexes(db):
+    """Index the bucket collection for per-camera time-range reads."""
+    return db.detections.create_index([("cameraId", ASCENDING), ("minute", ASCENDING)], name="camera_minute")
+
+
+def _detections_collection():
+    from ..extensions import mongo
+    return mongo.db.detections if mongo.db is not None else None
+
+
+# Process-wide writer fed by every detection engine
+detection_writer = DetectionWriter(_detections_collection)
@@ -0,0 +1,150 @@
+"""
+VirtualEye Backend - Camera Frame Hub
+One background reader per camera puts each JPEG frame once into a shared ring
+buffer; any number of MJPEG subscribers stream from that buffer. Slow clients
+skip straight to the newest frame, and the reader shuts down (releasing the
+camera) when the last subscriber leaves.
+
+Frames arrive from a frame source (see mjpeg_relay.py): either the upstream
+JPEG bytes passed through untouched, or an OpenCV decode + re-encode.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Frames kept per camera; subscribers only ever read the newest one
+RING_BUFFER_SIZE = 4
+
+# Seconds a subscriber waits for a new frame before giving up on the camera
+SUBSCRIBER_TIMEOUT = 30.0
+
+# Reconnect backoff when the camera cannot be opened or stops delivering frames
+RECONNECT_DELAY = 2.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class FrameHub:
+    """Shares a single camera capture between all of its viewers."""
+
+    def __init__(self, camera_id: str, frame_source):
+        # frame_source() returns an iterator of JPEG bytes; it is called again
+        # to reconnect whenever the iterator ends or raises
+        self.camera_id = camera_id
+        self._frame_source = frame_source
+
+        self._frames = deque(maxlen=RING_BUFFER_SIZE)  # (seq, jpeg bytes)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+        self._subscribers = 0
+        self._generation = 0   # bumped on every reader start/stop
+        self._running = False
+
+    # ── Subscribers ─────────────────────────────────────────────────────────
+    def subscribe(self):
+        """Yield JPEG frames as they are produced, always the newest available."""
+        self._add_subscriber()
+        try:
+            last_seq = 0
+            while True:
+                with self._cond:
+                    has_frame = self._cond.wait_for(
+                        lambda: (self._frames and self._frames[-1][0] > last_seq) or not self._running,
+                        timeout=SUBSCRIBER_TIMEOUT,
+                    )
+                    if not has_frame or not self._running:
+                        break
+                    # Skip anything buffered in between: always the latest frame
+                    last_seq, jpeg = self._frames[-1]
+                yield jpeg
+        finally:
+            self._remove_subscriber()
+
+    def latest(self):
+        """Return (seq, jpeg bytes) of the newest frame, or None."""
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._cond:
+            return self._subscribers
+
+    def _add_subscriber(self):
+        with self._cond:
+            self._subscribers += 1
+            if not self._running:
+                self._running = True
+                self._generation += 1
+                threading.Thread(
+                    target=self._reader,
+                    args=(self._generation,),
+                    name=f"frame-hub-{self.camera_id}",
+                    daemon=True,
+                ).start()
+
+    def _remove_subscriber(self):
+        with self._cond:
+            self._subscribers -= 1
+            if self._subscribers == 0:
+                print(f"[FrameHub] Last viewer left {self.camera_id}, stopping reader", flush=True)
+                self._running = False
+                self._generation += 1
+                self._frames.clear()
+                self._cond.notify_all()
+
+    # ── Reader thread ───────────────────────────────────────────────────────
+    def _is_current(self, generation: int) -> bool:
+        with self._cond:
+            return self._running and self._generation == generation
+
+    def _reader(self, generation: int):
+        delay = RECONNECT_DELAY
+        while self._is_current(generation):
+            frames = None
+            published = False
+            try:
+                frames = self._frame_source()
+                for jpeg in frames:
+                    if not self._is_current(generation):
+                        break
+                    if not published:
+                        print(f"[FrameHub] Reader started for {self.camera_id}", flush=True)
+                        published = True
+                        delay = RECONNECT_DELAY
+                    # Stored once; every subscriber shares these bytes
+                    self._publish(jpeg)
+            except Exception as e:
+                print(f"[FrameHub] Source error for {self.camera_id}: {e}", flush=True)
+            finally:
+                if frames is not None and hasattr(frames, "close"):
+                    frames.close()
+
+            if self._is_current(generation):
+                print(f"[FrameHub] Lost {self.camera_id}, reconnecting in {delay:.0f}s", flush=True)
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+        print(f"[FrameHub] Reader stopped for {self.camera_id}", flush=True)
+
+    def _publish(self, jpeg: bytes):
+        with self._cond:
+            self._seq += 1
+            self._frames.append((self._seq, jpeg))
+            self._cond.notify_all()
+
+
+# ── Registry ────────────────────────────────────────────────────────────────
+_hubs = {}
+_hubs_lock = threading.Lock()
+
+
+def get_hub(camera_id: str, frame_source) -> FrameHub:
+    """Return the process-wide hub for a camera, creating it on first use."""
+    with _hubs_lock:
+        hub = _hubs.get(camera_id)
+        if hub is None:
+            hub = FrameHub(camera_id, frame_source)
+            _hubs[camera_id] = hub
+        return hub
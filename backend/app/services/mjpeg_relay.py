@@ -0,0 +1,111 @@
+"""
+VirtualEye Backend - MJPEG Relay
+Frame sources for the frame hub. The passthrough source parses the camera's
+multipart/x-mixed-replace stream and yields the upstream JPEG bytes untouched;
+the transcode source decodes through OpenCV and re-encodes each frame.
+"""
+
+import time
+
+import cv2
+import requests
+
+# Upstream chunk size; ESP32 frames are typically 10-60 kB
+CHUNK_SIZE = 16 * 1024
+
+
+class MultipartJpegParser:
+    """Incremental parser for multipart/x-mixed-replace JPEG streams."""
+
+    def __init__(self, boundary: bytes):
+        # Some servers declare the boundary with its leading dashes included
+        self._delimiter = b"--" + boundary.lstrip(b"-")
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> list:
+        """Add received bytes; return every complete JPEG part now available."""
+        self._buffer += chunk
+        parts = []
+
+        while True:
+            start = self._buffer.find(self._delimiter)
+            if start < 0:
+                # Keep just enough tail to match a delimiter split across chunks
+                del self._buffer[:-len(self._delimiter)]
+                break
+            if start:
+                del self._buffer[:start]
+
+            header_end = self._buffer.find(b"\r\n\r\n")
+            if header_end < 0:
+                break
+            body_start = header_end + 4
+            headers = self._parse_headers(self._buffer[len(self._delimiter):header_end])
+
+            length = headers.get(b"content-length")
+            if length is not None and length.isdigit():
+                body_end = body_start + int(length)
+                if len(self._buffer) < body_end:
+                    break
+                parts.append(bytes(self._buffer[body_start:body_end]))
+                del self._buffer[:body_end]
+            else:
+                # No Content-Length: the part runs until the next delimiter
+                body_end = self._buffer.find(self._delimiter, body_start)
+                if body_end < 0:
+                    break
+                parts.append(bytes(self._buffer[body_start:body_end]).rstrip(b"\r\n"))
+                del self._buffer[:body_end]
+
+        return parts
+
+    @staticmethod
+    def _parse_headers(block) -> dict:
+        headers = {}
+        for line in bytes(block).split(b"\r\n"):
+            name, sep, value = line.partition(b":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return headers
+
+
+def _boundary_from_content_type(content_type: str) -> bytes:
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "boundary":
+            return value.strip('"').encode()
+    raise ValueError(f"No multipart boundary in Content-Type: {content_type!r}")
+
+
+def passthrough_frames(url: str, timeout: float = 10.0):
+    """Yield JPEG bytes exactly as the upstream MJPEG server sent them."""
+    with requests.get(url, stream=True, timeout=(5, timeout)) as resp:
+        resp.raise_for_status()
+        parser = MultipartJpegParser(_boundary_from_content_type(resp.headers.get("Content-Type", "")))
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            for jpeg in parser.feed(chunk):
+                yield jpeg
+
+
+def transcode_frames(open_capture, release: bool = True, max_failures: int = 5):
+    """Yield JPEG bytes by decoding a cv2 capture and re-encoding each frame."""
+    cap = open_capture()
+    try:
+        if not cap.isOpened():
+            raise ConnectionError("Capture could not be opened")
+
+        failures = 0
+        while failures < max_failures:
+            success, frame = cap.read()
+            if not success:
+                failures += 1
+                time.sleep(0.5)
+                continue
+            failures = 0
+
+            ret, buffer = cv2.imencode(".jpg", frame)
+            if ret:
+                yield buffer.tobytes()
+    finally:
+        if release:
+            cap.release()
@@ -0,0 +1,42 @@
+"""
+VirtualEye Backend - Route Authorization Helpers
+`require_role` replaces the per-route claim parsing: it verifies the JWT and
+checks the caller's role against their cached user profile, so a role change
+or a deleted account takes effect without waiting for the token to expire.
+"""
+
+from functools import wraps
+
+from flask import g, jsonify
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from ..models.user_model import get_user_profile
+
+
+def current_user_id() -> str:
+    identity = get_jwt_identity()
+    # Support both identity stored as dict or sub-claim
+    return identity.get("userId") if isinstance(identity, dict) else identity
+
+
+def current_user():
+    """Return the caller's serialized profile (cached, once per request), or None."""
+    if "current_user" not in g:
+        g.current_user = get_user_profile(current_user_id())
+    return g.current_user
+
+
+def require_role(*roles: str):
+    """Decorator: JWT required and the caller's role must be one of `roles`."""
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            user = current_user()
+            if user is None:
+                return jsonify({"message": "User not found."}), 401
+            if user.get("role") not in roles:
+                return jsonify({"message": f"Forbidden: {' or '.join(roles)} role required."}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
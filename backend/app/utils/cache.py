@@ -0,0 +1,132 @@
+"""
+VirtualEye Backend - In-Process Caches
+A small thread-safe LRU cache with per-entry TTL, and a MongoDB version
+stamp that keeps such caches coherent across worker processes.
+
+Each process only sees its own invalidations. When another worker changes
+the underlying data it bumps a shared version stamp; every cache checks the
+stamp at most once per `version_check_seconds` and drops all its entries
+when the stamp has moved. A write in one worker is therefore visible to
+all of them within that interval, at the cost of one tiny read per
+interval instead of one per request.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        version_source: Optional[Callable[[], Any]] = None,
+        version_check_seconds: float = 1.0,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+
+        # version_source() returns the current shared version stamp
+        self._version_source = version_source
+        self._version_check_seconds = version_check_seconds
+        self._version = _MISSING
+        self._version_checked = 0.0
+
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if not self.enabled:
+            return default
+        self._check_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, calling loader() and caching its result on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    # ── Invalidation ────────────────────────────────────────────────────────
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def _check_version(self):
+        if self._version_source is None:
+            return
+        now = time.monotonic()
+        if now - self._version_checked < self._version_check_seconds:
+            return
+        self._version_checked = now
+        try:
+            version = self._version_source()
+        except Exception:
+            # Stamp unreadable: fall back to TTL-only expiry
+            return
+        if version != self._version:
+            if self._version is not _MISSING:
+                self.clear()
+            self._version = version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "maxsize": self.maxsize, "ttl": self.ttl}
+
+
+class MongoVersionStamp:
+    """A named counter in the `cache_versions` collection shared by all workers."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @staticmethod
+    def _collection():
+        from ..extensions import mongo
+        return mongo.db.cache_versions
+
+    def read(self) -> int:
+        doc = self._collection().find_one({"_id": self.name}, {"version": 1})
+        return doc["version"] if doc else 0
+
+    def bump(self):
+        """Tell every worker's cache that the underlying data changed."""
+        self._collection().update_one({"_id": self.name}, {"$inc": {"version": 1}}, upsert=True)
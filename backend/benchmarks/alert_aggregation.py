@@ -0,0 +1,136 @@
+"""
+VirtualEye — alert aggregation benchmark
+Fires N alert triggers (a few cameras × alert types, as the detection engine
+would while people stay in frame) and reports Mongo write round trips and
+per-trigger latency for:
+
+  legacy      one insert_one per trigger (previous trigger_alert)
+  aggregated  AlertAggregator: cooldown merge + batched insert_many/bulk_write
+
+Runs against mongomock by default (pip install mongomock), so latencies only
+show in-process cost; pass --uri to measure against a real MongoDB.
+
+Usage (from backend/):
+    python benchmarks/alert_aggregation.py
+    python benchmarks/alert_aggregation.py --triggers 10000 --flush-every 200
+    python benchmarks/alert_aggregation.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.alert_aggregator import AlertAggregator
+
+ALERT_TYPES = ["humanDetects", "motionDetects", "cameraCovered"]
+
+
+class CountingCollection:
+    """Wraps a collection and counts write round trips."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.writes = 0
+
+    def insert_one(self, doc):
+        self.writes += 1
+        return self.collection.insert_one(doc)
+
+    def insert_many(self, docs, ordered=True):
+        self.writes += 1
+        return self.collection.insert_many(docs, ordered=ordered)
+
+    def bulk_write(self, requests, ordered=True):
+        self.writes += 1
+        if type(self.collection).__module__.startswith("mongomock"):
+            # mongomock's bulk API lags recent pymongo UpdateOne; apply one by one
+            for request in requests:
+                self.collection.update_one(request._filter, request._doc)
+            return None
+        return self.collection.bulk_write(requests, ordered=ordered)
+
+
+def open_collection(uri, name):
+    if uri:
+        from pymongo import MongoClient
+        collection = MongoClient(uri)["virtualeye_bench"][name]
+    else:
+        import mongomock
+        collection = mongomock.MongoClient()["virtualeye_bench"][name]
+    collection.drop()
+    return CountingCollection(collection)
+
+
+def trigger_stream(n, cameras):
+    for i in range(n):
+        yield ALERT_TYPES[i % len(ALERT_TYPES)], f"cam-{(i // len(ALERT_TYPES)) % cameras}"
+
+
+def run_legacy(collection, n, cameras):
+    latencies = []
+    for alert_type, camera_id in trigger_stream(n, cameras):
+        started = time.perf_counter()
+        collection.insert_one({
+            "type": alert_type,
+            "cameraId": camera_id,
+            "message": "bench",
+            "timestamp": datetime.utcnow().isoformat(),
+            "viewed": False,
+        })
+        latencies.append(time.perf_counter() - started)
+    return latencies, 0.0
+
+
+def run_aggregated(collection, n, cameras, flush_every, cooldown):
+    aggregator = AlertAggregator(lambda: collection, cooldown_seconds=cooldown, autostart=False)
+    latencies = []
+    flush_time = 0.0
+    for i, (alert_type, camera_id) in enumerate(trigger_stream(n, cameras), 1):
+        started = time.perf_counter()
+        aggregator.record(alert_type, "bench", camera_id)
+        latencies.append(time.perf_counter() - started)
+        if i % flush_every == 0:
+            started = time.perf_counter()
+            aggregator.flush()
+            flush_time += time.perf_counter() - started
+    started = time.perf_counter()
+    aggregator.flush()
+    flush_time += time.perf_counter() - started
+    return latencies, flush_time
+
+
+def report(label, collection, latencies, flush_time, n):
+    ms = np.array(latencies) * 1000.0
+    docs = collection.collection.count_documents({})
+    print(f"{label:<12} writes={collection.writes:>6}  docs={docs:>6}  "
+          f"trigger p50={np.percentile(ms, 50):.3f}ms p99={np.percentile(ms, 99):.3f}ms  "
+          f"total={ms.sum() + flush_time * 1000.0:.0f}ms  ({n} triggers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--triggers", type=int, default=10000)
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--flush-every", type=int, default=100,
+                        help="triggers between flushes (stands in for the flush interval)")
+    parser.add_argument("--cooldown", type=float, default=60.0)
+    parser.add_argument("--uri", help="real MongoDB URI instead of mongomock")
+    args = parser.parse_args()
+
+    collection = open_collection(args.uri, "alerts_legacy")
+    latencies, flush_time = run_legacy(collection, args.triggers, args.cameras)
+    report("legacy", collection, latencies, flush_time, args.triggers)
+
+    collection = open_collection(args.uri, "alerts_aggregated")
+    latencies, flush_time = run_aggregated(collection, args.triggers, args.cameras, args.flush_every, args.cooldown)
+    report("aggregated", collection, latencies, flush_time, args.triggers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+VirtualEye — alert config cache microbenchmark
+Times the alert trigger path with the per-user toggle cache on and off:
+
+  lookup   get_alert_toggles() alone
+  trigger  full POST /api/alerts/trigger through the Flask test client
+
+Mongo is mongomock (pip install mongomock) or a real server via --uri.
+--rtt-ms adds a sleep to every Mongo call to model a remote database; the
+in-process mongomock numbers alone understate what a round trip costs.
+
+Usage (from backend/):
+    python benchmarks/alert_config_cache.py
+    python benchmarks/alert_config_cache.py --rtt-ms 1 --requests 2000
+    python benchmarks/alert_config_cache.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("VIRTUALEYE_JWT_SECRET", "benchmark-secret-benchmark-secret")
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import mongo
+from app.models.alert_model import config_cache, get_alert_toggles
+
+
+class SlowCollection:
+    """Delays every call on the wrapped collection by `rtt` seconds and counts it."""
+
+    def __init__(self, collection, rtt, counter):
+        self._collection, self._rtt, self._counter = collection, rtt, counter
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        def call(*args, **kwargs):
+            self._counter[0] += 1
+            if self._rtt:
+                time.sleep(self._rtt)
+            return method(*args, **kwargs)
+        return call
+
+
+class SlowDatabase:
+    def __init__(self, db, rtt, counter):
+        self._db, self._rtt, self._counter = db, rtt, counter
+
+    def __getattr__(self, name):
+        return SlowCollection(self._db[name], self._rtt, self._counter)
+
+    __getitem__ = __getattr__
+
+
+def open_db(uri):
+    if uri:
+        from pymongo import MongoClient
+        db = MongoClient(uri)["virtualeye_bench"]
+    else:
+        import mongomock
+        db = mongomock.MongoClient()["virtualeye_bench"]
+    db.alert_configs.drop()
+    db.cache_versions.drop()
+    return db
+
+
+def timed(fn, n):
+    timings = []
+    for _ in range(n):
+        started = time.perf_counter()
+        fn()
+        timings.append(1000.0 * (time.perf_counter() - started))
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    parser.add_argument("--uri")
+    args = parser.parse_args()
+
+    db = open_db(args.uri)
+    db.alert_configs.insert_one({"userId": "bench-user", "toggles": {"humanDetects": False}})
+    ops = [0]
+    mongo.db = SlowDatabase(db, args.rtt_ms / 1000.0, ops)
+
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity='bench-user')}"}
+    body = {"type": "humanDetects", "message": "bench", "cameraId": "CAM-01"}
+
+    # Toggled off for this user: the trigger returns after the config lookup
+    assert get_alert_toggles(mongo.db, "bench-user") == {"humanDetects": False}
+
+    print(f"{args.requests} calls, rtt={args.rtt_ms:g}ms ({'mongod' if args.uri else 'mongomock'})")
+    for enabled in (False, True):
+        config_cache.enabled = enabled
+        config_cache.clear()
+        for label, fn in (
+            ("lookup", lambda: get_alert_toggles(mongo.db, "bench-user")),
+            ("trigger", lambda: client.post("/api/alerts/trigger", json=body, headers=headers)),
+        ):
+            ops[0] = 0
+            ms = timed(fn, args.requests)
+            print(f"  cache={'on ' if enabled else 'off'} {label:<8} p50={np.percentile(ms, 50):7.3f}ms "
+                  f"p99={np.percentile(ms, 99):7.3f}ms  mongo_ops={ops[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+VirtualEye — alert history query benchmark
+Seeds an alerts collection and times the history queries, before and after
+ensure_alert_indexes():
+
+  legacy       find({}).sort(timestamp, -1).limit(50)  (previous get_history)
+  first page   keyset history, no filters
+  deep page    keyset history after paging N pages in
+  type+camera  history filtered by type and cameraId
+  time range   history within a one-day window
+
+Against a real mongod (--uri) it also prints the winning plan, keys and docs
+examined from explain(). mongomock has no query planner: it scans every
+document whatever the indexes, so there it only checks the queries are
+correct and shows raw in-process cost.
+
+Usage (from backend/):
+    python benchmarks/alert_history_query.py --uri mongodb://localhost:27017
+    python benchmarks/alert_history_query.py --count 100000       # mongomock
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.alert_model import (
+    HISTORY_PROJECTION, build_history_query, ensure_alert_indexes, find_alert_history,
+)
+
+ALERT_TYPES = ["humanDetects", "motionDetects", "cameraCovered"]
+CAMERAS = [f"CAM-{i:02d}" for i in range(8)]
+
+
+def open_db(uri):
+    if uri:
+        from pymongo import MongoClient
+        return MongoClient(uri)["virtualeye_bench"]
+    import mongomock
+    return mongomock.MongoClient()["virtualeye_bench"]
+
+
+def seed(db, count, days):
+    db.alerts.drop()
+    rng = np.random.default_rng(0)
+    # Recent enough that the retention TTL does not expire the seeded data
+    start = datetime.utcnow() - timedelta(days=days)
+    offsets = np.sort(rng.uniform(0, days * 86400, count))
+    types = rng.integers(0, len(ALERT_TYPES), count)
+    cameras = rng.integers(0, len(CAMERAS), count)
+
+    batch = []
+    for i in range(count):
+        created = start + timedelta(seconds=float(offsets[i]))
+        batch.append({
+            "_id": ObjectId(),
+            "type": ALERT_TYPES[types[i]],
+            "cameraId": CAMERAS[cameras[i]],
+            "message": "seeded alert",
+            "count": 1,
+            "timestamp": created.isoformat(),
+            "viewed": True,
+            "createdAt": created,
+        })
+        if len(batch) == 10000:
+            db.alerts.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.alerts.insert_many(batch, ordered=False)
+    return start
+
+
+def deep_cursor(db, pages):
+    cursor = None
+    for _ in range(pages):
+        _, cursor = find_alert_history(db, cursor=cursor)
+    return cursor
+
+
+def scenarios(db, start, days, deep_pages):
+    day = (start + timedelta(days=days / 2)).date().isoformat()
+    deep = deep_cursor(db, deep_pages)
+    return [
+        ("legacy", lambda: list(db.alerts.find({}, {"_id": 0}).sort("timestamp", -1).limit(50)),
+         ({}, [("timestamp", -1)])),
+        ("first page", lambda: find_alert_history(db),
+         (build_history_query(), None)),
+        (f"page {deep_pages + 1}", lambda: find_alert_history(db, cursor=deep),
+         (build_history_query(cursor=deep), None)),
+        ("type+camera", lambda: find_alert_history(db, alert_type="humanDetects", camera_id=CAMERAS[3]),
+         (build_history_query(alert_type="humanDetects", camera_id=CAMERAS[3]), None)),
+        ("time range", lambda: find_alert_history(db, since=f"{day}T00:00:00", until=f"{day}T23:59:59"),
+         (build_history_query(since=f"{day}T00:00:00", until=f"{day}T23:59:59"), None)),
+    ]
+
+
+def explain(db, query, sort):
+    sort = sort or [("timestamp", -1), ("_id", -1)]
+    plan = db.alerts.find(query, HISTORY_PROJECTION).sort(sort).limit(51).explain()
+    stats = plan.get("executionStats", {})
+
+    stages, node = [], plan.get("queryPlanner", {}).get("winningPlan", {})
+    while node:
+        stages.append(node.get("stage", "?") + (f"({node['indexName']})" if "indexName" in node else ""))
+        node = node.get("inputStage") or (node.get("inputStages") or [None])[0]
+    return (f"keys={stats.get('totalKeysExamined', '?'):>8} docs={stats.get('totalDocsExamined', '?'):>8}  "
+            f"plan={' <- '.join(stages)}")
+
+
+def measure(db, start, days, repeats, deep_pages, real_mongo):
+    for label, run, (query, sort) in scenarios(db, start, days, deep_pages):
+        run()  # warm up
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            run()
+            timings.append(1000.0 * (time.perf_counter() - started))
+        line = f"  {label:<12} p50={np.percentile(timings, 50):8.2f}ms  p99={np.percentile(timings, 99):8.2f}ms"
+        if real_mongo:
+            line += "  " + explain(db, query, sort)
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", help="real MongoDB URI (default: mongomock)")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=20, help="keep below VIRTUALEYE_ALERT_RETENTION_DAYS")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--deep-pages", type=int, default=20)
+    args = parser.parse_args()
+
+    db = open_db(args.uri)
+    started = time.perf_counter()
+    start = seed(db, args.count, args.days)
+    print(f"Seeded {args.count} alerts over {args.days} days in {time.perf_counter() - started:.1f}s "
+          f"({'mongod' if args.uri else 'mongomock'})")
+
+    print("Without indexes:")
+    measure(db, start, args.days, args.repeats, args.deep_pages, bool(args.uri))
+
+    started = time.perf_counter()
+    names = ensure_alert_indexes(db)
+    print(f"ensure_alert_indexes: {names} in {time.perf_counter() - started:.1f}s")
+
+    print("With indexes:")
+    measure(db, start, args.days, args.repeats, args.deep_pages, bool(args.uri))
+
+
+if __name__ == "__main__":
+    main()
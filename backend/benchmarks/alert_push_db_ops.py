@@ -0,0 +1,119 @@
+"""
+VirtualEye — alert delivery DB load benchmark
+Counts MongoDB operations needed to deliver alerts to N open dashboards over
+a simulated period, for:
+
+  polling  each client calls the original /alerts/recent every 3 s: find({viewed: False})
+           sorted by timestamp, plus update_many when anything was unread
+  push     clients hold an SSE subscription on the AlertBroadcaster; alerts
+           reach them from memory (DB is only read on a stale reconnect)
+
+Alert writes themselves are identical in both modes and are not counted.
+Polling is simulated tick by tick against mongomock (pip install mongomock);
+push runs real subscriber threads and checks every client got every alert.
+
+Usage (from backend/):
+    python benchmarks/alert_push_db_ops.py
+    python benchmarks/alert_push_db_ops.py --clients 100 --minutes 10 --alerts-per-minute 6
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mongomock
+from bson import ObjectId
+
+from app.services.alert_broadcaster import AlertBroadcaster
+
+POLL_INTERVAL = 3.0
+
+
+class CountingCollection:
+    """Wraps a collection and counts every operation sent to the database."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.ops = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+
+        def counted(*args, **kwargs):
+            self.ops += 1
+            return method(*args, **kwargs)
+        return counted
+
+
+def alert_doc(i):
+    return {"_id": ObjectId(), "type": "humanDetects", "cameraId": "cam-0", "message": f"alert {i}",
+            "timestamp": f"{i:08d}", "viewed": False}
+
+
+def run_polling(clients, seconds, alerts_per_minute):
+    writes = mongomock.MongoClient()["virtualeye_bench"]["alerts"]
+    alerts = CountingCollection(writes)
+    ticks = int(seconds / POLL_INTERVAL)
+    alert_every = 60.0 / alerts_per_minute
+    next_alert, fired, delivered = 0.0, 0, 0
+
+    for tick in range(ticks):
+        now = tick * POLL_INTERVAL
+        while next_alert <= now:
+            writes.insert_one(alert_doc(fired))
+            fired += 1
+            next_alert += alert_every
+        # Same queries as the original /alerts/recent route
+        for _ in range(clients):
+            unread = list(alerts.find({"viewed": False}, {"_id": 0}).sort("timestamp", -1))
+            if unread:
+                alerts.update_many({"viewed": False}, {"$set": {"viewed": True}})
+                delivered += len(unread)
+    return alerts.ops, fired, delivered
+
+
+def run_push(clients, seconds, alerts_per_minute):
+    broadcaster = AlertBroadcaster()
+    fired = int(seconds / 60.0 * alerts_per_minute)
+    received = [0] * clients
+
+    def client(idx):
+        for payload in broadcaster.subscribe(heartbeat=0.5):
+            if payload is not None:
+                received[idx] += 1
+                if received[idx] == fired:
+                    break
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(clients)]
+    for t in threads:
+        t.start()
+    while broadcaster.stats()["subscribers"] < clients:
+        time.sleep(0.01)
+    for i in range(fired):
+        broadcaster.publish(alert_doc(i))
+    for t in threads:
+        t.join(timeout=10)
+    return 0, fired, sum(received)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--alerts-per-minute", type=float, default=6.0)
+    args = parser.parse_args()
+    seconds = args.minutes * 60.0
+
+    print(f"{args.clients} clients, {args.minutes:g} min simulated, {args.alerts_per_minute:g} alerts/min")
+    for label, run in (("polling", run_polling), ("push", run_push)):
+        ops, fired, delivered = run(args.clients, seconds, args.alerts_per_minute)
+        print(f"{label:<8} db_ops={ops:>7}  ({ops / args.minutes:>7.0f}/min)  "
+              f"alerts={fired}  deliveries={delivered} (ideal {fired * args.clients})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+VirtualEye — user cache request latency benchmark
+Times GET /api/auth/me and GET /api/users through the Flask test client with
+the user cache on and off, and counts the Mongo calls each request made.
+
+Mongo is mongomock (pip install mongomock) or a real server via --uri.
+--rtt-ms adds a sleep to every Mongo call to model a remote database.
+
+Usage (from backend/):
+    python benchmarks/auth_user_cache.py
+    python benchmarks/auth_user_cache.py --rtt-ms 1 --users 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("VIRTUALEYE_JWT_SECRET", "benchmark-secret-benchmark-secret")
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import mongo
+from app.models.user_model import create_user, user_cache
+
+
+class SlowCollection:
+    """Delays every call on the wrapped collection by `rtt` seconds and counts it."""
+
+    def __init__(self, collection, rtt, counter):
+        self._collection, self._rtt, self._counter = collection, rtt, counter
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        def call(*args, **kwargs):
+            self._counter[0] += 1
+            if self._rtt:
+                time.sleep(self._rtt)
+            return method(*args, **kwargs)
+        return call
+
+
+class SlowDatabase:
+    def __init__(self, db, rtt, counter):
+        self._db, self._rtt, self._counter = db, rtt, counter
+
+    def __getattr__(self, name):
+        return SlowCollection(self._db[name], self._rtt, self._counter)
+
+    __getitem__ = __getattr__
+
+
+def open_db(uri):
+    if uri:
+        from pymongo import MongoClient
+        db = MongoClient(uri)["virtualeye_bench"]
+    else:
+        import mongomock
+        db = mongomock.MongoClient()["virtualeye_bench"]
+    db.users.drop()
+    db.cache_versions.drop()
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    parser.add_argument("--uri")
+    args = parser.parse_args()
+
+    ops = [0]
+    mongo.db = SlowDatabase(open_db(args.uri), args.rtt_ms / 1000.0, ops)
+    app = create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        # No password: hashing is not what is being measured
+        admin_id = create_user("admin@bench.local", "Admin", role="ADMIN")
+        for i in range(args.users - 1):
+            create_user(f"user{i}@bench.local", f"User {i}")
+        headers = {"Authorization": f"Bearer {create_access_token(identity=admin_id)}"}
+
+    print(f"{args.requests} requests, {args.users} users, rtt={args.rtt_ms:g}ms "
+          f"({'mongod' if args.uri else 'mongomock'})")
+    for enabled in (False, True):
+        user_cache.enabled = enabled
+        user_cache.clear()
+        for path in ("/api/auth/me", "/api/users"):
+            assert client.get(path, headers=headers).status_code == 200
+            ops[0] = 0
+            timings = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                client.get(path, headers=headers)
+                timings.append(1000.0 * (time.perf_counter() - started))
+            print(f"  cache={'on ' if enabled else 'off'} {path:<14} p50={np.percentile(timings, 50):7.3f}ms "
+                  f"p99={np.percentile(timings, 99):7.3f}ms  mongo_ops/req={ops[0] / args.requests:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+VirtualEye — MJPEG relay CPU benchmark
+Starts a local MJPEG stand-in for the ESP32 (same multipart format, with
+Content-Length headers) in a separate process, then measures backend CPU
+time per delivered frame for:
+
+  legacy       one cv2.VideoCapture + imencode per viewer (pre frame hub)
+  transcode    frame hub, one decode + re-encode shared by all viewers
+  passthrough  frame hub relaying the upstream JPEG bytes untouched
+
+Usage (from backend/):
+    python benchmarks/mjpeg_relay_cpu.py
+    python benchmarks/mjpeg_relay_cpu.py --viewers 3 --seconds 10 --fps 20
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.frame_hub import FrameHub
+from app.services.mjpeg_relay import passthrough_frames, transcode_frames
+
+BOUNDARY = "123456789000000000000987654321"
+
+
+# ── Stand-in ESP32 server (runs in a child process) ─────────────────────────
+def serve(port, fps, width, height):
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+    jpegs = []
+    for i in range(30):
+        frame = np.roll(base, i * 4, axis=1)
+        jpegs.append(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes())
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/x-mixed-replace;boundary={BOUNDARY}")
+            self.end_headers()
+            i = 0
+            try:
+                while True:
+                    jpeg = jpegs[i % len(jpegs)]
+                    self.wfile.write(
+                        f"\r\n--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\n\r\n".encode() + jpeg
+                    )
+                    i += 1
+                    time.sleep(1.0 / fps)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def wait_for_server(port, timeout=30.0):
+    # The child process builds its JPEGs before it listens, which can take
+    # longer than a fixed sleep on a slow box
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1.0).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"MJPEG stand-in did not start on port {port}")
+            time.sleep(0.1)
+
+
+# ── Measurements ────────────────────────────────────────────────────────────
+def consume(iterator, seconds, counter, index):
+    deadline = time.monotonic() + seconds
+    for _ in iterator:
+        counter[index] += 1
+        if time.monotonic() > deadline:
+            break
+    iterator.close()
+
+
+def run_viewers(make_iterator, viewers, seconds):
+    counts = [0] * viewers
+    start_cpu = time.process_time()
+    threads = [
+        threading.Thread(target=consume, args=(make_iterator(), seconds, counts, i))
+        for i in range(viewers)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.process_time() - start_cpu, sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--viewers", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--fps", type=int, default=15)
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--port", type=int, default=8181)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.fps, args.width, args.height)
+        return
+
+    server = subprocess.Popen([
+        sys.executable, os.path.abspath(__file__), "--serve",
+        "--port", str(args.port), "--fps", str(args.fps),
+        "--width", str(args.width), "--height", str(args.height),
+    ])
+    url = f"http://127.0.0.1:{args.port}/stream"
+
+    try:
+        wait_for_server(args.port)
+        modes = {
+            "legacy": lambda: transcode_frames(lambda: cv2.VideoCapture(url, cv2.CAP_FFMPEG)),
+            "transcode": None,
+            "passthrough": None,
+        }
+        hubs = {
+            "transcode": FrameHub("bench-transcode", lambda: transcode_frames(lambda: cv2.VideoCapture(url, cv2.CAP_FFMPEG))),
+            "passthrough": FrameHub("bench-passthrough", lambda: passthrough_frames(url)),
+        }
+
+        print(f"\n{args.viewers} viewers, {args.width}x{args.height} @ {args.fps} fps, {args.seconds:.0f}s each")
+        print(f"{'mode':<12} {'frames':>7} {'CPU s':>7} {'CPU ms/frame':>13} {'CPU ms/viewer/s':>16}")
+        for mode in modes:
+            make_iterator = modes[mode] or hubs[mode].subscribe
+            cpu, frames = run_viewers(make_iterator, args.viewers, args.seconds)
+            per_frame = 1000.0 * cpu / max(frames, 1)
+            per_viewer = 1000.0 * cpu / args.viewers / args.seconds
+            print(f"{mode:<12} {frames:>7} {cpu:>7.2f} {per_frame:>13.2f} {per_viewer:>16.1f}")
+            time.sleep(0.5)  # let hub readers shut down between modes
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,13 @@ if __name__ == "__main__":
         from app.services.camera_simulator import start_simulator_thread
         start_simulator_thread()
 
+    # Start the continuous detection engine for the primary camera if enabled
+    from app.config import Config
+    if Config.VIRTUALEYE_DETECTION_ENGINE.lower() == "true":
+        from app.ai.detection_engine import start_engine
+        from config.camera_config import PRIMARY_CAMERA
+        start_engine({"cameraId": PRIMARY_CAMERA["id"], **PRIMARY_CAMERA})
+
     # CRITICAL: disable reloader to prevent restart loop
     app.run(
         host="0.0.0.0",
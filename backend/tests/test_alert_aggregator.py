@@ -0,0 +1,154 @@
+import threading
+
+import mongomock
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.services import alert_aggregator as aggregator_module
+from app.services.alert_aggregator import AlertAggregator
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(aggregator_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.alerts
+
+
+def test_repeats_within_cooldown_merge_into_one_event(clock, collection):
+    aggregator = AlertAggregator(lambda: collection, cooldown_seconds=60, autostart=False)
+    first = aggregator.record("motionDetects", "one", "CAM-1")
+    clock[0] += 30
+    merged = aggregator.record("motionDetects", "two", "CAM-1")
+    other_camera = aggregator.record("motionDetects", "one", "CAM-2")
+
+    assert merged["_id"] == first["_id"] and merged["count"] == 2
+    assert other_camera["_id"] != first["_id"]
+
+    aggregator.flush()
+    doc = collection.find_one({"_id": first["_id"]})
+    assert doc["count"] == 2 and doc["message"] == "two"
+
+
+def test_alert_after_cooldown_opens_a_new_event(clock, collection):
+    aggregator = AlertAggregator(lambda: collection, cooldown_seconds=60, autostart=False)
+    first = aggregator.record("humanDetects", "in", "CAM-1")
+    clock[0] += 61
+    second = aggregator.record("humanDetects", "in", "CAM-1")
+    assert second["_id"] != first["_id"] and second["count"] == 1
+
+
+class RecordingCollection:
+    # mongomock's bulk_write does not accept current pymongo UpdateOne objects
+    def __init__(self):
+        self.calls = []
+
+    def insert_many(self, docs, ordered=True):
+        self.calls.append(("insert_many", [doc["count"] for doc in docs]))
+
+    def bulk_write(self, requests, ordered=True):
+        self.calls.append(("bulk_write", [request._doc["$set"]["count"] for request in requests]))
+
+
+class PartialWriteCollection(RecordingCollection):
+    # The first insert_many lands but its reply is lost; the retry then
+    # collides with the documents already written
+    def __init__(self):
+        super().__init__()
+        self.stored = set()
+        self.fail_next = True
+
+    def insert_many(self, docs, ordered=True):
+        duplicates = [{"code": 11000, "index": i} for i, doc in enumerate(docs) if doc["_id"] in self.stored]
+        self.stored.update(doc["_id"] for doc in docs)
+        super().insert_many(docs, ordered)
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("reply lost")
+        if duplicates:
+            raise BulkWriteError({"writeErrors": duplicates})
+
+
+def test_duplicate_keys_on_retry_count_as_written(clock):
+    collection = PartialWriteCollection()
+    aggregator = AlertAggregator(lambda: collection, autostart=False)
+    aggregator.record("motionDetects", "a", "CAM-1")
+    assert aggregator.flush() == 0 and aggregator.stats()["pending"] == 1
+
+    assert aggregator.flush() == 1
+    assert aggregator.stats()["pending"] == 0 and aggregator.stats()["flushErrors"] == 1
+
+
+def test_failed_inserts_do_not_hold_back_updates(clock):
+    collection = RecordingCollection()
+    aggregator = AlertAggregator(lambda: collection, autostart=False)
+    aggregator.record("motionDetects", "a", "CAM-1")
+    aggregator.flush()
+
+    def failing_insert(docs, ordered=True):
+        raise ConnectionError("down")
+
+    collection.insert_many = failing_insert
+    aggregator.record("motionDetects", "b", "CAM-1")
+    aggregator.record("humanDetects", "c", "CAM-1")
+    assert aggregator.flush() == 1
+    assert collection.calls[-1] == ("bulk_write", [2])
+    assert aggregator.stats()["pending"] == 1
+
+
+def test_pending_events_are_capped_while_the_database_is_away(clock):
+    aggregator = AlertAggregator(lambda: None, max_pending=2, autostart=False)
+    for camera in ("CAM-1", "CAM-2", "CAM-3"):
+        aggregator.record("motionDetects", "a", camera)
+    stats = aggregator.stats()
+    assert stats["pending"] == 2 and stats["dropped"] == 1
+
+
+def test_merges_after_insert_are_written_as_updates(clock):
+    collection = RecordingCollection()
+    aggregator = AlertAggregator(lambda: collection, autostart=False)
+    aggregator.record("motionDetects", "a", "CAM-1")
+    assert aggregator.flush() == 1
+
+    aggregator.record("motionDetects", "b", "CAM-1")
+    assert aggregator.flush() == 1
+    assert collection.calls == [("insert_many", [1]), ("bulk_write", [2])]
+    assert aggregator.stats()["pending"] == 0
+
+
+def test_listeners_see_new_events_only(clock, collection):
+    aggregator = AlertAggregator(lambda: collection, autostart=False)
+    seen = []
+    aggregator.add_listener(lambda event: seen.append(event["message"]))
+    aggregator.record("motionDetects", "a", "CAM-1")
+    aggregator.record("motionDetects", "b", "CAM-1")
+    assert seen == ["a"]
+
+
+def test_listeners_see_new_events_in_id_order(collection):
+    aggregator = AlertAggregator(lambda: collection, autostart=False)
+    seen = []
+    aggregator.add_listener(lambda event: seen.append(event["_id"]))
+
+    def record(camera):
+        for i in range(200):
+            aggregator.record("motionDetects", "a", f"{camera}-{i}")
+
+    threads = [threading.Thread(target=record, args=(f"CAM-{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(seen) == 800 and seen == sorted(seen)
+
+
+def test_flush_waits_for_the_database(clock):
+    aggregator = AlertAggregator(lambda: None, autostart=False)
+    aggregator.record("motionDetects", "a", "CAM-1")
+    assert aggregator.flush() == 0
+    assert aggregator.stats()["flushErrors"] == 0 and aggregator.stats()["pending"] == 1
@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+from bson import ObjectId
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.routes import alert_routes
+from app.services.alert_broadcaster import AUTH_EXPIRED_SSE, AlertBroadcaster
+
+
+def event(message):
+    return {"_id": ObjectId(), "type": "motionDetects", "cameraId": "CAM-1", "message": message}
+
+
+def test_subscriber_resumes_after_its_cursor():
+    broadcaster = AlertBroadcaster()
+    first, second = event("a"), event("b")
+    broadcaster.publish(first)
+    broadcaster.publish(second)
+
+    stream = broadcaster.subscribe(cursor=first["_id"], heartbeat=0.01)
+    assert next(stream)["message"] == "b"
+    assert next(stream) is None  # heartbeat while idle
+    stream.close()
+    assert broadcaster.stats()["subscribers"] == 0
+
+
+def test_subscription_ends_at_until():
+    broadcaster = AlertBroadcaster()
+    started = time.time()
+    assert list(broadcaster.subscribe(heartbeat=10.0, until=started + 0.05)) == []
+    assert time.time() - started < 1.0
+    assert list(broadcaster.subscribe(until=started - 1)) == []
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("VIRTUALEYE_JWT_SECRET", "test-secret-test-secret-test-secret")
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        token = create_access_token(identity="u1", expires_delta=timedelta(seconds=1))
+    return app.test_client(), token
+
+
+def stream_token(client, token):
+    response = client.post("/api/alerts/stream-token", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return response.get_json()["token"]
+
+
+def test_stream_closes_with_auth_expired_event(client):
+    client, token = client
+    response = client.get(f"/api/alerts/stream?jwt={stream_token(client, token)}", buffered=True)
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert body.endswith(AUTH_EXPIRED_SSE)
+
+
+def test_stream_rejects_session_token_in_query_string(client):
+    client, token = client
+    assert client.get(f"/api/alerts/stream?jwt={token}").status_code == 401
+
+
+def test_stream_token_only_opens_the_stream(client):
+    client, token = client
+    scoped = stream_token(client, token)
+    response = client.post("/api/alerts/stream-token", headers={"Authorization": f"Bearer {scoped}"})
+    assert response.status_code == 400
+
+
+def test_recent_alerts_follow_the_client_cursor(client, monkeypatch):
+    client, token = client
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr(alert_routes, "mongo", SimpleNamespace(db=db))
+    first, second = event("a"), event("b")
+    db.alerts.insert_many([{**first, "viewed": False}, {**second, "viewed": False}])
+    headers = {"Authorization": f"Bearer {token}"}
+
+    newest = client.get("/api/alerts/recent", headers=headers).get_json()
+    assert [a["message"] for a in newest["alerts"]] == ["a", "b"]
+    assert newest["cursor"] == str(second["_id"])
+
+    after_first = client.get(f"/api/alerts/recent?since={first['_id']}", headers=headers).get_json()
+    assert [a["message"] for a in after_first["alerts"]] == ["b"]
+    caught_up = client.get(f"/api/alerts/recent?since={newest['cursor']}", headers=headers).get_json()
+    assert caught_up == {"alerts": [], "cursor": newest["cursor"]}
+    # Polling never marks alerts viewed for other clients
+    assert db.alerts.count_documents({"viewed": False}) == 2
@@ -0,0 +1,45 @@
+import mongomock
+import pytest
+
+from app.models import alert_model
+from app.models.alert_model import (
+    DEFAULT_TOGGLES, get_alert_config, get_alert_toggles, get_system_alert_toggles, update_alert_toggles,
+)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    alert_model.config_cache.clear()
+    # No app context: the cross-worker stamp is unreadable and only the TTL applies
+    monkeypatch.setattr(alert_model._config_stamp, "bump", lambda: None)
+    yield mongomock.MongoClient().db
+    alert_model.config_cache.clear()
+
+
+def test_toggles_read_stores_the_default_config(db):
+    assert get_alert_toggles(db, "u1") == DEFAULT_TOGGLES
+    assert db.alert_configs.count_documents({"userId": "u1"}) == 1
+
+    # The cached entry and the stored document agree
+    assert get_alert_config(db, "u1")["toggles"] == DEFAULT_TOGGLES
+    assert db.alert_configs.count_documents({"userId": "u1"}) == 1
+
+
+def test_update_invalidates_the_cached_toggles(db):
+    get_alert_toggles(db, "u1")
+    update_alert_toggles(db, "u1", {**DEFAULT_TOGGLES, "motionDetects": False})
+    assert get_alert_toggles(db, "u1")["motionDetects"] is False
+
+
+def test_returned_toggles_are_copies(db):
+    get_alert_toggles(db, "u1")["humanDetects"] = False
+    assert get_alert_toggles(db, "u1")["humanDetects"] is True
+
+
+def test_system_toggles_are_on_while_any_user_enables_them(db):
+    assert get_system_alert_toggles(db) == DEFAULT_TOGGLES
+    assert db.alert_configs.count_documents({}) == 0  # nothing stored for the engines
+
+    update_alert_toggles(db, "u1", {**DEFAULT_TOGGLES, "motionDetects": False, "humanDetects": False})
+    update_alert_toggles(db, "u2", {**DEFAULT_TOGGLES, "motionDetects": False})
+    assert get_system_alert_toggles(db) == {**DEFAULT_TOGGLES, "motionDetects": False}
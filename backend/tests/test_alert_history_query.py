@@ -0,0 +1,34 @@
+import pytest
+
+from app.models.alert_model import build_history_query, decode_cursor, encode_cursor
+
+
+def test_offsets_are_converted_to_utc():
+    query = build_history_query(since="2026-10-17T10:00:00+05:30")
+    assert query["timestamp"] == {"$gte": "2026-10-17T04:30:00"}
+
+
+def test_z_suffix_and_naive_times_are_utc():
+    assert build_history_query(since="2026-10-17T10:00:00Z")["timestamp"] == {"$gte": "2026-10-17T10:00:00"}
+    assert build_history_query(until="2026-10-17T10:00:00")["timestamp"] == {"$lte": "2026-10-17T10:00:00"}
+
+
+def test_date_only_until_covers_the_whole_day():
+    query = build_history_query(since="2026-10-17", until="2026-10-17")
+    assert query["timestamp"] == {"$gte": "2026-10-17T00:00:00", "$lt": "2026-10-18T00:00:00"}
+    # A stored timestamp late that day sorts inside the range
+    assert "2026-10-17T23:59:59.999999" < query["timestamp"]["$lt"]
+
+
+def test_malformed_dates_raise_value_error():
+    with pytest.raises(ValueError):
+        build_history_query(until="yesterday")
+
+
+def test_cursor_round_trip():
+    from bson import ObjectId
+
+    oid = ObjectId()
+    assert decode_cursor(encode_cursor({"timestamp": "2026-10-17T10:00:00", "_id": oid})) == ("2026-10-17T10:00:00", oid)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,77 @@
+import mongomock
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import mongo
+from app.models import user_model
+from app.models.user_model import create_user, delete_user_by_id, get_all_users, get_user_profile
+from app.utils import cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def app(monkeypatch, clock):
+    monkeypatch.setenv("VIRTUALEYE_JWT_SECRET", "test-secret-test-secret-test-secret")
+    app = create_app()
+    app.config["TESTING"] = True
+    monkeypatch.setattr(mongo, "db", mongomock.MongoClient().db)
+    user_model.user_cache.clear()
+    yield app
+    user_model.user_cache.clear()
+
+
+def auth(app, user_id):
+    # No app context is held across requests: each request gets its own `g`
+    with app.app_context():
+        return {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+
+
+def test_require_role(app):
+    client = app.test_client()
+    admin = create_user("admin@example.com", "Admin", role="ADMIN")
+    user = create_user("user@example.com", "User")
+
+    assert client.delete(f"/api/users/{user}").status_code == 401
+    assert client.delete(f"/api/users/{admin}", headers=auth(app, user)).status_code == 403
+    assert client.delete(f"/api/users/{user}", headers=auth(app, admin)).status_code == 200
+
+
+def test_deleted_user_is_not_served_from_the_cache(app):
+    client = app.test_client()
+    admin = create_user("admin@example.com", "Admin", role="ADMIN")
+    other = create_user("other@example.com", "Other", role="ADMIN")
+    assert get_user_profile(other)["role"] == "ADMIN"  # now cached
+
+    assert delete_user_by_id(other)
+    assert get_user_profile(other) is None
+    response = client.delete(f"/api/users/{admin}", headers=auth(app, other))
+    assert response.status_code == 401 and response.get_json()["message"] == "User not found."
+
+
+def test_user_list_is_invalidated_on_create(app):
+    create_user("a@example.com", "A")
+    assert [u["email"] for u in get_all_users()] == ["a@example.com"]
+
+    create_user("b@example.com", "B")
+    assert [u["email"] for u in get_all_users()] == ["a@example.com", "b@example.com"]
+
+
+def test_demotion_in_another_worker_reaches_this_cache(app, clock):
+    client = app.test_client()
+    admin = create_user("admin@example.com", "Admin", role="ADMIN")
+    user = create_user("user@example.com", "User")
+    assert client.delete(f"/api/users/{admin}", headers=auth(app, admin)).status_code == 400  # cached as ADMIN
+
+    # Another worker demotes the admin and bumps the shared stamp
+    mongo.db.users.update_one({"email": "admin@example.com"}, {"$set": {"role": "USER"}})
+    user_model._users_stamp.bump()
+    clock[0] += 1.5  # past the stamp check interval, well inside the TTL
+
+    assert client.delete(f"/api/users/{user}", headers=auth(app, admin)).status_code == 403
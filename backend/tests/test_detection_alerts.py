@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from app.ai import detection_engine
+from app.ai.detection_engine import DetectionEngine
+from app.ai.frame_rate_governor import FrameRateGovernor
+from app.models import alert_model
+from app.models.alert_model import DEFAULT_TOGGLES, update_alert_toggles
+
+
+def result(motion=False, detected=False, new_tracks=None, tamper=None):
+    return {
+        "success": True,
+        "motion": {"motionDetected": motion},
+        "human": {"detected": detected, "newTracks": new_tracks or []},
+        "tamper": tamper or {"tampered": False},
+    }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    alert_model.config_cache.clear()
+    monkeypatch.setattr(alert_model._config_stamp, "bump", lambda: None)
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr(detection_engine, "mongo", SimpleNamespace(db=db))
+    yield db
+    alert_model.config_cache.clear()
+
+
+@pytest.fixture
+def recorded(monkeypatch, db):
+    calls = []
+    monkeypatch.setattr(detection_engine.alert_aggregator, "record",
+                        lambda alert_type, message, camera_id: calls.append(alert_type))
+    return calls
+
+
+@pytest.fixture
+def engine():
+    return DetectionEngine({"cameraId": "CAM-1"}, FrameRateGovernor(0.5, 5, 8, 10), "http://ai")
+
+
+def test_alerts_fire_on_transitions_only(engine, recorded):
+    for _ in range(3):
+        engine._raise_alerts(result(motion=True))
+    engine._raise_alerts(result(motion=True, detected=True))
+    engine._raise_alerts(result(motion=True, detected=True))
+    engine._raise_alerts(result())
+    engine._raise_alerts(result(motion=True))
+    assert recorded == ["motionDetects", "humanDetects", "motionDetects"]
+
+
+def test_new_tracks_always_alert(engine, recorded):
+    engine._raise_alerts(result(detected=True, new_tracks=[1]))
+    engine._raise_alerts(result(detected=True))
+    engine._raise_alerts(result(detected=True, new_tracks=[2]))
+    assert recorded == ["humanDetects", "humanDetects"]
+
+
+def test_tamper_reason_change_alerts_again(engine, recorded):
+    engine._raise_alerts(result(tamper={"tampered": True, "reason": "blackout"}))
+    engine._raise_alerts(result(tamper={"tampered": True, "reason": "blackout"}))
+    engine._raise_alerts(result(tamper={"tampered": True, "reason": "occlusion"}))
+    assert recorded == ["cameraCovered", "cameraCovered"]
+
+
+def test_disabled_types_are_not_recorded(engine, recorded, db):
+    update_alert_toggles(db, "u1", {**DEFAULT_TOGGLES, "motionDetects": False})
+    engine._raise_alerts(result(motion=True))
+    engine._raise_alerts(result(motion=True, detected=True))
+    assert recorded == ["humanDetects"]
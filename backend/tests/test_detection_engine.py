@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from app.ai import detection_engine
+from app.ai.detection_engine import DetectionEngine
+
+
+class StubGovernor:
+    def register(self, camera_id):
+        pass
+
+    def unregister(self, camera_id):
+        pass
+
+    def interval(self, camera_id):
+        return 0.0
+
+    def report(self, camera_id, result):
+        pass
+
+
+class RecordingStop(threading.Event):
+    # Records each backoff instead of sleeping through it
+    def __init__(self):
+        super().__init__()
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return self.is_set()
+
+
+class FlakyHub:
+    # Each subscription plays the next scripted outcome
+    def __init__(self, engine, script):
+        self.engine = engine
+        self.script = list(script)
+        self.closed = 0
+
+    def subscribe(self):
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return self._frames(outcome)
+
+    def _frames(self, frames):
+        try:
+            if frames == "stop":
+                self.engine._stop.set()
+                yield b"late"
+                return
+            yield from frames
+        finally:
+            self.closed += 1
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(detection_engine, "RETRY_DELAY", 0.01)
+    monkeypatch.setattr(detection_engine, "MAX_RETRY_DELAY", 0.04)
+    recorded = []
+    monkeypatch.setattr(detection_engine.detection_writer, "record", recorded.append)
+
+    engine = DetectionEngine({"cameraId": "CAM-1"}, StubGovernor(), "http://ai")
+    engine._stop = RecordingStop()
+    engine.detected = []
+    engine._detect = lambda jpeg: engine.detected.append(jpeg) or {"cameraId": "CAM-1", "success": True}
+    engine._raise_alerts = lambda result: None
+    engine.recorded = recorded
+    return engine
+
+
+def test_backoff_grows_until_the_stream_recovers(engine, monkeypatch):
+    hub = FlakyHub(engine, [ConnectionError("camera offline"), [], [], [], [b"f1", b"f2"], "stop"])
+    monkeypatch.setattr(detection_engine, "get_camera_hub", lambda camera: hub)
+
+    engine._run()
+
+    # Doubling (capped) while nothing arrives, back to the base delay once frames flow
+    assert engine._stop.waits == [0.01, 0.02, 0.04, 0.04, 0.01]
+    assert engine.detected == [b"f1", b"f2"] and len(engine.recorded) == 2
+    assert engine.stats() == {"cameraId": "CAM-1", "framesSampled": 2, "errors": 0, "reconnects": 5, "state": "stopped"}
+    assert hub.closed == 5 and hub.script == []
+
+
+def test_failed_detection_ends_the_subscription(engine, monkeypatch):
+    def unavailable(jpeg):
+        raise ConnectionError("AI module down")
+
+    hub = FlakyHub(engine, [[b"f1", b"f2"], "stop"])
+    monkeypatch.setattr(detection_engine, "get_camera_hub", lambda camera: hub)
+    engine._detect = unavailable
+
+    engine._run()
+
+    # The subscription is released and the engine resubscribes after a backoff
+    assert engine._stop.waits == [0.01]
+    assert hub.closed == 2 and engine.stats()["reconnects"] == 1
@@ -0,0 +1,88 @@
+import time
+from datetime import datetime
+
+import mongomock
+import pytest
+
+from app.services import detection_writer
+from app.services.detection_writer import DetectionWriter
+
+
+def result(camera_id="CAM-1", second=0, minute=0):
+    return {
+        "cameraId": camera_id,
+        "motion": {"motionDetected": True, "motionArea": 120},
+        "human": {"detected": second % 2 == 0, "confidence": 0.8},
+        "latencyMs": 12.0,
+        "timestamp": datetime(2024, 1, 1, 12, minute, second).isoformat(),
+    }
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.detections
+
+
+def test_flush_waits_for_the_database():
+    writer = DetectionWriter(lambda: None, autostart=False)
+    writer.record(result())
+    assert writer.flush(force=True) == 0
+
+    stats = writer.stats()
+    assert stats["flushErrors"] == 0 and stats["buffered"] == 1
+
+
+def test_minutes_are_written_as_buckets(collection):
+    writer = DetectionWriter(lambda: collection, autostart=False)
+    for second in range(4):
+        writer.record(result(second=second))
+    writer.record(result(minute=1))
+
+    assert writer.flush(force=True) == 2
+    doc = collection.find_one({"minute": datetime(2024, 1, 1, 12, 0)})
+    assert doc["count"] == 4 and doc["humanCount"] == 2 and len(doc["samples"]) == 4
+
+
+def test_spilled_minutes_are_replayed_in_chunks(collection, tmp_path, monkeypatch):
+    monkeypatch.setattr(detection_writer, "INSERT_CHUNK", 2)
+    spill = tmp_path / "spill.jsonl"
+    available = {"db": None}
+    writer = DetectionWriter(lambda: available["db"], max_buffered=1, overflow="spill",
+                             spill_path=str(spill), autostart=False)
+
+    # No database: closed minutes beyond the buffer limit go to the spill file
+    for minute in range(5):
+        writer.record(result(minute=minute))
+    writer.flush(force=True)
+    assert writer.stats()["spilled"] == 4 and len(spill.read_text().splitlines()) == 4
+
+    available["db"] = collection
+    writer.flush(force=True)
+    assert collection.count_documents({}) == 5
+    assert writer.stats()["replayed"] == 4
+    assert not spill.exists()
+
+
+class FailingCollection:
+    def __init__(self):
+        self.attempts = 0
+
+    def insert_many(self, docs, ordered=True):
+        self.attempts += 1
+        raise ConnectionError("down")
+
+
+def test_failing_database_is_retried_once_per_interval():
+    failing = FailingCollection()
+    target = {"collection": failing}
+    writer = DetectionWriter(lambda: target["collection"], flush_interval=0.2, flush_samples=10,
+                             overflow="drop")
+    started = time.monotonic()
+    while time.monotonic() - started < 0.5:
+        writer.record(result())
+        time.sleep(0.001)
+    target["collection"] = None  # quiet the background flusher for the rest of the run
+
+    # One wake at the threshold, then the interval: a handful, not one per sample
+    assert 1 <= failing.attempts <= 5
+    assert writer.stats()["received"] > 100
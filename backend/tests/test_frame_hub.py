@@ -0,0 +1,69 @@
+import queue
+import threading
+import time
+
+from app.services.frame_hub import FrameHub
+
+
+class FakeCamera:
+    # Frame source fed by the test; records when the hub lets go of it
+    def __init__(self):
+        self.frames = queue.Queue()
+        self.opened = 0
+        self.closed = threading.Event()
+
+    def __call__(self):
+        self.opened += 1
+        try:
+            while True:
+                yield self.frames.get(timeout=5)
+        finally:
+            self.closed.set()
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_subscribers_share_one_reader_and_get_the_newest_frame():
+    camera = FakeCamera()
+    hub = FrameHub("CAM-1", camera)
+    first, second = hub.subscribe(), hub.subscribe()
+
+    camera.frames.put(b"f1")
+    assert next(first) == b"f1"
+    assert next(second) == b"f1"
+
+    for jpeg in (b"f2", b"f3", b"f4"):
+        camera.frames.put(jpeg)
+    wait_until(lambda: hub.latest()[1] == b"f4")
+    # A slow viewer skips straight to the newest frame
+    assert next(first) == b"f4"
+    assert hub.subscriber_count == 2 and camera.opened == 1
+
+    first.close()
+    second.close()
+
+
+def test_last_subscriber_stops_the_reader():
+    camera = FakeCamera()
+    hub = FrameHub("CAM-1", camera)
+    viewer = hub.subscribe()
+    camera.frames.put(b"f1")
+    assert next(viewer) == b"f1"
+
+    viewer.close()
+    assert hub.subscriber_count == 0 and hub.latest() is None
+    # The reader notices on its next frame and releases the camera
+    camera.frames.put(b"f2")
+    assert camera.closed.wait(2.0)
+
+    # A new viewer starts a fresh reader
+    viewer = hub.subscribe()
+    camera.frames.put(b"f3")
+    assert next(viewer) == b"f3"
+    assert camera.opened == 2
+    viewer.close()
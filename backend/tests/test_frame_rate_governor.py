@@ -0,0 +1,86 @@
+import pytest
+
+from app.ai import frame_rate_governor
+from app.ai.frame_rate_governor import MAX_INTERVAL_SECONDS, FrameRateGovernor
+
+MOTION = {"motion": {"motionDetected": True}, "human": {"skipped": True}}
+STATIC = {"motion": {"motionDetected": False}, "human": {"skipped": True}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(frame_rate_governor.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_governor(**overrides):
+    settings = {"idle_fps": 0.5, "active_fps": 5.0, "budget_fps": 8.0, "hold_seconds": 10.0}
+    settings.update(overrides)
+    return FrameRateGovernor(**settings)
+
+
+def test_motion_raises_rate_and_hold_expiry_drops_it(clock):
+    governor = make_governor()
+    governor.register("cam")
+    assert governor.interval("cam") == pytest.approx(2.0)
+
+    governor.report("cam", MOTION)
+    assert governor.interval("cam") == pytest.approx(0.2)
+
+    clock[0] += 5.0
+    governor.report("cam", STATIC)
+    assert governor.interval("cam") == pytest.approx(0.2)
+
+    # The first report after the hold expires rebalances without metrics()
+    clock[0] += 6.0
+    governor.report("cam", STATIC)
+    assert governor.interval("cam") == pytest.approx(2.0)
+
+
+def test_active_cameras_share_the_budget(clock):
+    governor = make_governor(budget_fps=6.0)
+    for camera_id in ("a", "b", "c"):
+        governor.register(camera_id)
+    governor.report("a", MOTION)
+    governor.report("b", MOTION)
+
+    # c keeps its idle 0.5 fps, a and b split the remaining 5.5
+    assert governor.interval("c") == pytest.approx(2.0)
+    assert governor.interval("a") == pytest.approx(1 / 2.75)
+    assert governor.interval("b") == pytest.approx(1 / 2.75)
+
+
+def test_zero_idle_fps_waits_instead_of_dividing_by_zero(clock):
+    governor = make_governor(idle_fps=0.0)
+    assert governor.interval("unknown") == MAX_INTERVAL_SECONDS
+    governor.register("cam")
+    assert governor.interval("cam") == MAX_INTERVAL_SECONDS
+
+
+def test_zero_budget_waits_instead_of_falling_back_to_idle(clock):
+    governor = make_governor(budget_fps=0.0)
+    governor.register("cam")
+    assert governor.interval("cam") == MAX_INTERVAL_SECONDS
+    # Cameras the governor does not know about are outside the budget
+    assert governor.interval("unknown") == pytest.approx(2.0)
+
+
+def test_tracked_frames_are_not_counted_as_inferences(clock):
+    governor = make_governor()
+    governor.register("cam")
+    governor.report("cam", {"motion": {"motionDetected": True}, "human": {"skipped": False, "inferred": True}})
+    governor.report("cam", {"motion": {"motionDetected": True}, "human": {"skipped": False, "inferred": False}})
+    assert governor.metrics()["cameras"]["cam"]["inferenceFps"] == pytest.approx(0.1)
+
+
+def test_report_keeps_only_the_measuring_window(clock):
+    governor = make_governor()
+    governor.register("cam")
+    for _ in range(1000):
+        clock[0] += 0.2
+        governor.report("cam", {"motion": {"motionDetected": True}, "human": {"skipped": False}})
+
+    state = governor._cameras["cam"]
+    window = int(frame_rate_governor.MEASURE_WINDOW_SECONDS / 0.2) + 1
+    assert len(state.samples) <= window and len(state.inferences) <= window
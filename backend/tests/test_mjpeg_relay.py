@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.mjpeg_relay import MultipartJpegParser, _boundary_from_content_type
+
+BOUNDARY = b"123456789000000000000987654321"
+JPEGS = [b"\xff\xd8first\r\n--not-a-boundary\xff\xd9", b"\xff\xd8second\xff\xd9"]
+
+
+def stream(boundary=BOUNDARY):
+    body = b""
+    for jpeg in JPEGS:
+        body += b"--" + boundary + b"\r\nContent-Type: image/jpeg\r\n"
+        body += b"Content-Length: " + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n"
+    return body
+
+
+def test_parts_with_content_length_are_returned_untouched():
+    assert MultipartJpegParser(BOUNDARY).feed(stream()) == JPEGS
+
+
+def test_parts_split_across_chunks():
+    parser = MultipartJpegParser(BOUNDARY)
+    data = stream()
+    parts = []
+    for i in range(0, len(data), 7):
+        parts += parser.feed(data[i:i + 7])
+    assert parts == JPEGS
+
+
+def test_parts_without_content_length_end_at_the_next_delimiter():
+    jpeg = b"\xff\xd8plain\xff\xd9"
+    data = (b"--" + BOUNDARY + b"\r\n\r\n" + jpeg + b"\r\n") * 2 + b"--" + BOUNDARY
+    assert MultipartJpegParser(BOUNDARY).feed(data) == [jpeg, jpeg]
+
+
+def test_boundary_declared_with_dashes():
+    assert MultipartJpegParser(b"--" + BOUNDARY).feed(stream()) == JPEGS
+
+
+def test_boundary_from_content_type():
+    content_type = f'multipart/x-mixed-replace; boundary="{BOUNDARY.decode()}"'
+    assert _boundary_from_content_type(content_type) == BOUNDARY
+    with pytest.raises(ValueError):
+        _boundary_from_content_type("image/jpeg")
@@ -0,0 +1,62 @@
+import pytest
+
+from app.utils import cache
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    ttl_cache = TTLCache(ttl=10)
+    ttl_cache.set("a", 1)
+    clock[0] += 9.9
+    assert ttl_cache.get("a") == 1
+    clock[0] += 0.2
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    ttl_cache = TTLCache(maxsize=2)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1 and ttl_cache.get("c") == 3
+    assert ttl_cache.stats()["evictions"] == 1
+
+
+def test_get_or_load_calls_loader_once(clock):
+    ttl_cache = TTLCache()
+    calls = []
+    for _ in range(3):
+        assert ttl_cache.get_or_load("k", lambda: calls.append(1) or "v") == "v"
+    assert len(calls) == 1
+
+
+def test_version_change_clears_every_entry(clock):
+    version = [1]
+    ttl_cache = TTLCache(version_source=lambda: version[0], version_check_seconds=1.0)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") == 1
+
+    version[0] = 2
+    assert ttl_cache.get("a") == 1  # stamp not re-read within the check interval
+    clock[0] += 1.0
+    assert ttl_cache.get("a") is None
+
+
+def test_unreadable_version_falls_back_to_ttl(clock):
+    def broken():
+        raise RuntimeError("no database")
+
+    ttl_cache = TTLCache(ttl=5, version_source=broken)
+    ttl_cache.set("a", 1)
+    clock[0] += 2
+    assert ttl_cache.get("a") == 1
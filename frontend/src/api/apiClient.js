@@ -38,6 +38,14 @@ apiClient.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+/* ── Expired session: clear stored token and redirect to login ── */
+export const expireSession = () => {
+  localStorage.removeItem(TOKEN_KEY);
+  if (window.location.pathname !== '/login') {
+    window.location.href = '/login';
+  }
+};
+
 /* ── Response Interceptor: Handle 401 ── */
 apiClient.interceptors.response.use(
   (response) => response,
@@ -48,10 +56,7 @@ apiClient.interceptors.response.use(
 
     // On 401, clear stored token and redirect to login
     if (error.response?.status === 401) {
-      localStorage.removeItem(TOKEN_KEY);
-      if (window.location.pathname !== '/login') {
-        window.location.href = '/login';
-      }
+      expireSession();
     }
 
     return Promise.reject(error);
@@ -82,6 +87,25 @@ export const fetchCameraStreamUrl = () => apiClient.get('/camera/stream-url');
 /* ── Alert Helpers ── */
 export const fetchAlertConfig     = () => apiClient.get('/alerts/config');
 export const updateAlertConfig    = (toggles) => apiClient.put('/alerts/config', { toggles });
-export const fetchAlertHistory    = () => apiClient.get('/alerts/history');
-export const fetchRecentAlerts    = () => apiClient.get('/alerts/recent');
+export const fetchAlertHistory    = (params) => apiClient.get('/alerts/history', { params }); // { type, cameraId, from, to, limit, cursor }
+export const fetchRecentAlerts    = (since) => apiClient.get('/alerts/recent', { params: { since } }); // deprecated: openAlertStream
 export const triggerTestAlert     = (type, message) => apiClient.post('/alerts/trigger', { type, message });
+
+/* ── Alert Stream (Server-Sent Events) ──
+ * EventSource cannot send headers, so the stream is opened with a short-lived
+ * token scoped to /alerts/stream rather than the session token, which would
+ * otherwise end up in server and proxy logs. `since` is the id of the last
+ * alert this client has seen; on reconnects the browser resumes from
+ * Last-Event-ID by itself. Once the stream token has expired the browser's
+ * own reconnect is refused and the EventSource closes: open a new one. When
+ * the session expires the server sends a final `auth-expired` event: close
+ * the stream and log in again.
+ */
+export const ALERT_CURSOR_KEY = 'virtualeye_alert_cursor';
+
+export const openAlertStream = async (since) => {
+  const { data } = await apiClient.post('/alerts/stream-token');
+  const params = new URLSearchParams({ jwt: data.token });
+  if (since) params.set('since', since);
+  return new EventSource(`${getBaseUrl()}/api/alerts/stream?${params}`);
+};
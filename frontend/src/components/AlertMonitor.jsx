@@ -1,24 +1,49 @@
 import { useState, useEffect } from 'react';
-import { fetchRecentAlerts } from '../api/apiClient';
+import { ALERT_CURSOR_KEY, expireSession, openAlertStream } from '../api/apiClient';
 import './AlertMonitor.css';
 
 export default function AlertMonitor() {
   const [activeAlerts, setActiveAlerts] = useState([]);
 
   useEffect(() => {
-    // Poll for new unviewed alerts every 3 seconds
-    const interval = setInterval(async () => {
+    // New alerts are pushed by the server; the last received id is this
+    // client's viewed cursor, kept across page loads
+    let stream = null;
+    let reconnectTimer = null;
+    let closed = false;
+
+    const connect = async () => {
       try {
-        const res = await fetchRecentAlerts();
-        const newAlerts = res.data?.alerts || [];
-        if (newAlerts.length > 0) {
-          // Add them to the active toast queue
-          setActiveAlerts((prev) => [...prev, ...newAlerts]);
-        }
+        stream = await openAlertStream(localStorage.getItem(ALERT_CURSOR_KEY));
       } catch (err) {
-        // Silently fail, it will retry on next tick
+        // A 401 has already expired the session; retry anything else
+        if (!closed && err.response?.status !== 401) reconnectTimer = setTimeout(connect, 3000);
+        return;
+      }
+      if (closed) {
+        stream.close();
+        return;
       }
-    }, 3000);
+      stream.addEventListener('alert', (event) => {
+        try {
+          const alert = JSON.parse(event.data);
+          localStorage.setItem(ALERT_CURSOR_KEY, alert.id);
+          setActiveAlerts((prev) => [...prev, alert]);
+        } catch (err) {
+          // Ignore malformed events
+        }
+      });
+      stream.addEventListener('auth-expired', () => {
+        closed = true;
+        stream.close();
+        expireSession();
+      });
+      stream.addEventListener('error', () => {
+        // The browser gave up reconnecting (its stream token has expired)
+        if (!closed && stream.readyState === EventSource.CLOSED) reconnectTimer = setTimeout(connect, 3000);
+      });
+    };
+    connect();
 
     // Auto-Simulator for Demonstration: Triggers an alert periodically if enabled
     const autoSimulatorInterval = setInterval(async () => {
@@ -30,7 +55,6 @@ export default function AlertMonitor() {
           const activeTypes = [];
           if (toggles.motionDetects) activeTypes.push({ type: 'motionDetects', msg: 'Motion detected in perimeter.' });
           if (toggles.humanDetects) activeTypes.push({ type: 'humanDetects', msg: 'AI detected human presence.' });
-          if (toggles.cameraCovered) activeTypes.push({ type: 'cameraCovered', msg: 'Camera occlusion detected.' });
 
           if (activeTypes.length > 0) {
             const randomAlert = activeTypes[Math.floor(Math.random() * activeTypes.length)];
@@ -43,7 +67,9 @@ export default function AlertMonitor() {
     }, 15000); // Triggers every 15 seconds
 
     return () => {
-      clearInterval(interval);
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (stream) stream.close();
       clearInterval(autoSimulatorInterval);
     };
   }, []);
@@ -9,6 +9,7 @@ export default function Alerts() {
     cameraCovered: true
   });
   const [history, setHistory] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
 
   // Fetch initial config and history
@@ -28,6 +29,7 @@ export default function Alerts() {
       }
       if (historyRes.data && historyRes.data.alerts) {
         setHistory(historyRes.data.alerts);
+        setNextCursor(historyRes.data.nextCursor || null);
       }
     } catch (err) {
       console.error("Failed to fetch alerts data", err);
@@ -36,6 +38,16 @@ export default function Alerts() {
     }
   };
 
+  const loadOlder = async () => {
+    try {
+      const res = await fetchAlertHistory({ cursor: nextCursor });
+      setHistory((prev) => [...prev, ...(res.data?.alerts || [])]);
+      setNextCursor(res.data?.nextCursor || null);
+    } catch (err) {
+      console.error("Failed to fetch older alerts", err);
+    }
+  };
+
   const handleToggle = async (key) => {
     const newToggles = { ...toggles, [key]: !toggles[key] };
     setToggles(newToggles);
@@ -136,7 +148,7 @@ export default function Alerts() {
           ) : (
             <ul className="history-list">
               {history.map((alert, idx) => (
-                <li key={idx} className="history-item">
+                <li key={alert.id || idx} className="history-item">
                   <div className="history-icon" data-type={alert.type}>
                     {alert.type === 'humanDetects' ? '👤' : alert.type === 'motionDetects' ? '🏃' : '📷'}
                   </div>
@@ -148,6 +160,9 @@ export default function Alerts() {
               ))}
             </ul>
           )}
+          {nextCursor && (
+            <button onClick={loadOlder} className="btn btn-outline">Load older alerts</button>
+          )}
         </section>
       </div>
     </main>